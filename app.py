@@ -13,22 +13,38 @@ Structure:
 3. Base Classes (Module Interface)
 4. Reality Engine (Monde RI)
 5. Response Processor (Post-processing)
-6. Multi-Agent Orchestrator
-7. API Publique
-8. CLI/Server (Point d'entrée)
+6. Model Providers (appels LLM async)
+7. Multi-Agent Orchestrator
+8. API Publique
+9. CLI/Server (Point d'entrée)
 """
 
+import asyncio
+import atexit
+import hashlib
+import inspect
 import os
 import sys
 import json
+import math
 import re
 import time
 import logging
-from typing import Dict, List, Any, Optional
+import logging.handlers
+import queue
+import random
+import shutil
+import threading
+import uuid
+import zlib
+from collections import OrderedDict, deque
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl
 
 # ============================================
 # SECTION 1 : CONFIGURATION
@@ -38,31 +54,114 @@ from pathlib import Path
 CONFIG = {
     "server": {
         "port": int(os.getenv("IR_PORT", "8000")),
-        "host": os.getenv("IR_HOST", "0.0.0.0")
+        "host": os.getenv("IR_HOST", "0.0.0.0"),
+        "workers": int(os.getenv("IR_WORKERS", "1"))
     },
     "security": {
         "max_tokens": 2000,
-        "rate_limit": 100,
-        "rate_window": 60
+        "rate_limit": int(os.getenv("IR_RATE_LIMIT", "100")),
+        "rate_window": int(os.getenv("IR_RATE_WINDOW", "60")),
+        "rate_limit_max_clients": int(os.getenv("IR_RATE_LIMIT_MAX_CLIENTS", "100000")),
+        "rate_limit_stripes": 64
     },
     "models": {
         "default_temperature": 0.7,
-        "max_context": 4096
+        "max_context": int(os.getenv("IR_MAX_CONTEXT", "4096")),
+        "response_reserve": int(os.getenv("IR_RESPONSE_RESERVE", "512"))
+    },
+    "audit": {
+        # Fichier JSONL opt-in (ex: ir_audit.jsonl) ; vide → audit via logger, en file
+        # (thread QueueListener) sauf IR_AUDIT_SYNC=1 (écriture directe dans le handler)
+        "path": os.getenv("IR_AUDIT_LOG", ""),
+        "sync": os.getenv("IR_AUDIT_SYNC", "0") == "1",
+        "policy": os.getenv("IR_AUDIT_POLICY", "drop"),
+        "max_queue": int(os.getenv("IR_AUDIT_MAX_QUEUE", "10000")),
+        "batch_size": 256,
+        "flush_interval": 1.0,
+        "block_timeout": 0.5,
+        "max_bytes": int(os.getenv("IR_AUDIT_MAX_BYTES", str(64 * 1024 * 1024))),
+        "backup_count": int(os.getenv("IR_AUDIT_BACKUPS", "5"))
+    },
+    "persistence": {
+        "dir": os.getenv("IR_DATA_DIR") or None,
+        "snapshot_every": int(os.getenv("IR_SNAPSHOT_EVERY", "500")),
+        "fsync": os.getenv("IR_FSYNC", "1") != "0",
+        "fsync_batch": 64,
+        "fsync_interval": float(os.getenv("IR_FSYNC_INTERVAL", "1.0"))
+    },
+    "worlds": {
+        "max_worlds": int(os.getenv("IR_MAX_WORLDS", "1000")),
+        "ttl_seconds": int(os.getenv("IR_WORLD_TTL", str(24 * 3600))),
+        # Mondes persistés expirés: 0 = déchargés de la mémoire (restaurables), 1 = état disque supprimé
+        "ttl_discard": os.getenv("IR_WORLD_TTL_DISCARD", "0") == "1",
+        "max_bytes": int(os.getenv("IR_WORLDS_MAX_BYTES", str(512 * 1024 * 1024))),
+        "sweep_interval": 60
+    },
+    "history": {
+        "events_window": int(os.getenv("IR_EVENTS_WINDOW", "256")),
+        "comms_window": int(os.getenv("IR_COMMS_WINDOW", "256")),
+        "hypotheses_window": 64,
+        "conversation_window": int(os.getenv("IR_CONVERSATION_WINDOW", "1000")),
+        "spill_dir": os.getenv("IR_SPILL_DIR") or None,
+        "spill_batch": 64
+    },
+    "perception": {
+        # Rayon de perception par défaut (0 = désactivé: toute l'équipe visible), surchargeable par monde
+        "radius": float(os.getenv("IR_PERCEPTION_RADIUS", "0")),
+        # Taille des cellules de l'index spatial (0 = rayon de perception)
+        "cell_size": float(os.getenv("IR_PERCEPTION_CELL", "0"))
+    },
+    "orchestrator": {
+        "max_concurrency": int(os.getenv("IR_MAX_CONCURRENCY", "8")),
+        # full: monde complet à chaque tour; delta: changements depuis le dernier tour de l'agent
+        # (providers à état conversationnel), contexte complet forcé tous les context_refresh tours
+        "context_mode": os.getenv("IR_CONTEXT_MODE", "full"),
+        "context_refresh": int(os.getenv("IR_CONTEXT_REFRESH", "10"))
+    },
+    "providers": {
+        # Quotas par modèle (0 = inconnu: appris des en-têtes x-ratelimit-* des réponses)
+        "rpm": int(os.getenv("IR_PROVIDER_RPM", "0")),
+        "tpm": int(os.getenv("IR_PROVIDER_TPM", "0")),
+        # Surcharges par modèle: "llama-3.3-70b-versatile=30:6000,gemma2-9b-it=30:15000" (rpm:tpm)
+        "limits": os.getenv("IR_PROVIDER_LIMITS", ""),
+        "max_retries": int(os.getenv("IR_PROVIDER_RETRIES", "4")),
+        "backoff_base": float(os.getenv("IR_PROVIDER_BACKOFF", "0.5")),
+        "backoff_max": 30.0
+    },
+    "logging": {
+        "level": os.getenv("IR_LOG_LEVEL", "INFO"),
+        "file": os.getenv("IR_LOG_FILE", "ir_engine.log")
+    },
+    "cache": {
+        "mode": os.getenv("IR_CACHE_MODE", "off"),
+        "dir": os.getenv("IR_CACHE_DIR") or None,
+        "max_entries": int(os.getenv("IR_CACHE_MAX_ENTRIES", "1024")),
+        "max_disk_bytes": int(os.getenv("IR_CACHE_MAX_DISK_BYTES", str(256 * 1024 * 1024)))
     }
 }
 
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('ir_engine.log')
-    ]
-)
-
+# Logger module: aucun handler ni fichier créé à l'import (import sans effet de bord),
+# configuration explicite via configure_logging() (fait par main())
 logger = logging.getLogger("IR-Engine")
 
+
+def configure_logging(level: Optional[str] = None, log_file: Optional[str] = None):
+    """
+    Configure logging racine: stdout + fichier (IR_LOG_LEVEL, IR_LOG_FILE, vide = pas de fichier)
+    Sans effet si l'application hôte a déjà configuré le logging racine
+    """
+    if logging.getLogger().handlers:
+        return
+    log_file = CONFIG["logging"]["file"] if log_file is None else log_file
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    logging.basicConfig(
+        level=(level or CONFIG["logging"]["level"]).upper(),
+        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+        handlers=handlers
+    )
+
 # ============================================
 # SECTION 2 : SECURITY GATEWAY
 # ============================================
@@ -72,6 +171,344 @@ class SecurityError(Exception):
     pass
 
 
+class RateLimitError(SecurityError):
+    """Exception levée quand un client dépasse son quota de requêtes"""
+    pass
+
+
+class TokenBucketLimiter:
+    """
+    Rate limiting token bucket, mémoire bornée et thread-safe
+    - Bucket par client: capacité `rate` jetons, recharge continue rate/window par seconde
+      (pas de rafale 2× en bord de fenêtre fixe)
+    - Clients répartis sur `stripes` segments, chacun sous son propre verrou (verrous striés)
+    - Par segment: LRU (OrderedDict), clients inactifs ≥ window évincés au passage
+      (bucket plein = aucune information), plafond dur max_clients au total
+    Coût O(1) amorti par vérification, quel que soit le nombre de clients.
+    """
+    
+    def __init__(self, rate: int, window: float, max_clients: int = 100000, stripes: int = 64):
+        self.stripes = stripes
+        self.max_clients = max_clients
+        self._stripe_cap = max(1, -(-max_clients // stripes))
+        self._buckets = [OrderedDict() for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        # Compteurs par segment (modifiés sous le verrou du segment)
+        self._counters = [
+            {"allowed": 0, "rejected": 0, "evicted_idle": 0, "evicted_cap": 0}
+            for _ in range(stripes)
+        ]
+        self.configure(rate, window)
+    
+    def configure(self, rate: int, window: float):
+        """Change quota (buckets existants conservés)"""
+        self.capacity = rate
+        self.window = window
+        self.refill_per_s = rate / window if window > 0 else float("inf")
+    
+    def acquire(self, client_id: str, cost: float = 1.0) -> Tuple[bool, float]:
+        """Consomme cost jetons → (autorisé, secondes avant nouvel essai)"""
+        now = time.monotonic()
+        index = hash(client_id) % self.stripes
+        buckets = self._buckets[index]
+        counters = self._counters[index]
+        
+        with self._locks[index]:
+            bucket = buckets.get(client_id)
+            if bucket is None:
+                bucket = [float(self.capacity), now]
+                buckets[client_id] = bucket
+                self._evict(buckets, counters, now)
+            else:
+                buckets.move_to_end(client_id)
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_s)
+                bucket[1] = now
+            
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                counters["allowed"] += 1
+                return True, 0.0
+            
+            counters["rejected"] += 1
+            return False, (cost - bucket[0]) / self.refill_per_s
+    
+    def _evict(self, buckets: "OrderedDict[str, List[float]]", counters: Dict[str, int], now: float):
+        """Évince inactifs en tête de LRU puis applique plafond segment (verrou tenu)"""
+        # Au plus 2 inactifs par insertion: coût amorti O(1)
+        for _ in range(2):
+            oldest = next(iter(buckets.values()))
+            if now - oldest[1] < self.window or len(buckets) == 1:
+                break
+            buckets.popitem(last=False)
+            counters["evicted_idle"] += 1
+        while len(buckets) > self._stripe_cap:
+            buckets.popitem(last=False)
+            counters["evicted_cap"] += 1
+    
+    def __len__(self) -> int:
+        return sum(len(buckets) for buckets in self._buckets)
+    
+    @property
+    def metrics(self) -> Dict[str, int]:
+        """Compteurs agrégés sur tous les segments"""
+        totals = dict.fromkeys(self._counters[0], 0)
+        for counters in self._counters:
+            for key, value in counters.items():
+                totals[key] += value
+        return totals
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Métriques limiter"""
+        return {
+            "tracked_clients": len(self),
+            "max_clients": self.max_clients,
+            "capacity": self.capacity,
+            "window": self.window,
+            **self.metrics
+        }
+
+
+class AuditLogWriter:
+    """
+    Écriture audit JSONL en arrière-plan (hors chemin requête)
+    - write() enfile le record (dict), sérialisation et disque dans un thread dédié
+    - Flush par taille (batch_size records) ou temps (flush_interval s)
+    - Rotation path → path.1 … path.N au-delà de max_bytes
+    - File pleine: policy "drop" (record compté perdu) ou "block" (attente
+      block_timeout s, puis perdu) - backpressure bornée sur l'appelant
+    - Compteurs modifiés par les appelants et le thread writer: sous verrou
+    - Fichier impossible à ouvrir: erreur conservée (error), records renvoyés
+      vers le logger (compteur fallback), flush/close ne bloquent pas
+    """
+    
+    POLICIES = ("drop", "block")
+    
+    def __init__(
+        self,
+        path: str,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        backup_count: int = 5,
+        policy: str = "drop",
+        block_timeout: float = 0.5
+    ):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown audit policy: {policy} (expected one of {self.POLICIES})")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.metrics = {
+            "queued": 0, "dropped": 0, "flushed": 0, "batches": 0, "rotations": 0, "errors": 0, "fallback": 0
+        }
+        self._metrics_lock = threading.Lock()
+        self.error: Optional[OSError] = None
+        
+        self._queue: "queue.Queue[Optional[Dict]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+    
+    @classmethod
+    def from_config(cls) -> "AuditLogWriter":
+        """Writer configuré depuis CONFIG["audit"]"""
+        audit = CONFIG["audit"]
+        return cls(
+            audit["path"],
+            max_queue=audit["max_queue"],
+            batch_size=audit["batch_size"],
+            flush_interval=audit["flush_interval"],
+            max_bytes=audit["max_bytes"],
+            backup_count=audit["backup_count"],
+            policy=audit["policy"],
+            block_timeout=audit["block_timeout"]
+        )
+    
+    def _count(self, key: str, amount: int = 1):
+        with self._metrics_lock:
+            self.metrics[key] += amount
+    
+    def write(self, record: Dict) -> bool:
+        """Enfile un record → False si perdu (file pleine ou writer fermé)"""
+        if self._closed:
+            self._count("dropped")
+            return False
+        if self.error is not None:
+            self._fallback(record)
+            return True
+        if self._thread is None:
+            self._start()
+        try:
+            if self.policy == "block":
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("queued")
+        return True
+    
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ir-audit-writer", daemon=True)
+                self._thread.start()
+    
+    def _fallback(self, record: Dict):
+        """Record audit via logger (fichier inutilisable)"""
+        self._count("fallback")
+        logger.info(f"[AUDIT] {json.dumps(record, ensure_ascii=False, default=str)}")
+    
+    def _drain_to_logger(self):
+        """Fichier inutilisable: records en file renvoyés au logger jusqu'à l'arrêt"""
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    return
+                self._fallback(record)
+            finally:
+                self._queue.task_done()
+    
+    def _run(self):
+        """Boucle thread: regroupe records jusqu'à batch_size ou flush_interval"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(self.path, "a", encoding="utf-8")
+        except OSError as e:
+            self.error = e
+            self._count("errors")
+            logger.error(f"Audit log {self.path} unavailable, falling back to logger: {str(e)}")
+            self._drain_to_logger()
+            return
+        try:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    self._queue.task_done()
+                    return
+                batch = [record]
+                deadline = time.monotonic() + self.flush_interval
+                stop = False
+                while len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        record = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if record is None:
+                        stop = True
+                        break
+                    batch.append(record)
+                
+                handle = self._write_batch(handle, batch)
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            handle.close()
+    
+    def _write_batch(self, handle, batch: List[Dict]):
+        """Écrit un batch JSONL (rotation si besoin) → handle courant"""
+        try:
+            if handle.closed:
+                # Réouverture échouée après rotation: nouvel essai à chaque batch
+                handle = open(self.path, "a", encoding="utf-8")
+            data = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in batch)
+            size = len(data.encode("utf-8"))
+            if self.max_bytes and handle.tell() + size > self.max_bytes and handle.tell() > 0:
+                handle.close()
+                self._rotate()
+                handle = open(self.path, "a", encoding="utf-8")
+            handle.write(data)
+            handle.flush()
+            with self._metrics_lock:
+                self.metrics["flushed"] += len(batch)
+                self.metrics["batches"] += 1
+        except (OSError, TypeError, ValueError) as e:
+            with self._metrics_lock:
+                self.metrics["errors"] += 1
+                self.metrics["dropped"] += len(batch)
+            logger.error(f"Audit write failed: {str(e)}")
+        return handle
+    
+    def _rotate(self):
+        """path.N-1 → path.N … path → path.1"""
+        self._count("rotations")
+        if self.backup_count <= 0:
+            self.path.unlink(missing_ok=True)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Attend l'écriture des records enfilés → False si timeout"""
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def close(self, timeout: float = 5.0):
+        """Vide la file puis arrête le thread"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Compteurs writer (queued/dropped/flushed) + profondeur file"""
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        return {
+            "path": str(self.path),
+            "policy": self.policy,
+            "pending": self._queue.qsize(),
+            "error": str(self.error) if self.error is not None else None,
+            **metrics
+        }
+
+
+class _AuditQueueHandler(logging.handlers.QueueHandler):
+    """File bornée vers le QueueListener audit: file pleine → record perdu (policy drop)"""
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class _LoggerForwarder(logging.Handler):
+    """Handler du QueueListener audit: record transmis aux handlers du logger cible"""
+    
+    def __init__(self, target: logging.Logger):
+        super().__init__()
+        self.target = target
+    
+    def emit(self, record: logging.LogRecord):
+        self.target.handle(record)
+
+
 class SecurityGateway:
     """
     Gateway sécurité centralisé
@@ -80,7 +517,11 @@ class SecurityGateway:
     - Audit logging
     """
     
-    _rate_limit_tracker: Dict[str, Dict[str, Any]] = {}
+    _rate_limiter: Optional[TokenBucketLimiter] = None
+    _init_lock = threading.Lock()
+    _audit_writer: Optional[AuditLogWriter] = None
+    _audit_listener: Optional[logging.handlers.QueueListener] = None
+    _audit_logger = logging.getLogger(f"{logger.name}.audit")
     
     @classmethod
     def validate_input(cls, text: str, metadata: Optional[Dict] = None) -> bool:
@@ -104,29 +545,31 @@ class SecurityGateway:
         
         return True
     
+    @classmethod
+    def get_rate_limiter(cls) -> TokenBucketLimiter:
+        """Limiter partagé (créé au premier usage, suit CONFIG["security"])"""
+        security = CONFIG["security"]
+        limiter = cls._rate_limiter
+        if limiter is None:
+            with cls._init_lock:
+                if cls._rate_limiter is None:
+                    cls._rate_limiter = TokenBucketLimiter(
+                        security["rate_limit"],
+                        security["rate_window"],
+                        security["rate_limit_max_clients"],
+                        security["rate_limit_stripes"]
+                    )
+                limiter = cls._rate_limiter
+        elif (limiter.capacity, limiter.window) != (security["rate_limit"], security["rate_window"]):
+            limiter.configure(security["rate_limit"], security["rate_window"])
+        return limiter
+    
     @classmethod
     def _check_rate_limit(cls, client_id: str):
-        """Rate limiting par client"""
-        now = time.time()
-        limit = CONFIG["security"]["rate_limit"]
-        window = CONFIG["security"]["rate_window"]
-        
-        if client_id not in cls._rate_limit_tracker:
-            cls._rate_limit_tracker[client_id] = {
-                "count": 0,
-                "reset_time": now + window
-            }
-        
-        record = cls._rate_limit_tracker[client_id]
-        
-        if now > record["reset_time"]:
-            record["count"] = 0
-            record["reset_time"] = now + window
-        
-        if record["count"] >= limit:
-            raise SecurityError(f"Rate limit exceeded for {client_id}")
-        
-        record["count"] += 1
+        """Rate limiting par client (token bucket)"""
+        allowed, retry_after = cls.get_rate_limiter().acquire(client_id)
+        if not allowed:
+            raise RateLimitError(f"Rate limit exceeded for {client_id} (retry in {retry_after:.1f}s)")
     
     @classmethod
     def audit_log(cls, action: str, module: str, result: Dict, metadata: Optional[Dict] = None):
@@ -139,7 +582,52 @@ class SecurityGateway:
             "duration_ms": result.get("duration", 0),
             **(metadata or {})
         }
-        logger.info(f"[AUDIT] {json.dumps(log_entry)}")
+        writer = cls.get_audit_writer()
+        if writer is None:
+            cls.get_audit_logger().info(f"[AUDIT] {json.dumps(log_entry)}")
+        else:
+            writer.write(log_entry)
+    
+    @classmethod
+    def get_audit_writer(cls) -> Optional[AuditLogWriter]:
+        """Writer audit partagé (None si IR_AUDIT_LOG vide → audit via logger)"""
+        if cls._audit_writer is None and CONFIG["audit"]["path"]:
+            with cls._init_lock:
+                if cls._audit_writer is None:
+                    cls._audit_writer = AuditLogWriter.from_config()
+                    atexit.register(cls._audit_writer.close)
+        return cls._audit_writer
+    
+    @classmethod
+    def get_audit_logger(cls) -> logging.Logger:
+        """
+        Logger audit sans IR_AUDIT_LOG: records mis en file, écrits par les handlers
+        du logger IR-Engine dans le thread d'un QueueListener (hors chemin requête) ;
+        IR_AUDIT_SYNC=1 → logger IR-Engine direct
+        """
+        if CONFIG["audit"]["sync"]:
+            return logger
+        if cls._audit_listener is None:
+            with cls._init_lock:
+                if cls._audit_listener is None:
+                    handler = _AuditQueueHandler(queue.Queue(maxsize=CONFIG["audit"]["max_queue"]))
+                    cls._audit_logger.propagate = False
+                    cls._audit_logger.handlers = [handler]
+                    cls._audit_listener = logging.handlers.QueueListener(handler.queue, _LoggerForwarder(logger))
+                    cls._audit_listener.start()
+                    atexit.register(cls.close_audit_writer)
+        return cls._audit_logger
+    
+    @classmethod
+    def close_audit_writer(cls):
+        """Vide et ferme le writer audit et la file du logger audit (arrêt serveur)"""
+        if cls._audit_writer is not None:
+            cls._audit_writer.close()
+            cls._audit_writer = None
+        if cls._audit_listener is not None:
+            cls._audit_listener.stop()
+            cls._audit_listener = None
+            cls._audit_logger.handlers = []
 
 
 # ============================================
@@ -157,301 +645,3037 @@ class AgentConfig:
     energy: str = "100%"
 
 
-@dataclass
-class WorldState:
-    """État du monde RI"""
-    mission: Dict[str, Any]
-    agents: Dict[str, Dict[str, Any]]
-    environment: Dict[str, Any]
-    knowledge: Dict[str, List[str]]
-    communication: List[str] = field(default_factory=list)
-    event_sequence: List[str] = field(default_factory=list)
-    time_event: int = 0
-
-
-class IRModule(ABC):
-    """Interface de base pour modules IR"""
+class BoundedLog:
+    """
+    Historique borné: fenêtre mémoire (ring buffer deque) + débordement
+    des entrées anciennes vers un segment JSONL append-only sur disque.
+    Interface type liste (append, len, itération, index/slices sur la fenêtre).
+    Sans spill_path, les entrées évincées sont abandonnées (compteur dropped).
+    """
     
-    def __init__(self, name: str):
-        self.name = name
-        self.metrics = {
-            "executions": 0,
-            "errors": 0,
-            "total_time_ms": 0
-        }
+    def __init__(
+        self,
+        maxlen: int,
+        items: Optional[List[Any]] = None,
+        spill_path: Optional[Path] = None,
+        spill_batch: Optional[int] = None
+    ):
+        self._window: deque = deque(maxlen=maxlen)
+        self._pending: List[Any] = []
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.spill_batch = spill_batch or CONFIG["history"]["spill_batch"]
+        self.total = 0
+        self.spilled = 0
+        self.dropped = 0
+        for item in items or []:
+            self.append(item)
     
-    async def execute(self, input_data: Any, operation: str, metadata: Optional[Dict] = None) -> Dict:
-        """Exécute opération avec métriques"""
-        start = time.time()
-        metadata = metadata or {}
-        
-        try:
-            self.metrics["executions"] += 1
-            result = await self._process(input_data, operation, metadata)
-            duration = (time.time() - start) * 1000
-            self.metrics["total_time_ms"] += duration
-            
-            return {
-                "success": True,
-                "result": result,
-                "duration": duration
-            }
-        except Exception as e:
-            self.metrics["errors"] += 1
-            duration = (time.time() - start) * 1000
-            logger.error(f"Error in {self.name}: {str(e)}")
-            
-            return {
-                "success": False,
-                "error": str(e),
-                "duration": duration
-            }
+    @property
+    def maxlen(self) -> int:
+        return self._window.maxlen
     
-    @abstractmethod
-    async def _process(self, input_data: Any, operation: str, metadata: Dict) -> Any:
-        """Implémentation traitement spécifique"""
-        pass
+    def append(self, item: Any):
+        """Ajoute entrée, évince la plus ancienne si fenêtre pleine"""
+        if len(self._window) == self._window.maxlen:
+            evicted = self._window[0]
+            if self.spill_path is None:
+                self.dropped += 1
+            else:
+                self._pending.append(evicted)
+                if len(self._pending) >= self.spill_batch:
+                    self.flush()
+        self._window.append(item)
+        self.total += 1
     
-    def get_health(self) -> Dict:
-        """Retourne métriques santé module"""
-        avg_time = (
-            self.metrics["total_time_ms"] / self.metrics["executions"]
-            if self.metrics["executions"] > 0 else 0
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+    
+    def flush(self):
+        """Écrit entrées évincées en attente sur le segment disque"""
+        if not self._pending or self.spill_path is None:
+            return
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            f.write("".join(
+                json.dumps(item, ensure_ascii=False, default=str) + "\n"
+                for item in self._pending
+            ))
+        self.spilled += len(self._pending)
+        self._pending = []
+    
+    def to_state(self) -> Dict[str, Any]:
+        """État sérialisable (fenêtre + compteurs), entrées en attente écrites d'abord"""
+        self.flush()
+        spill_bytes = (
+            self.spill_path.stat().st_size
+            if self.spill_path is not None and self.spill_path.exists() else 0
         )
-        
         return {
-            "name": self.name,
-            "status": "healthy",
-            "metrics": self.metrics,
-            "avg_time_ms": round(avg_time, 2)
+            "items": list(self._window),
+            "total": self.total,
+            "spilled": self.spilled,
+            "dropped": self.dropped,
+            "spill_bytes": spill_bytes
         }
+    
+    def restore_state(self, state: Dict[str, Any]):
+        """Recharge un état to_state (segment disque tronqué à sa taille d'alors)"""
+        items = state.get("items", [])
+        self._window.clear()
+        self._window.extend(items)
+        self._pending = []
+        self.total = state.get("total", len(items))
+        self.spilled = state.get("spilled", 0)
+        self.dropped = state.get("dropped", 0) + max(0, len(items) - len(self._window))
+        # Entrées écrites après le snapshot: rejouées depuis le WAL, pas dupliquées
+        if self.spill_path is not None and self.spill_path.exists():
+            spill_bytes = state.get("spill_bytes", 0)
+            if self.spill_path.stat().st_size > spill_bytes:
+                with open(self.spill_path, "r+b") as f:
+                    f.truncate(spill_bytes)
+    
+    def history(self, spill_offset: int = 0):
+        """Itère historique complet: segment disque (depuis spill_offset octets), attente, puis fenêtre"""
+        if self.spill_path is not None and self.spill_path.exists():
+            with open(self.spill_path, encoding="utf-8") as f:
+                f.seek(spill_offset)
+                for line in f:
+                    yield json.loads(line)
+        yield from list(self._pending)
+        yield from list(self._window)
+    
+    def __len__(self) -> int:
+        return len(self._window)
+    
+    def __iter__(self):
+        return iter(self._window)
+    
+    def __contains__(self, item: Any) -> bool:
+        return item in self._window
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Cas fréquent window[-k:] en O(k) sans copier la fenêtre
+            if index.step is None and index.stop is None and index.start is not None and index.start < 0:
+                size = len(self._window)
+                return [self._window[i] for i in range(max(0, size + index.start), size)]
+            return list(self._window)[index]
+        return self._window[index]
+    
+    def __repr__(self) -> str:
+        return f"BoundedLog({list(self._window)!r}, maxlen={self.maxlen}, total={self.total})"
 
 
-# ============================================
-# SECTION 4 : REALITY ENGINE v3.0
-# ============================================
+def log_count(entries: Any) -> int:
+    """Nombre total d'entrées ajoutées (BoundedLog) ou longueur (liste)"""
+    return getattr(entries, "total", None) or len(entries)
 
-class RealityEngineV3(IRModule):
+
+class WorldJournal:
     """
-    Moteur RI v3.0 - Optimisé cognition LLM
-    Gère état monde partagé et contexte hiérarchique
+    Persistance event-sourced d'un monde (répertoire <dir>/<world_id>/)
+    - wal.jsonl     : une mutation par ligne [seq, op, args...], append-only
+    - snapshot.json : état complet à un seq donné (écriture atomique tmp + rename)
+    Append: écriture visible de l'OS immédiatement (survit à un crash process),
+    fsync groupé tous les fsync_batch records ou fsync_interval s (group commit).
+    Restauration: dernier snapshot + records WAL de seq supérieur uniquement.
     """
     
-    def __init__(self):
-        super().__init__("RealityEngineV3")
-        self.world_state = self._initialize_world()
+    WAL_FILE = "wal.jsonl"
+    SNAPSHOT_FILE = "snapshot.json"
     
-    def _initialize_world(self) -> WorldState:
-        """Initialise état monde par défaut"""
-        return WorldState(
-            mission={
-                "title": "Anomalie Système Critique",
-                "code": "#X7-THETA",
-                "urgency": "HAUTE",
-                "progress": 0,
-                "max_steps": 3
-            },
-            agents={},
-            environment={
-                "location": "Salle Conférence Nexus",
-                "time_event": 0,
-                "layout": "Table ronde centrale, terminaux",
-                "atmosphere": "Tension urgence palpable"
-            },
-            knowledge={
-                "clues": ["Code #X7-THETA → module synchronisation temporelle"],
-                "hypotheses": [],
-                "actions_taken": []
-            },
-            event_sequence=[
-                "Événement -3: Anomalie détectée système central",
-                "Événement -2: Systèmes critiques mode dégradé",
-                "Événement -1: Mission collaborative initiée",
-                "Événement 0: Agents activés mission urgente"
-            ]
+    def __init__(
+        self,
+        directory: Path,
+        fsync: bool = True,
+        fsync_batch: int = 64,
+        fsync_interval: float = 1.0,
+        snapshot_every: int = 500
+    ):
+        self.directory = Path(directory)
+        self.fsync = fsync
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self.since_snapshot = 0
+        self._handle = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.metrics = {"appends": 0, "fsyncs": 0, "snapshots": 0}
+    
+    @classmethod
+    def from_config(cls, directory: Path) -> "WorldJournal":
+        persistence = CONFIG["persistence"]
+        return cls(
+            directory,
+            fsync=persistence["fsync"],
+            fsync_batch=persistence["fsync_batch"],
+            fsync_interval=persistence["fsync_interval"],
+            snapshot_every=persistence["snapshot_every"]
         )
     
-    def register_agent(self, agent_config: AgentConfig):
-        """Enregistre nouvel agent dans monde"""
-        self.world_state.agents[agent_config.name] = {
-            "position": agent_config.position,
-            "specialty": agent_config.specialty,
-            "status": "Actif",
-            "energy": agent_config.energy
-        }
+    @property
+    def wal_path(self) -> Path:
+        return self.directory / self.WAL_FILE
     
-    def get_hierarchical_context(self, agent_name: str) -> str:
-        """
-        Génère contexte hiérarchique optimisé attention LLM
-        Priorité: Info critique first
-        """
-        if agent_name not in self.world_state.agents:
-            raise ValueError(f"Agent {agent_name} not registered")
-        
-        agent = self.world_state.agents[agent_name]
-        others = {k: v for k, v in self.world_state.agents.items() if k != agent_name}
-        
-        # NIVEAU 1: ÉTAT CRITIQUE (haute priorité attention)
-        critical = f"""
-🚨 ÉTAT CRITIQUE - ATTENTION PRIORITAIRE
-
-MISSION URGENTE: {self.world_state.mission['title']}
-Code erreur: {self.world_state.mission['code']}
-Urgence: {self.world_state.mission['urgency']}
-Progression: {self.world_state.mission['progress']}/{self.world_state.mission['max_steps']} étapes
-
-VOTRE IDENTITÉ: {agent_name}
-Spécialité: {agent['specialty']}
-Position: {agent['position']}
-Statut: {agent['status']} | Énergie: {agent['energy']}
-"""
-        
-        # NIVEAU 2: ÉQUIPE (contexte collaboratif)
-        collab = "\n👥 ÉQUIPE PRÉSENTE (collaboration requise):\n"
-        for name, data in others.items():
-            collab += f"  • {name} - {data['specialty']}\n"
-            collab += f"    Position: {data['position']} | Énergie: {data['energy']}\n"
-        
-        # NIVEAU 3: CONNAISSANCES
-        knowledge = "\n🔍 CONNAISSANCES ÉQUIPE:\n"
-        if self.world_state.knowledge['clues']:
-            knowledge += "  Indices découverts:\n"
-            for clue in self.world_state.knowledge['clues']:
-                knowledge += f"    → {clue}\n"
-        
-        # NIVEAU 4: HISTORIQUE ÉVÉNEMENTS (temporalité relative)
-        history = "\n📜 SÉQUENCE ÉVÉNEMENTS (ordre chronologique):\n"
-        for event in self.world_state.event_sequence[-5:]:
-            history += f"  {event}\n"
-        
-        # NIVEAU 5: COMMUNICATIONS
-        comms = ""
-        if self.world_state.communication:
-            comms = "\n💬 COMMUNICATIONS RÉCENTES:\n"
-            for msg in self.world_state.communication[-3:]:
-                comms += f"  {msg}\n"
-        
-        # Assemblage final
-        full_context = f"""{critical}
-{'─'*70}
-{collab}
-{'─'*70}
-{knowledge}
-{'─'*70}
-{history}
-{comms}
-{'─'*70}
-
-🎯 ENVIRONNEMENT PHYSIQUE:
-Lieu: {self.world_state.environment['location']}
-Configuration: {self.world_state.environment['layout']}
-Ambiance: {self.world_state.environment['atmosphere']}
-"""
-        return full_context
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / self.SNAPSHOT_FILE
     
-    def update_world(self, agent_name: str, action_summary: str, full_response: str):
-        """Met à jour état monde après action agent"""
-        self.world_state.time_event += 1
-        event_id = self.world_state.time_event
+    def append(self, op: str, *args: Any) -> bool:
+        """Journalise une mutation → True si un snapshot est dû"""
+        if self._handle is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.wal_path, "a", encoding="utf-8")
+        self.seq += 1
+        self._handle.write(
+            json.dumps([self.seq, op, *args], ensure_ascii=False, separators=(",", ":")) + "\n"
+        )
+        self._handle.flush()
+        self._unsynced += 1
+        self.metrics["appends"] += 1
+        if self._unsynced >= self.fsync_batch or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        self.since_snapshot += 1
+        return self.since_snapshot >= self.snapshot_every
+    
+    def sync(self):
+        """fsync des records en attente"""
+        if self._handle is None or not self._unsynced:
+            return
+        self._handle.flush()
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+            self.metrics["fsyncs"] += 1
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    def snapshot(self, state: Dict[str, Any]):
+        """Écrit l'état complet au seq courant puis tronque le WAL"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"seq": self.seq, **state}, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
         
-        # Ajout événement
-        event = f"Événement {event_id}: {agent_name} - {action_summary}"
-        self.world_state.event_sequence.append(event)
+        # Crash avant troncature: records ≤ seq ignorés au chargement
+        self.close()
+        open(self.wal_path, "w").close()
+        self.since_snapshot = 0
+        self.metrics["snapshots"] += 1
+    
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[List[Any]]]:
+        """(snapshot ou None, records WAL postérieurs au snapshot)"""
+        snapshot = None
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        base_seq = snapshot["seq"] if snapshot else 0
         
-        # Log communication
-        comm_entry = f"[Evt {event_id}] {agent_name}: {action_summary}"
-        self.world_state.communication.append(comm_entry)
+        records = []
+        if self.wal_path.exists():
+            with open(self.wal_path, "r+b") as f:
+                valid_bytes = 0
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Dernière ligne tronquée (crash pendant l'écriture): coupée
+                        # pour que le prochain append reparte sur une ligne saine
+                        f.truncate(valid_bytes)
+                        break
+                    valid_bytes += len(line)
+                    if record[0] > base_seq:
+                        records.append(record)
         
-        # Extraction hypothèses si présentes
-        if "hypothèse" in full_response.lower() or "suppose" in full_response.lower():
-            hypothesis = action_summary[:100]
-            if hypothesis not in self.world_state.knowledge['hypotheses']:
-                self.world_state.knowledge['hypotheses'].append(hypothesis)
+        self.seq = records[-1][0] if records else base_seq
+        self.since_snapshot = len(records)
+        return snapshot, records
     
-    async def _process(self, input_data: Any, operation: str, metadata: Dict) -> Any:
-        """Interface IRModule - dispatch opérations"""
-        if operation == "get_context":
-            return self.get_hierarchical_context(input_data)
-        elif operation == "update":
-            self.update_world(**input_data)
-            return {"status": "updated"}
-        elif operation == "register_agent":
-            self.register_agent(input_data)
-            return {"status": "registered"}
-        else:
-            raise ValueError(f"Unknown operation: {operation}")
-
+    def close(self):
+        """fsync puis ferme le WAL (réouvert au prochain append)"""
+        if self._handle is not None:
+            self.sync()
+            self._handle.close()
+            self._handle = None
+    
+    def destroy(self):
+        """Supprime l'état persisté du monde"""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        shutil.rmtree(self.directory, ignore_errors=True)
 
-# ============================================
-# SECTION 5 : RESPONSE PROCESSOR
-# ============================================
 
-class ResponseProcessor(IRModule):
+class AgentRecord:
     """
-    Nettoie réponses LLM pour maintenir immersion
+    État compact d'un agent dans le monde (slots, chaînes internées partagées
+    entre mondes, énergie numérique en %). Accès dict-like conservé
+    (agent["status"]); clés hors champs conservées dans extra (dict créé au besoin).
+    Libellé énergie ("85%", interné) calculé à l'affectation, pas au rendu.
     """
     
-    def __init__(self):
-        super().__init__("ResponseProcessor")
+    FIELDS = ("position", "specialty", "status", "energy")
+    __slots__ = ("position", "specialty", "status", "_energy", "energy_label", "extra")
+    
+    def __init__(
+        self,
+        position: str,
+        specialty: str,
+        status: str = "Actif",
+        energy: Union[int, str] = 100,
+        extra: Optional[Dict[str, Any]] = None
+    ):
+        self.position = sys.intern(position)
+        self.specialty = sys.intern(specialty)
+        self.status = sys.intern(status)
+        self.energy = energy
+        self.extra = dict(extra) if extra else None
     
     @staticmethod
-    def clean_artifacts(text: str, model_name: str) -> str:
-        """Supprime artifacts spécifiques modèle"""
-        cleaned = text
-        
-        # Deepseek reasoning tags
-        if "deepseek" in model_name.lower():
-            cleaned = re.sub(r'<think>.*?</think>', '', cleaned, flags=re.DOTALL)
-        
-        # Meta-commentary génériques
-        meta_patterns = [
-            r"(Je suis|I am) (un|une|a|an) (modèle|model|LLM|AI|assistant).*?[\.\n]",
-            r"En tant qu(e |')(?:modèle|assistant|IA).*?[\.\n]",
-            r"As (a|an) (language model|AI|assistant).*?[\.\n]"
+    def parse_energy(value: Union[int, float, str]) -> Union[int, str]:
+        """"85%" / 85 → 85; libellé non numérique conservé (interné)"""
+        if isinstance(value, (int, float)):
+            return int(value)
+        try:
+            return int(float(value.strip().rstrip("%")))
+        except ValueError:
+            return sys.intern(value)
+    
+    @property
+    def energy(self) -> Union[int, str]:
+        return self._energy
+    
+    @energy.setter
+    def energy(self, value: Union[int, float, str]):
+        self._energy = energy = self.parse_energy(value)
+        self.energy_label = sys.intern(f"{energy}%") if isinstance(energy, int) else energy
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.FIELDS:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+            return
+        if isinstance(value, str) and key != "energy":
+            value = sys.intern(value)
+        setattr(self, key, value)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS or (self.extra is not None and key in self.extra)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, default) if self.extra is not None else default
+    
+    def to_state(self) -> List[Any]:
+        state = [self.position, self.specialty, self.status, self._energy]
+        if self.extra:
+            state.append(self.extra)
+        return state
+    
+    @classmethod
+    def from_state(cls, state: Union[List[Any], Dict[str, Any]]) -> "AgentRecord":
+        return cls(**state) if isinstance(state, dict) else cls(*state)
+    
+    def __repr__(self) -> str:
+        return (
+            f"AgentRecord(position={self.position!r}, specialty={self.specialty!r}, "
+            f"status={self.status!r}, energy={self._energy!r}"
+            + (f", extra={self.extra!r})" if self.extra else ")")
+        )
+
+
+_POSITION_RE = re.compile(r"\s*(?:(.*?)\s*@)?\s*\(?\s*(-?\d+(?:\.\d+)?)\s*[,;]\s*(-?\d+(?:\.\d+)?)\s*\)?\s*")
+
+
+def parse_position(value: Any) -> Tuple[str, Optional[float], Optional[float]]:
+    """
+    Position agent/objet → (zone, x, y)
+    "12.5,40" → ("", 12.5, 40.0); "Labo@3,4" → ("Labo", 3.0, 4.0); "Labo" → ("Labo", None, None)
+    Liste [x, y] acceptée (objets JSON)
+    """
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        return "", float(value[0]), float(value[1])
+    value = str(value)
+    match = _POSITION_RE.fullmatch(value)
+    if match is None:
+        return value.strip(), None, None
+    zone, x, y = match.groups()
+    return (zone or "").strip(), float(x), float(y)
+
+
+def format_position(value: Any) -> str:
+    """Position reçue en JSON → chaîne ("Labo", "12.5,40"); [x, y] accepté, autre type → ValueError"""
+    if isinstance(value, str):
+        return value
+    if (
+        isinstance(value, (list, tuple)) and len(value) == 2
+        and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)
+    ):
+        return f"{value[0]},{value[1]}"
+    raise ValueError(f"invalid position {value!r} (expected a string or [x, y])")
+
+
+class SpatialGrid:
+    """
+    Index spatial en grille uniforme (cellules hachées), cloisonné par zone
+    - Entités à coordonnées: rangées dans la cellule (zone, ⌊x/cell⌋, ⌊y/cell⌋)
+    - Entités sans coordonnées: présentes dans toute leur zone
+    Requête de rayon r: (2⌈r/cell⌉+1)² cellules visitées, indépendant du nombre d'entités
+    """
+    
+    __slots__ = ("cell_size", "_cells", "_zones", "_entries")
+    
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError(f"Invalid cell size: {cell_size}")
+        self.cell_size = float(cell_size)
+        self._cells: Dict[Tuple[str, int, int], Dict[Any, Tuple[float, float]]] = {}
+        self._zones: Dict[str, Dict[Any, None]] = {}
+        self._entries: Dict[Any, Tuple[str, Optional[float], Optional[float]]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+    
+    def _cell(self, zone: str, x: float, y: float) -> Tuple[str, int, int]:
+        return zone, math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+    
+    def insert(self, key: Any, position: Any):
+        """Ajoute ou déplace une entité"""
+        self.remove(key)
+        zone, x, y = entry = parse_position(position)
+        self._entries[key] = entry
+        if x is None:
+            self._zones.setdefault(zone, {})[key] = None
+        else:
+            self._cells.setdefault(self._cell(zone, x, y), {})[key] = (x, y)
+    
+    def remove(self, key: Any) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        zone, x, y = entry
+        buckets, bucket_key = (self._zones, zone) if x is None else (self._cells, self._cell(zone, x, y))
+        bucket = buckets[bucket_key]
+        del bucket[key]
+        if not bucket:
+            del buckets[bucket_key]
+        return True
+    
+    def query(self, position: Any, radius: float) -> List[Any]:
+        """
+        Entités perçues depuis position: à coordonnées dans le rayon (plus proches d'abord),
+        puis sans coordonnées de la même zone. Sans coordonnées: toute la zone.
+        """
+        zone, x, y = parse_position(position)
+        unplaced = list(self._zones.get(zone, ()))
+        if x is None:
+            return [
+                key for cell, bucket in self._cells.items() if cell[0] == zone for key in bucket
+            ] + unplaced
+        
+        span = math.ceil(radius / self.cell_size)
+        _, cx, cy = self._cell(zone, x, y)
+        if (2 * span + 1) ** 2 <= len(self._cells):
+            cells = (
+                self._cells.get((zone, i, j))
+                for i in range(cx - span, cx + span + 1)
+                for j in range(cy - span, cy + span + 1)
+            )
+        else:
+            # Rayon grand devant la grille: parcours des cellules occupées
+            cells = (bucket for cell, bucket in self._cells.items() if cell[0] == zone)
+        
+        limit = radius * radius
+        hits = []
+        for bucket in cells:
+            if bucket:
+                for key, (px, py) in bucket.items():
+                    distance = (px - x) ** 2 + (py - y) ** 2
+                    if distance <= limit:
+                        hits.append((distance, key))
+        hits.sort(key=lambda hit: hit[0])
+        return [key for _, key in hits] + unplaced
+
+
+class WorldEvent(NamedTuple):
+    """
+    Événement monde compact, partagé par la séquence d'événements et les
+    communications (sérialisé en liste JSON); texte rendu à l'affichage
+    """
+    event_id: int
+    agent: str
+    summary: str
+    
+    def __str__(self) -> str:
+        return f"Événement {self.event_id}: {self.agent} - {self.summary}"
+    
+    @staticmethod
+    def comm_text(entry: Any) -> str:
+        """Ligne communication (entrées texte libres conservées telles quelles)"""
+        if isinstance(entry, WorldEvent):
+            return f"[Evt {entry.event_id}] {entry.agent}: {entry.summary}"
+        return str(entry)
+    
+    @staticmethod
+    def coerce(entry: Any) -> Any:
+        """Liste JSON relue (spill, snapshot) → WorldEvent"""
+        return WorldEvent(*entry) if isinstance(entry, list) and len(entry) == 3 else entry
+
+
+@dataclass
+class WorldState:
+    """État du monde RI"""
+    mission: Dict[str, Any]
+    agents: Dict[str, AgentRecord]
+    environment: Dict[str, Any]
+    knowledge: Dict[str, List[str]]
+    communication: List[Any] = field(default_factory=list)      # BoundedLog de WorldEvent en pratique
+    event_sequence: List[Any] = field(default_factory=list)     # BoundedLog de WorldEvent en pratique
+    time_event: int = 0
+
+
+@dataclass
+class RoundContext:
+    """Contexte d'un tour: corps partagé (rendu une fois) + identité par agent"""
+    shared: str
+    identities: Dict[str, str]
+    world_version: int
+    
+    def for_agent(self, agent_name: str) -> str:
+        """Contexte complet d'un agent (préfixe partagé + identité)"""
+        return self.shared + self.identities[agent_name]
+
+
+class AgentView:
+    """Monde tel que vu par un agent à son dernier contexte (base du contexte delta)"""
+    
+    __slots__ = (
+        "time_event", "team_version", "clues", "mission", "environment", "identity", "perceived",
+        "objects", "deltas"
+    )
+    
+    def __init__(
+        self,
+        time_event: int,
+        team_version: int,
+        clues: int,
+        mission: Tuple[Any, ...],
+        environment: Tuple[Any, ...],
+        identity: str,
+        perceived: Optional[frozenset],
+        objects: str,
+        deltas: int
+    ):
+        self.time_event = time_event
+        self.team_version = team_version
+        self.clues = clues
+        self.mission = mission
+        self.environment = environment
+        self.identity = identity
+        self.perceived = perceived
+        self.objects = objects
+        self.deltas = deltas
+
+
+class TokenEstimator:
+    """
+    Estimation rapide du nombre de tokens (sans tokenizer)
+    Un token ≈ un segment de mot de 6 caractères max ou un symbole: majorant
+    raisonnable des tokenizers BPE, additif (somme des fragments ≥ concaténation).
+    Résultats mémorisés par fragment (LRU) : les fragments cachés sont gratuits.
+    """
+    
+    _TOKEN_RE = re.compile(r"\w{1,6}|[^\w\s]")
+    
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+    
+    def estimate(self, text: str) -> int:
+        """Tokens estimés d'un texte"""
+        if not text:
+            return 0
+        tokens = self._cache.get(text)
+        if tokens is not None:
+            self._cache.move_to_end(text)
+            return tokens
+        tokens = len(self._TOKEN_RE.findall(text))
+        self._cache[text] = tokens
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return tokens
+    
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Préfixe du texte tenant dans max_tokens"""
+        if max_tokens <= 0:
+            return ""
+        for count, match in enumerate(self._TOKEN_RE.finditer(text), 1):
+            if count == max_tokens:
+                return text[:match.end()]
+        return text
+
+
+class LatencyHistogram:
+    """
+    Histogramme de latences (ms) à buckets log-scale fixes - mémoire constante
+    Bucket i couvre ]MIN_MS·FACTOR^(i-1), MIN_MS·FACTOR^i] (1µs → ~100s, puis débordement)
+    Quantiles = borne haute du bucket (erreur relative ≤ FACTOR - 1), max exact.
+    Buckets identiques partout: histogrammes fusionnables par simple somme.
+    """
+    
+    MIN_MS = 0.001
+    FACTOR = 1.25
+    BUCKETS = 84
+    BOUNDS: Tuple[float, ...] = ()  # calculées après la classe
+    _LOG_FACTOR = math.log(FACTOR)
+    
+    __slots__ = ("counts", "count", "sum_ms", "max_ms")
+    
+    def __init__(self):
+        self.counts = [0] * (self.BUCKETS + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, ms: float):
+        """Enregistre une latence (ms)"""
+        if ms <= self.MIN_MS:
+            index = 0
+        else:
+            index = min(self.BUCKETS, math.ceil(math.log(ms / self.MIN_MS) / self._LOG_FACTOR))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+    
+    def quantile(self, q: float) -> float:
+        """Quantile q (0-1) estimé en ms"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                bound = self.BOUNDS[index] if index < self.BUCKETS else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+    
+    def merge(self, other: "LatencyHistogram"):
+        """Ajoute les observations d'un autre histogramme"""
+        for index, bucket_count in enumerate(other.counts):
+            self.counts[index] += bucket_count
+        self.count += other.count
+        self.sum_ms += other.sum_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """count, moyenne, p50/p95/p99 et max (ms)"""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 4) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50), 4),
+            "p95_ms": round(self.quantile(0.95), 4),
+            "p99_ms": round(self.quantile(0.99), 4),
+            "max_ms": round(self.max_ms, 4)
+        }
+
+
+LatencyHistogram.BOUNDS = tuple(
+    LatencyHistogram.MIN_MS * LatencyHistogram.FACTOR ** i for i in range(LatencyHistogram.BUCKETS)
+)
+
+
+class MetricsRegistry:
+    """
+    Métriques process, agrégées sur tous les mondes
+    - latence par (module, opération), erreurs, gauge in_flight par module
+    - export texte au format d'exposition Prometheus
+    Survit à l'éviction des mondes (compteurs monotones).
+    """
+    
+    QUANTILES = (0.5, 0.95, 0.99)
+    
+    def __init__(self):
+        self.latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.in_flight: Dict[str, int] = {}
+    
+    def histogram(self, module: str, operation: str) -> LatencyHistogram:
+        """Histogramme (module, opération), créé au premier usage"""
+        key = (module, operation)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = LatencyHistogram()
+        return histogram
+    
+    def record(self, module: str, operation: str, duration_ms: float, error: bool = False):
+        """Enregistre une exécution"""
+        self.histogram(module, operation).observe(duration_ms)
+        if error:
+            self.errors[(module, operation)] = self.errors.get((module, operation), 0) + 1
+    
+    def track_in_flight(self, module: str, delta: int):
+        self.in_flight[module] = self.in_flight.get(module, 0) + delta
+    
+    def render_prometheus(self, gauges: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """
+        Exposition texte Prometheus (text/plain; version=0.0.4)
+        gauges: {groupe: {clé: valeur}} exportées en ir_<groupe>_<clé> (valeurs numériques)
+        """
+        lines = [
+            "# HELP ir_operation_latency_ms Latence des opérations par module (ms)",
+            "# TYPE ir_operation_latency_ms summary"
+        ]
+        for (module, operation), histogram in sorted(self.latency.items()):
+            labels = f'module="{_prom_escape(module)}",operation="{_prom_escape(operation)}"'
+            for q in self.QUANTILES:
+                lines.append(f'ir_operation_latency_ms{{{labels},quantile="{q}"}} {histogram.quantile(q):.6g}')
+            lines.append(f"ir_operation_latency_ms_sum{{{labels}}} {histogram.sum_ms:.6g}")
+            lines.append(f"ir_operation_latency_ms_count{{{labels}}} {histogram.count}")
+        
+        lines += [
+            "# HELP ir_operation_latency_max_ms Latence maximale observée (ms)",
+            "# TYPE ir_operation_latency_max_ms gauge"
         ]
+        for (module, operation), histogram in sorted(self.latency.items()):
+            lines.append(
+                f'ir_operation_latency_max_ms{{module="{_prom_escape(module)}",'
+                f'operation="{_prom_escape(operation)}"}} {histogram.max_ms:.6g}'
+            )
+        
+        lines += ["# HELP ir_operation_errors_total Opérations en erreur", "# TYPE ir_operation_errors_total counter"]
+        for (module, operation), count in sorted(self.errors.items()):
+            lines.append(
+                f'ir_operation_errors_total{{module="{_prom_escape(module)}",'
+                f'operation="{_prom_escape(operation)}"}} {count}'
+            )
+        
+        lines += ["# HELP ir_in_flight Opérations en cours par module", "# TYPE ir_in_flight gauge"]
+        for module, count in sorted(self.in_flight.items()):
+            lines.append(f'ir_in_flight{{module="{_prom_escape(module)}"}} {count}')
+        
+        for group, values in (gauges or {}).items():
+            for key, value in (values or {}).items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = re.sub(r"[^a-zA-Z0-9_]", "_", f"ir_{group}_{key}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value:.6g}" if isinstance(value, float) else f"{name} {value}")
+        
+        return "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def merge_expositions(expositions: Dict[str, str], label: str = "shard") -> str:
+        """
+        Fusionne plusieurs expositions texte (une par process) en une seule:
+        échantillons étiquetés label="<clé>", regroupés par famille de métriques
+        """
+        families: Dict[str, Tuple[List[str], List[str]]] = {}
+        for key, text in expositions.items():
+            current = None
+            for line in text.splitlines():
+                if line.startswith("#"):
+                    current = line.split(" ", 3)[2]
+                    headers, _ = families.setdefault(current, ([], []))
+                    if line not in headers:
+                        headers.append(line)
+                elif line and current is not None:
+                    name, brace, rest = line.partition("{")
+                    if brace:
+                        sample = f'{name}{{{label}="{_prom_escape(key)}",{rest}'
+                    else:
+                        name, _, value = line.partition(" ")
+                        sample = f'{name}{{{label}="{_prom_escape(key)}"}} {value}'
+                    families[current][1].append(sample)
+        
+        lines = []
+        for headers, samples in families.values():
+            lines += headers + samples
+        return "\n".join(lines) + "\n"
+
+
+def _prom_escape(value: str) -> str:
+    """Échappement valeur de label Prometheus"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Registre global (un par process)
+METRICS = MetricsRegistry()
+
+
+class IRModule(ABC):
+    """Interface de base pour modules IR"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.metrics = {
+            "executions": 0,
+            "errors": 0,
+            "total_time_ms": 0,
+            "in_flight": 0
+        }
+        # Latence par opération (mémoire constante: buckets fixes)
+        self.latency: Dict[str, LatencyHistogram] = {}
+    
+    async def execute(self, input_data: Any, operation: str, metadata: Optional[Dict] = None) -> Dict:
+        """Exécute opération avec métriques (horloge monotone, histogramme par opération)"""
+        start = time.perf_counter()
+        metadata = metadata or {}
+        self.metrics["in_flight"] += 1
+        METRICS.track_in_flight(self.name, 1)
+        
+        try:
+            self.metrics["executions"] += 1
+            result = await self._process(input_data, operation, metadata)
+            duration = (time.perf_counter() - start) * 1000
+            self.metrics["total_time_ms"] += duration
+            self._record(operation, duration)
+            
+            return {
+                "success": True,
+                "result": result,
+                "duration": duration
+            }
+        except Exception as e:
+            self.metrics["errors"] += 1
+            duration = (time.perf_counter() - start) * 1000
+            self._record(operation, duration, error=True)
+            logger.error(f"Error in {self.name}: {str(e)}")
+            
+            return {
+                "success": False,
+                "error": str(e),
+                "duration": duration
+            }
+        finally:
+            self.metrics["in_flight"] -= 1
+            METRICS.track_in_flight(self.name, -1)
+    
+    def _record(self, operation: str, duration_ms: float, error: bool = False):
+        """Latence dans l'histogramme du module et le registre process"""
+        histogram = self.latency.get(operation)
+        if histogram is None:
+            histogram = self.latency[operation] = LatencyHistogram()
+        histogram.observe(duration_ms)
+        METRICS.record(self.name, operation, duration_ms, error)
+    
+    @abstractmethod
+    async def _process(self, input_data: Any, operation: str, metadata: Dict) -> Any:
+        """Implémentation traitement spécifique"""
+        pass
+    
+    def get_health(self) -> Dict:
+        """Retourne métriques santé module"""
+        avg_time = (
+            self.metrics["total_time_ms"] / self.metrics["executions"]
+            if self.metrics["executions"] > 0 else 0
+        )
+        
+        return {
+            "name": self.name,
+            "status": "healthy",
+            "metrics": self.metrics,
+            "avg_time_ms": round(avg_time, 2),
+            "operations": {
+                operation: histogram.snapshot() for operation, histogram in self.latency.items()
+            }
+        }
+
+
+# ============================================
+# SECTION 4 : REALITY ENGINE v3.0
+# ============================================
+
+class RealityEngineV3(IRModule):
+    """
+    Moteur RI v3.0 - Optimisé cognition LLM
+    Gère état monde partagé et contexte hiérarchique
+    """
+    
+    # Niveaux de contexte cachables (invalidés indépendamment)
+    SECTIONS = ("mission", "team", "knowledge", "history", "comms", "environment")
+    _SEPARATOR = "\n" + "─" * 70 + "\n"
+    _TEAM_HEADER = "\n👥 ÉQUIPE PRÉSENTE (collaboration requise):\n"
+    _TEAM_CHANGES_WINDOW = 4096
+    # Événements récents rendus (historique du contexte complet, nouveaux événements du delta)
+    _RECENT_EVENTS = 5
+    
+    def __init__(self, world_id: Optional[str] = None):
+        super().__init__("RealityEngineV3")
+        self.world_id = world_id
+        self.world_state = self._initialize_world()
         
-        for pattern in meta_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        # Cache fragments rendus, versionné par section
+        self.world_version = 0
+        self._section_versions = {section: 0 for section in self.SECTIONS}
+        self._section_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._identity_cache: Dict[str, Tuple[Any, str]] = {}
+        # Dernières lignes rendues (entrée, ligne) de l'historique et des communications, par log;
+        # valides tant que le total du log et sa dernière entrée n'ont pas changé
+        self._recent_lines: Tuple[deque, deque] = (
+            deque(maxlen=self._RECENT_EVENTS), deque(maxlen=self._RECENT_EVENTS)
+        )
+        self._recent_totals = [0, 0]
+        self.token_estimator = TokenEstimator()
+        
+        # Perception: lignes équipe par agent, index spatiaux (agents, objets positionnés) versionnés
+        self._team_lines: Dict[str, str] = {}
+        self._agent_index: Optional[Tuple[Any, SpatialGrid]] = None
+        self._object_index: Optional[Tuple[Any, SpatialGrid]] = None
+        
+        # Contexte delta: dernière vue par agent, journal des agents modifiés (version équipe, nom)
+        self._views: Dict[str, AgentView] = {}
+        self._team_changes: deque = deque(maxlen=self._TEAM_CHANGES_WINDOW)
+        self._team_reset = 0
+        
+        # Persistance optionnelle (WAL + snapshots)
+        self.journal: Optional[WorldJournal] = None
+        self._journal_meta: Dict[str, Any] = {}
+        # Observateur des mutations (enregistrement de session rejouable)
+        self.recorder = None
+    
+    def _history_log(self, name: str, window: int, items: Optional[List[Any]] = None) -> BoundedLog:
+        """Historique borné du monde, spill dans spill_dir/<world_id>/<name>.jsonl"""
+        spill_dir = CONFIG["history"]["spill_dir"]
+        spill_path = (
+            Path(spill_dir) / self.world_id / f"{name}.jsonl"
+            if spill_dir and self.world_id else None
+        )
+        return BoundedLog(window, items, spill_path)
+    
+    def _initialize_world(self) -> WorldState:
+        """Initialise état monde par défaut"""
+        history = CONFIG["history"]
+        return WorldState(
+            mission={
+                "title": "Anomalie Système Critique",
+                "code": "#X7-THETA",
+                "urgency": "HAUTE",
+                "progress": 0,
+                "max_steps": 3
+            },
+            agents={},
+            environment={
+                "location": "Salle Conférence Nexus",
+                "time_event": 0,
+                "layout": "Table ronde centrale, terminaux",
+                "atmosphere": "Tension urgence palpable"
+            },
+            knowledge={
+                "clues": ["Code #X7-THETA → module synchronisation temporelle"],
+                "hypotheses": self._history_log("hypotheses", history["hypotheses_window"]),
+                "actions_taken": []
+            },
+            communication=self._history_log("communication", history["comms_window"]),
+            event_sequence=self._history_log("events", history["events_window"], [
+                "Événement -3: Anomalie détectée système central",
+                "Événement -2: Systèmes critiques mode dégradé",
+                "Événement -1: Mission collaborative initiée",
+                "Événement 0: Agents activés mission urgente"
+            ])
+        )
+    
+    def flush_history(self):
+        """Force écriture des entrées évincées en attente"""
+        for entries in (
+            self.world_state.event_sequence,
+            self.world_state.communication,
+            self.world_state.knowledge['hypotheses']
+        ):
+            if isinstance(entries, BoundedLog):
+                entries.flush()
+    
+    def configure_world(
+        self,
+        name: Optional[str] = None,
+        objects: Optional[List[Dict[str, Any]]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """Personnalise environnement (payload /api/v1/world/create)"""
+        metadata = metadata or {}
+        if name:
+            self.world_state.environment["location"] = name
+        if objects:
+            self.world_state.environment["objects"] = list(objects)
+        if metadata.get("description"):
+            self.world_state.environment["atmosphere"] = metadata["description"]
+        if metadata.get("perception_radius") is not None:
+            self.world_state.environment["perception_radius"] = float(metadata["perception_radius"])
+        self.invalidate("environment")
+        self._journal("cfg", name, objects, metadata)
+    
+    def register_agent(self, agent_config: AgentConfig):
+        """Enregistre nouvel agent dans monde"""
+        name = sys.intern(agent_config.name)
+        record = AgentRecord(agent_config.position, agent_config.specialty, "Actif", agent_config.energy)
+        previous = self.world_state.agents.get(name)
+        self.world_state.agents[name] = record
+        # Ré-enregistrement à l'identique (scénarios successifs): équipe inchangée
+        if previous is None or previous.to_state() != record.to_state():
+            self._team_changed(name)
+        self._journal(
+            "reg", agent_config.name, agent_config.specialty, agent_config.position, agent_config.energy
+        )
+    
+    def move_agent(self, agent_name: str, position: str):
+        """Déplace un agent (coordonnées "x,y", "zone@x,y" ou zone)"""
+        agent = self.world_state.agents.get(agent_name)
+        if agent is None:
+            raise ValueError(f"Agent {agent_name} not registered")
+        agent["position"] = position
+        
+        # Invalidation ciblée: ligne équipe de l'agent re-rendue, index spatial mis à jour sur place
+        index = self._agent_index
+        fresh = index is not None and index[0] == self._agent_index_key()
+        self._team_changed(agent_name)
+        if fresh:
+            index[1].insert(agent_name, position)
+            self._agent_index = (self._agent_index_key(), index[1])
+        self._journal("mov", agent_name, position)
+    
+    def _team_changed(self, agent_name: str):
+        """Invalidation ciblée de l'équipe: un seul agent modifié (tracé pour les contextes delta)"""
+        self._team_lines.pop(agent_name, None)
+        self._section_versions["team"] += 1
+        self.world_version += 1
+        self._team_changes.append((self._section_versions["team"], agent_name))
+    
+    # --- Persistance (event sourcing) ---
+    
+    def attach_journal(self, journal: WorldJournal, meta: Optional[Dict[str, Any]] = None, snapshot: bool = True):
+        """Journalise désormais chaque mutation (snapshot initial par défaut)"""
+        self.journal = journal
+        self._journal_meta = dict(meta or {})
+        if snapshot:
+            self.snapshot()
+    
+    def _journal(self, op: str, *args: Any):
+        if self.recorder is not None:
+            self.recorder(op, args)
+        if self.journal is not None and self.journal.append(op, *args):
+            self.snapshot()
+    
+    def snapshot(self):
+        """Snapshot complet de l'état (WAL tronqué)"""
+        if self.journal is not None:
+            self.journal.snapshot(self.export_state())
+    
+    def export_state(self) -> Dict[str, Any]:
+        """WorldState sérialisable (fenêtres d'historique + compteurs)"""
+        state = self.world_state
+        
+        def log_state(entries):
+            return entries.to_state() if isinstance(entries, BoundedLog) else {"items": list(entries)}
+        
+        return {
+            "meta": self._journal_meta,
+            "world_id": self.world_id,
+            "time_event": state.time_event,
+            "mission": state.mission,
+            "agents": {name: agent.to_state() for name, agent in state.agents.items()},
+            "environment": state.environment,
+            "knowledge": {
+                "clues": list(state.knowledge["clues"]),
+                "actions_taken": list(state.knowledge["actions_taken"]),
+                "hypotheses": log_state(state.knowledge["hypotheses"])
+            },
+            "communication": log_state(state.communication),
+            "event_sequence": log_state(state.event_sequence)
+        }
+    
+    def load_state(self, data: Dict[str, Any]):
+        """Recharge un état export_state (contexte entièrement invalidé)"""
+        state = self.world_state
+        state.time_event = data["time_event"]
+        state.mission = data["mission"]
+        state.agents = {
+            sys.intern(name): AgentRecord.from_state(agent) for name, agent in data["agents"].items()
+        }
+        state.environment = data["environment"]
+        state.knowledge["clues"] = list(data["knowledge"]["clues"])
+        state.knowledge["actions_taken"] = list(data["knowledge"]["actions_taken"])
+        state.knowledge["hypotheses"].restore_state(data["knowledge"]["hypotheses"])
+        # Événements partagés à nouveau entre séquence et communications
+        events = {}
+        for key in ("event_sequence", "communication"):
+            log_data = data[key]
+            items = []
+            for item in log_data.get("items", []):
+                event = WorldEvent.coerce(item)
+                if isinstance(event, WorldEvent):
+                    event = events.setdefault(event, event)
+                items.append(event)
+            getattr(state, key).restore_state({**log_data, "items": items})
+        self._journal_meta = data.get("meta", {})
+        self._identity_cache.clear()
+        self.invalidate()
+    
+    def apply_record(self, record: List[Any]):
+        """Rejoue une mutation du WAL (journal détaché pendant le rejeu)"""
+        _, op, *args = record
+        if op == "upd":
+            self._apply_update(*args)
+            self._journal(op, *args)
+        elif op == "reg":
+            name, specialty, position, energy = args
+            self.register_agent(AgentConfig(
+                name=name, model="", role="", specialty=specialty, position=position, energy=energy
+            ))
+        elif op == "mov":
+            self.move_agent(*args)
+        elif op == "cfg":
+            self.configure_world(*args)
+        else:
+            raise ValueError(f"Unknown journal record: {op}")
+    
+    def state_digest(self) -> str:
+        """Empreinte de l'état logique complet (hors compteurs de spill disque)"""
+        state = self.world_state
+        payload = [
+            state.time_event,
+            state.mission,
+            {name: agent.to_state() for name, agent in state.agents.items()},
+            state.environment,
+            state.knowledge["clues"],
+            state.knowledge["actions_taken"],
+            [
+                [list(entries), log_count(entries)]
+                for entries in (state.knowledge["hypotheses"], state.communication, state.event_sequence)
+            ]
+        ]
+        encoded = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+    
+    def invalidate(self, *sections: str):
+        """
+        Invalide fragments de contexte cachés (toutes sections si aucune)
+        À appeler après modification directe de world_state
+        """
+        for section in sections or self.SECTIONS:
+            self._section_versions[section] += 1
+        if not sections or "team" in sections:
+            # Changements non tracés: les contextes delta repartent d'un contexte complet
+            self._team_lines.clear()
+            self._team_reset = self._section_versions["team"]
+        self.world_version += 1
+    
+    def _cached(self, section: str, key: Any, render) -> Any:
+        """Fragment caché tant que (version section, clé) inchangés"""
+        full_key = (self._section_versions[section], key)
+        cached = self._section_cache.get(section)
+        if cached is not None and cached[0] == full_key:
+            return cached[1]
+        fragment = render()
+        self._section_cache[section] = (full_key, fragment)
+        return fragment
+    
+    def _render_mission(self) -> str:
+        mission = self.world_state.mission
+        return f"""
+🚨 ÉTAT CRITIQUE - ATTENTION PRIORITAIRE
+
+MISSION URGENTE: {mission['title']}
+Code erreur: {mission['code']}
+Urgence: {mission['urgency']}
+Progression: {mission['progress']}/{mission['max_steps']} étapes
+
+"""
+    
+    def _render_identity(self, agent_name: str) -> str:
+        agent = self.world_state.agents[agent_name]
+        return f"""VOTRE IDENTITÉ: {agent_name}
+Spécialité: {agent.specialty}
+Position: {agent.position}
+Statut: {agent.status} | Énergie: {agent.energy_label}
+"""
+    
+    def _team_line(self, name: str) -> str:
+        """Ligne équipe d'un agent (cachée jusqu'à invalidation de l'équipe ou déplacement)"""
+        line = self._team_lines.get(name)
+        if line is None:
+            agent = self.world_state.agents[name]
+            line = self._team_lines[name] = (
+                f"  • {name} - {agent.specialty}\n"
+                f"    Position: {agent.position} | Énergie: {agent.energy_label}\n"
+            )
+        return line
+    
+    def _render_team_block(self) -> Tuple[str, Dict[str, Tuple[int, int]]]:
+        """
+        Lignes équipe rendues une fois + offsets par agent (pour exclure soi)
+        Perception désactivée: rendu direct, sans cache par ligne ni index spatial
+        """
+        lines = []
+        offsets = {}
+        position = 0
+        for name, agent in self.world_state.agents.items():
+            line = (
+                f"  • {name} - {agent.specialty}\n"
+                f"    Position: {agent.position} | Énergie: {agent.energy_label}\n"
+            )
+            offsets[name] = (position, position + len(line))
+            position += len(line)
+            lines.append(line)
+        return "".join(lines), offsets
+    
+    def perception_radius(self) -> float:
+        """Rayon de perception du monde (0: désactivé, toute l'équipe visible)"""
+        radius = self.world_state.environment.get("perception_radius")
+        return float(CONFIG["perception"]["radius"] if radius is None else radius)
+    
+    def _cell_size(self) -> float:
+        return CONFIG["perception"]["cell_size"] or self.perception_radius()
+    
+    def _agent_index_key(self) -> Tuple[int, float]:
+        return self._section_versions["team"], self._cell_size()
+    
+    def _agent_grid(self) -> SpatialGrid:
+        """Index spatial des agents (reconstruit si l'équipe a été invalidée)"""
+        key = self._agent_index_key()
+        if self._agent_index is None or self._agent_index[0] != key:
+            grid = SpatialGrid(key[1])
+            for name, agent in self.world_state.agents.items():
+                grid.insert(name, agent.position)
+            self._agent_index = (key, grid)
+        return self._agent_index[1]
+    
+    def _object_grid(self) -> SpatialGrid:
+        """Index spatial des objets positionnés (clé: rang dans environment["objects"])"""
+        key = (self._section_versions["environment"], self._cell_size())
+        if self._object_index is None or self._object_index[0] != key:
+            grid = SpatialGrid(key[1])
+            for index, obj in enumerate(self.world_state.environment.get("objects") or ()):
+                if obj.get("position") is not None:
+                    grid.insert(index, obj["position"])
+            self._object_index = (key, grid)
+        return self._object_index[1]
+    
+    def _perceived(self, agent_name: str, radius: float) -> Tuple[List[str], str]:
+        """
+        Équipe et objets à portée d'un agent → (lignes équipe plus proches d'abord, ligne objets)
+        Coût O(voisins) via l'index spatial, indépendant de la taille du monde
+        """
+        state = self.world_state
+        position = state.agents[agent_name].position
+        names = [name for name in self._agent_grid().query(position, radius) if name != agent_name]
+        lines = [self._team_line(name) for name in names]
+        hidden = len(state.agents) - 1 - len(names)
+        if hidden:
+            lines.append(f"  … +{hidden} agents hors de portée de perception\n")
+        return lines, self._nearby_objects(position, radius)
+    
+    def _nearby_objects(self, position: str, radius: float) -> str:
+        """Ligne des objets positionnés à portée (vide si aucun)"""
+        grid = self._object_grid()
+        nearby = grid.query(position, radius) if len(grid) else []
+        if not nearby:
+            return ""
+        objects = self.world_state.environment["objects"]
+        return "Objets à portée: " + ", ".join(self._object_label(objects[index]) for index in nearby) + "\n"
+    
+    def _render_knowledge(self) -> str:
+        parts = ["\n🔍 CONNAISSANCES ÉQUIPE:\n"]
+        if self.world_state.knowledge['clues']:
+            parts.append("  Indices découverts:\n")
+            parts.extend(f"    → {clue}\n" for clue in self.world_state.knowledge['clues'])
+        return "".join(parts)
+    
+    @staticmethod
+    def _event_line(entry: Any, comm: bool = False) -> str:
+        return f"  {WorldEvent.comm_text(entry) if comm else entry}\n"
+    
+    def _tail_lines(self, log: Any, count: int, comm: bool = False) -> List[str]:
+        """Lignes des count dernières entrées (historique ou communications), formatées une seule fois"""
+        size = min(count, len(log))
+        if not size:
+            return []
+        lines = self._recent_lines[comm]
+        total = log_count(log)
+        if self._recent_totals[comm] != total or len(lines) < size or lines[-1][0] is not log[-1]:
+            # Log modifié hors _apply_update (chargement, édition directe): lignes reconstruites
+            lines.clear()
+            lines.extend((entry, self._event_line(entry, comm)) for entry in log[-self._RECENT_EVENTS:])
+            self._recent_totals[comm] = total
+        return [line for _, line in list(lines)[-size:]]
+    
+    def _render_history(self) -> str:
+        return "".join((
+            "\n📜 SÉQUENCE ÉVÉNEMENTS (ordre chronologique):\n",
+            *self._tail_lines(self.world_state.event_sequence, self._RECENT_EVENTS)
+        ))
+    
+    def _render_comms(self) -> str:
+        if not self.world_state.communication:
+            return ""
+        return "".join((
+            "\n💬 COMMUNICATIONS RÉCENTES:\n",
+            *self._tail_lines(self.world_state.communication, 3, comm=True)
+        ))
+    
+    @staticmethod
+    def _object_label(obj: Dict[str, Any]) -> str:
+        return f"{obj.get('id', '?')} ({obj.get('type', 'objet')}, {obj.get('state', 'stable')})"
+    
+    def _environment_key(self, radius: float) -> Tuple[Any, ...]:
+        return tuple(self.world_state.environment.values()), radius > 0
+    
+    def _render_environment(self) -> str:
+        environment = self.world_state.environment
+        
+        # Objets présents (mondes créés via API); positionnés: par agent si perception active
+        visible = environment.get("objects") or []
+        if visible and self.perception_radius() > 0:
+            visible = [obj for obj in visible if obj.get("position") is None]
+        objects = "Objets: " + ", ".join(map(self._object_label, visible)) + "\n" if visible else ""
+        
+        return f"""
+🎯 ENVIRONNEMENT PHYSIQUE:
+Lieu: {environment['location']}
+Configuration: {environment['layout']}
+Ambiance: {environment['atmosphere']}
+{objects}"""
+    
+    def get_hierarchical_context(self, agent_name: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Génère contexte hiérarchique optimisé attention LLM
+        Priorité: Info critique first
+        Chaque niveau est un fragment caché, re-rendu seulement si invalidé
+        max_tokens: budget (tokens estimés) - niveaux bas réduits pour tenir
+        """
+        if agent_name not in self.world_state.agents:
+            raise ValueError(f"Agent {agent_name} not registered")
+        
+        state = self.world_state
+        
+        # NIVEAU 1: ÉTAT CRITIQUE (haute priorité attention)
+        mission = self._cached("mission", tuple(state.mission.values()), self._render_mission)
+        identity_key = (self._section_versions["team"], len(state.agents))
+        cached_identity = self._identity_cache.get(agent_name)
+        if cached_identity is None or cached_identity[0] != identity_key:
+            cached_identity = (identity_key, self._render_identity(agent_name))
+            self._identity_cache[agent_name] = cached_identity
+        
+        # NIVEAU 2: ÉQUIPE (contexte collaboratif, sans l'agent lui-même)
+        environment = state.environment
+        radius = environment.get("perception_radius")
+        radius = float(CONFIG["perception"]["radius"] if radius is None else radius)
+        if radius > 0:
+            # Perception active: agents et objets à portée seulement
+            team_lines, nearby_objects = self._perceived(agent_name, radius)
+            team_before, team_after = "".join(team_lines), ""
+        else:
+            team_text, offsets = self._cached("team", len(state.agents), self._render_team_block)
+            start, end = offsets[agent_name]
+            team_before, team_after = team_text[:start], team_text[end:]
+            nearby_objects = ""
+        
+        sep = self._SEPARATOR
+        pieces = (
+            mission, cached_identity[1], sep,
+            self._TEAM_HEADER,
+            team_before, team_after, sep,
+            # NIVEAU 3: CONNAISSANCES
+            self._cached("knowledge", len(state.knowledge['clues']), self._render_knowledge),
+            sep,
+            # NIVEAU 4: HISTORIQUE ÉVÉNEMENTS (temporalité relative)
+            self._cached("history", log_count(state.event_sequence), self._render_history),
+            "\n",
+            # NIVEAU 5: COMMUNICATIONS
+            self._cached("comms", log_count(state.communication), self._render_comms),
+            sep,
+            # Clé _environment_key(radius), calculée sur place (chemin chaud)
+            self._cached(
+                "environment", (tuple(environment.values()), radius > 0), self._render_environment
+            ) + nearby_objects
+        )
+        
+        # Estimation additive: somme des fragments ≥ estimation du texte joint
+        if max_tokens is None or sum(map(self.token_estimator.estimate, pieces)) <= max_tokens:
+            return "".join(pieces)
+        
+        if radius <= 0:
+            team_lines = [
+                team_text[line_start:line_end]
+                for name, (line_start, line_end) in offsets.items() if name != agent_name
+            ]
+        return self._fit_context(
+            mission, cached_identity[1], team_lines, pieces[-1], max_tokens
+        )
+    
+    def _fit_context(
+        self,
+        mission: str,
+        identity: str,
+        team_lines: List[str],
+        environment: str,
+        max_tokens: int
+    ) -> str:
+        """
+        Contexte réduit au budget, niveaux remplis par priorité:
+        critique (mission, identité, environnement) > équipe > connaissances
+        > historique > communications. Les éléments omis sont résumés.
+        """
+        estimate = self.token_estimator.estimate
+        state = self.world_state
+        sep = self._SEPARATOR
+        
+        # NIVEAU 1: critique + squelette (jamais réduits)
+        skeleton = (mission, identity, sep, self._TEAM_HEADER, sep, sep, "\n", sep, environment)
+        remaining = max_tokens - sum(map(estimate, skeleton))
+        if remaining < 0:
+            logger.warning(f"Critical context exceeds budget ({max_tokens} tokens), truncated")
+            return self.token_estimator.truncate("".join(skeleton), max_tokens)
+        
+        # NIVEAU 2: équipe (premiers agents gardés)
+        team, used = self._fit_lines(
+            "", team_lines, remaining, "  … +{n} autres agents présents\n", keep_last=False
+        )
+        remaining -= used
+        
+        # NIVEAU 3: connaissances (indices les plus récents)
+        clues = state.knowledge['clues']
+        knowledge_header = "\n🔍 CONNAISSANCES ÉQUIPE:\n" + ("  Indices découverts:\n" if clues else "")
+        knowledge, used = self._fit_lines(
+            knowledge_header, [f"    → {clue}\n" for clue in clues],
+            remaining, "    … +{n} indices antérieurs\n"
+        )
+        remaining -= used
+        
+        # NIVEAU 4: historique (événements les plus récents)
+        history, used = self._fit_lines(
+            "\n📜 SÉQUENCE ÉVÉNEMENTS (ordre chronologique):\n",
+            self._tail_lines(state.event_sequence, self._RECENT_EVENTS),
+            remaining, "  … +{n} événements antérieurs\n"
+        )
+        remaining -= used
+        
+        # NIVEAU 5: communications (messages les plus récents)
+        comms = ""
+        if state.communication:
+            comms, used = self._fit_lines(
+                "\n💬 COMMUNICATIONS RÉCENTES:\n",
+                self._tail_lines(state.communication, 3, comm=True),
+                remaining, "  … +{n} messages antérieurs\n"
+            )
+        
+        return "".join((
+            mission, identity, sep, self._TEAM_HEADER, team, sep,
+            knowledge, sep, history, "\n", comms, sep, environment
+        ))
+    
+    def _fit_lines(
+        self,
+        header: str,
+        lines: List[str],
+        budget: int,
+        note: str,
+        keep_last: bool = True
+    ) -> Tuple[str, int]:
+        """
+        Niveau réduit au budget → (texte, tokens utilisés)
+        Garde les lignes les plus récentes (keep_last) ou les premières,
+        les omises sont résumées par note ; niveau vide si même l'en-tête déborde
+        """
+        estimate = self.token_estimator.estimate
+        used = estimate(header)
+        costs = [estimate(line) for line in lines]
+        if used + sum(costs) <= budget:
+            return header + "".join(lines), used + sum(costs)
+        
+        # Réserve pour la note (majorant: n maximal)
+        used += estimate(note.format(n=len(lines)))
+        if used > budget:
+            return "", 0
+        
+        indices = range(len(lines) - 1, -1, -1) if keep_last else range(len(lines))
+        kept = []
+        for i in indices:
+            if used + costs[i] > budget:
+                break
+            kept.append(i)
+            used += costs[i]
+        kept.sort()
+        
+        summary = note.format(n=len(lines) - len(kept))
+        body = "".join(lines[i] for i in kept)
+        return header + (summary + body if keep_last else body + summary), used
+    
+    def render_round(self, agent_names: Optional[List[str]] = None) -> RoundContext:
+        """
+        Contexte d'un tour complet en O(N)
+        Corps partagé (mission, équipe entière, connaissances, historique,
+        environnement) rendu une fois; seul le bloc identité est par agent.
+        L'équipe inclut chaque agent, l'identité indique lequel est « vous ».
+        Perception active: pas d'équipe partagée, agents et objets à portée dans le bloc par agent.
+        """
+        state = self.world_state
+        names = list(state.agents) if agent_names is None else agent_names
+        for name in names:
+            if name not in state.agents:
+                raise ValueError(f"Agent {name} not registered")
+        
+        radius = self.perception_radius()
+        sep = self._SEPARATOR
+        team = ()
+        if radius <= 0:
+            team_text, _ = self._cached("team", len(state.agents), self._render_team_block)
+            team = ("👥 ÉQUIPE PRÉSENTE (collaboration requise, vous inclus):\n", team_text, sep)
+        shared = "".join((
+            self._cached("mission", tuple(state.mission.values()), self._render_mission),
+            *team,
+            self._cached("knowledge", len(state.knowledge['clues']), self._render_knowledge),
+            sep,
+            self._cached("history", log_count(state.event_sequence), self._render_history),
+            "\n",
+            self._cached("comms", log_count(state.communication), self._render_comms),
+            sep,
+            self._cached("environment", self._environment_key(radius), self._render_environment),
+            sep
+        ))
+        
+        identities = {}
+        marker = "" if radius > 0 else " (vous, dans l'équipe ci-dessus)"
+        for name in names:
+            agent = state.agents[name]
+            identities[name] = (
+                f"\n🪪 VOTRE IDENTITÉ: {name}{marker}\n"
+                f"Spécialité: {agent.specialty}\n"
+                f"Position: {agent.position}\n"
+                f"Statut: {agent.status} | Énergie: {agent.energy_label}\n"
+            )
+            if radius > 0:
+                team_lines, nearby_objects = self._perceived(name, radius)
+                identities[name] += "".join((self._TEAM_HEADER, *team_lines, nearby_objects))
+        
+        return RoundContext(shared=shared, identities=identities, world_version=self.world_version)
+    
+    # --- Contexte delta (providers à état conversationnel) ---
+    
+    def get_delta_context(
+        self,
+        agent_name: str,
+        max_tokens: Optional[int] = None,
+        refresh_every: Optional[int] = None
+    ) -> Tuple[str, bool]:
+        """
+        Contexte depuis le dernier tour de l'agent → (texte, complet?)
+        Delta: nouveaux événements (hors les siens), indices, changements d'équipe, mission,
+        identité et environnement modifiés. Contexte complet au premier tour, tous les
+        refresh_every tours (0: jamais forcé), si un changement n'est pas traçable ou si
+        le delta dépasse max_tokens. La vue de l'agent est mise à jour à chaque appel.
+        """
+        if agent_name not in self.world_state.agents:
+            raise ValueError(f"Agent {agent_name} not registered")
+        if refresh_every is None:
+            refresh_every = CONFIG["orchestrator"]["context_refresh"]
+        
+        radius = self.perception_radius()
+        view = self._views.get(agent_name)
+        delta = None
+        if view is not None and (refresh_every <= 0 or view.deltas + 1 < refresh_every):
+            delta = self._render_delta(agent_name, view, radius)
+        if delta is not None and (max_tokens is None or self.token_estimator.estimate(delta[0]) <= max_tokens):
+            context, perceived, objects = delta
+            deltas = view.deltas + 1
+        else:
+            context = self.get_hierarchical_context(agent_name, max_tokens)
+            perceived, objects = self._perceived_set(agent_name, radius)
+            deltas = 0
+        
+        state = self.world_state
+        self._views[agent_name] = AgentView(
+            state.time_event, self._section_versions["team"], len(state.knowledge['clues']),
+            tuple(state.mission.values()), self._environment_key(radius), self._team_line(agent_name),
+            perceived, objects, deltas
+        )
+        return context, deltas == 0
+    
+    def forget_view(self, agent_name: Optional[str] = None):
+        """Oublie la vue d'un agent (tous si None): prochain contexte complet (ex: appel modèle échoué)"""
+        if agent_name is None:
+            self._views.clear()
+        else:
+            self._views.pop(agent_name, None)
+    
+    def _perceived_set(self, agent_name: str, radius: float) -> Tuple[Optional[frozenset], str]:
+        """Agents à portée (None: perception désactivée) + ligne objets à portée"""
+        if radius <= 0:
+            return None, ""
+        position = self.world_state.agents[agent_name].position
+        names = frozenset(self._agent_grid().query(position, radius))
+        return names - {agent_name}, self._nearby_objects(position, radius)
+    
+    def _team_changes_since(self, team_version: int) -> Optional[List[str]]:
+        """Agents modifiés depuis team_version (ordre chronologique), None si non traçable"""
+        if team_version < self._team_reset:
+            return None
+        changes = self._team_changes
+        if len(changes) == changes.maxlen and changes[0][0] > team_version + 1:
+            return None
+        names = {}
+        for version, name in reversed(changes):
+            if version <= team_version:
+                break
+            names[name] = None
+        return list(reversed(names))
+    
+    def _events_since(self, time_event: int) -> Optional[List[WorldEvent]]:
+        """Événements postérieurs à time_event (fenêtre mémoire), None si la fenêtre ne remonte pas assez"""
+        events = []
+        for entry in reversed(self.world_state.event_sequence):
+            if not isinstance(entry, WorldEvent) or entry.event_id <= time_event:
+                break
+            events.append(entry)
+        else:
+            if events and events[-1].event_id > time_event + 1:
+                return None
+        events.reverse()
+        return events
+    
+    def _render_delta(
+        self,
+        agent_name: str,
+        view: AgentView,
+        radius: float
+    ) -> Optional[Tuple[str, Optional[frozenset], str]]:
+        """Delta depuis view → (texte, agents à portée, ligne objets), None: contexte complet requis"""
+        state = self.world_state
+        clues = state.knowledge['clues']
+        changed = self._team_changes_since(view.team_version)
+        events = self._events_since(view.time_event)
+        if (
+            changed is None or events is None or len(clues) < view.clues
+            or (radius > 0) != (view.perceived is not None)
+        ):
+            return None
+        
+        parts = [
+            f"\n🔄 MISE À JOUR DEPUIS VOTRE DERNIER TOUR "
+            f"(événements {view.time_event} → {state.time_event}):\n"
+        ]
+        mission_key = tuple(state.mission.values())
+        if mission_key != view.mission:
+            parts.append(self._cached("mission", mission_key, self._render_mission))
+        if self._team_line(agent_name) != view.identity:
+            parts.append("\n" + self._render_identity(agent_name))
+        
+        # Équipe: agents modifiés (et entrés/sortis du rayon de perception)
+        perceived, objects = self._perceived_set(agent_name, radius)
+        if perceived is None:
+            shown = [name for name in changed if name != agent_name]
+            left = []
+        else:
+            entered = perceived - view.perceived
+            shown = [name for name in changed if name in perceived and name not in entered]
+            shown.extend(sorted(entered))
+            left = sorted(view.perceived - perceived)
+        if shown or left:
+            parts.append("\n👥 ÉQUIPE (changements):\n")
+            parts.extend(self._team_line(name) for name in shown)
+            if left:
+                parts.append(f"  − Hors de portée: {', '.join(left)}\n")
+        
+        if len(clues) > view.clues:
+            parts.append("\n🔍 NOUVEAUX INDICES:\n")
+            parts.extend(f"    → {clue}\n" for clue in clues[view.clues:])
+        
+        # Même profondeur que l'historique du contexte complet, les plus anciens résumés
+        others = [event for event in events if event.agent != agent_name]
+        if others:
+            parts.append("\n💬 NOUVEAUX ÉVÉNEMENTS:\n")
+            if len(others) > self._RECENT_EVENTS:
+                parts.append(f"  … +{len(others) - self._RECENT_EVENTS} événements antérieurs\n")
+            parts.extend(self._event_line(event, comm=True) for event in others[-self._RECENT_EVENTS:])
+        
+        environment_key = self._environment_key(radius)
+        if environment_key != view.environment:
+            parts.append(self._cached("environment", environment_key, self._render_environment) + objects)
+        elif objects != view.objects:
+            parts.append("\n" + (objects or "Aucun objet à portée\n"))
+        
+        if len(parts) == 1:
+            parts.append("  Aucun changement perçu.\n")
+        return "".join(parts), perceived, objects
+    
+    def update_world(self, agent_name: str, action_summary: str, full_response: str):
+        """Met à jour état monde après action agent"""
+        lowered = full_response.lower()
+        hypothesis = "hypothèse" in lowered or "suppose" in lowered
+        self._apply_update(agent_name, action_summary, hypothesis)
+        self._journal("upd", agent_name, action_summary, hypothesis)
+    
+    def _apply_update(self, agent_name: str, action_summary: str, hypothesis: bool):
+        """Mutation update_world (record WAL compact: la réponse complète n'est pas journalisée)"""
+        state = self.world_state
+        state.time_event += 1
+        
+        # Un seul enregistrement partagé: séquence événements + log communication
+        event = WorldEvent(state.time_event, sys.intern(agent_name), action_summary)
+        state.event_sequence.append(event)
+        state.communication.append(event)
+        
+        # Lignes rendues une fois ici si les lignes récentes de chaque log sont à jour
+        lines, totals = self._recent_lines, self._recent_totals
+        if totals[0] == log_count(state.event_sequence) - 1:
+            lines[0].append((event, f"  {event}\n"))
+            totals[0] += 1
+        if totals[1] == log_count(state.communication) - 1:
+            lines[1].append((event, f"  {WorldEvent.comm_text(event)}\n"))
+            totals[1] += 1
+        
+        # Extraction hypothèses si présentes
+        if hypothesis:
+            excerpt = action_summary[:100]
+            if excerpt not in self.world_state.knowledge['hypotheses']:
+                self.world_state.knowledge['hypotheses'].append(excerpt)
+        
+        self.invalidate("history", "comms")
+    
+    async def _process(self, input_data: Any, operation: str, metadata: Dict) -> Any:
+        """Interface IRModule - dispatch opérations"""
+        if operation == "get_context":
+            return self.get_hierarchical_context(input_data, metadata.get("max_tokens"))
+        elif operation == "get_delta_context":
+            context, full = self.get_delta_context(input_data, metadata.get("max_tokens"))
+            return {"context": context, "full": full}
+        elif operation == "get_round_context":
+            return self.render_round(input_data)
+        elif operation == "update":
+            self.update_world(**input_data)
+            return {"status": "updated"}
+        elif operation == "register_agent":
+            self.register_agent(input_data)
+            return {"status": "registered"}
+        elif operation == "move":
+            self.move_agent(**input_data)
+            return {"status": "moved"}
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+
+
+# ============================================
+# SECTION 5 : RESPONSE PROCESSOR
+# ============================================
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Regex trie (préfixes factorisés) : équivalent alternation, sans
+    retester chaque mot à chaque position. Préfère la correspondance la plus longue.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+    
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+    
+    return build(trie)
+
+
+# Échappements sans lettre (\. \[) ou invariants par la casse (\n \s \w…)
+_CASELESS_ESCAPE_RE = re.compile(r"\\(?:[^\w]|[nrtfvsdwb])")
+
+
+def _lowercase_pattern(pattern: str) -> Optional[re.Pattern]:
+    """
+    Pattern équivalent à pattern + IGNORECASE sur un texte déjà en minuscules,
+    sans IGNORECASE (sre saute alors les positions impossibles) ; None si la
+    syntaxe dépend de la casse (échappements \\S ou \\u00C9, classes [A-Z], noms de groupes…)
+    """
+    plain = _CASELESS_ESCAPE_RE.sub("", pattern)
+    if "\\" in plain or "(?P" in plain or re.search(r"\[[^\]]*[^\W\d_]", plain):
+        return None
+    lowered = pattern.lower()
+    if len(lowered) != len(pattern):
+        return None
+    try:
+        return re.compile(lowered)
+    except re.error:
+        return None
+
+
+class ResponseProcessor(IRModule):
+    """
+    Nettoie réponses LLM pour maintenir immersion
+    Patterns compilés une fois ; texte sans méta-commentaire : un seul passage
+    """
+    
+    # Meta-commentary génériques
+    META_PATTERNS = [
+        r"(Je suis|I am) (un|une|a|an) (modèle|model|LLM|AI|assistant).*?[\.\n]",
+        r"En tant qu(e |')(?:modèle|assistant|IA).*?[\.\n]",
+        r"As (a|an) (language model|AI|assistant).*?[\.\n]"
+    ]
+    
+    # Expressions brisant l'immersion
+    BREAK_WORDS = [
+        'modèle de langage', 'language model', 'llm',
+        'assistant ai', 'intelligence artificielle',
+        'je ne peux pas vraiment', 'simulation',
+        'en tant qu\'ia', 'as an ai'
+    ]
+    
+    # Au-delà : automate trie en un passage plutôt qu'un scan par mot
+    # (benchmarks/bench_response_processor.py : scan substring ~5× plus rapide
+    # avec les 9 mots par défaut, automate plus rapide à partir de ~45 mots)
+    SUBSTRING_SCAN_MAX = 44
+    
+    _THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+    _BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n')
+    _meta_re = None         # compilés au premier usage (compile_patterns)
+    _meta_steps: Tuple[re.Pattern, ...] = ()
+    _break_re = None
+    _break_words: Tuple[str, ...] = ()
+    _break_substrings: Dict[str, frozenset] = {}
+    
+    def __init__(self):
+        super().__init__("ResponseProcessor")
+    
+    @classmethod
+    def compile_patterns(cls):
+        """(Re)compile META_PATTERNS et BREAK_WORDS"""
+        combined = "|".join(f"(?:{pattern})" for pattern in cls.META_PATTERNS)
+        # Alternation : détection en un passage (texte sans méta-commentaire)
+        cls._meta_re = re.compile(combined, re.IGNORECASE)
+        # Suppression pattern par pattern (une correspondance peut en contenir
+        # une autre), appliquée au texte en minuscules
+        cls._meta_steps = tuple(
+            _lowercase_pattern(pattern) or re.compile(pattern, re.IGNORECASE)
+            for pattern in cls.META_PATTERNS
+        )
+        
+        # Trie appliqué au texte en minuscules : sans IGNORECASE, sre saute
+        # directement aux positions dont le 1er caractère peut démarrer un mot.
+        # Listes courtes : scan substring (C) plus rapide que l'automate
+        words = sorted({word.lower() for word in cls.BREAK_WORDS})
+        cls._break_words = tuple(words)
+        # Lookahead (largeur nulle) : une correspondance testée à chaque position,
+        # les mots qui se chevauchent ou s'incluent ne sont pas consommés
+        cls._break_re = (
+            re.compile(f"(?=({_trie_pattern(words)}))") if len(words) > cls.SUBSTRING_SCAN_MAX else None
+        )
+        # Le trie retient le mot le plus long à chaque position : les mots
+        # listés qu'il contient (préfixes, infixes) sont aussi présents
+        cls._break_substrings = {
+            word: frozenset(other for other in words if other in word)
+            for word in words
+        } if cls._break_re is not None else {}
+    
+    @classmethod
+    def register_patterns(
+        cls,
+        meta_patterns: Optional[List[str]] = None,
+        break_words: Optional[List[str]] = None
+    ):
+        """Ajoute patterns (ex: multilingues) puis recompile"""
+        cls.META_PATTERNS = cls.META_PATTERNS + list(meta_patterns or [])
+        cls.BREAK_WORDS = cls.BREAK_WORDS + list(break_words or [])
+        cls.compile_patterns()
+    
+    @classmethod
+    def clean_artifacts(cls, text: str, model_name: str) -> str:
+        """Supprime artifacts spécifiques modèle"""
+        cleaned = text
+        
+        # Deepseek reasoning tags
+        if "deepseek" in model_name.lower():
+            cleaned = cls._THINK_RE.sub('', cleaned)
+        
+        # Meta-commentary génériques (une seule passe)
+        cleaned = cls._strip_meta(cleaned)
+        
+        # Nettoyer espaces multiples
+        cleaned = cls._BLANK_LINES_RE.sub('\n\n', cleaned)
+        return cleaned.strip()
+    
+    @classmethod
+    def _strip_meta(cls, text: str) -> str:
+        """Supprime correspondances META_PATTERNS (équivalent re.sub successifs, IGNORECASE)"""
+        if cls._meta_re is None:
+            cls.compile_patterns()
+        if cls._meta_re.search(text) is None:
+            return text
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            for pattern in cls.META_PATTERNS:
+                text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+            return text
+        
+        # Mêmes coupes sur le texte et sa version minuscule (positions identiques)
+        for step in cls._meta_steps:
+            spans = [match.span() for match in step.finditer(lowered)]
+            if not spans:
+                continue
+            parts, lower_parts, last = [], [], 0
+            for start, end in spans:
+                parts.append(text[last:start])
+                lower_parts.append(lowered[last:start])
+                last = end
+            parts.append(text[last:])
+            lower_parts.append(lowered[last:])
+            text, lowered = "".join(parts), "".join(lower_parts)
+        return text
+    
+    @classmethod
+    def find_breaks(cls, text: str) -> set:
+        """Expressions BREAK_WORDS distinctes présentes (un passage)"""
+        if cls._meta_re is None:
+            cls.compile_patterns()
+        text_lower = text.lower()
+        if cls._break_re is None:
+            return {word for word in cls._break_words if word in text_lower}
+        
+        found = set()
+        for match in set(cls._break_re.findall(text_lower)):
+            found |= cls._break_substrings[match]
+        return found
+    
+    @classmethod
+    def count_breaks(cls, text: str) -> int:
+        """Nombre d'expressions BREAK_WORDS distinctes présentes"""
+        return len(cls.find_breaks(text))
+    
+    @staticmethod
+    def score_breaks(breaks_found: int) -> Dict[str, Any]:
+        """Score immersion depuis nombre de ruptures"""
+        penalty = min(breaks_found * 0.3, 1.0)
+        score = max(0.0, 1.0 - penalty)
+        
+        return {
+            'score': score,
+            'breaks': breaks_found,
+            'maintained': score >= 0.7
+        }
+    
+    @classmethod
+    def validate_immersion(cls, text: str) -> Dict[str, Any]:
+        """Score immersion 0.0-1.0"""
+        return cls.score_breaks(cls.count_breaks(text))
+    
+    async def _process(self, input_data: Any, operation: str, metadata: Dict) -> Any:
+        """Process response cleaning/validation"""
+        if operation == "clean":
+            model_name = metadata.get("model", "")
+            return self.clean_artifacts(input_data, model_name)
+        elif operation == "validate":
+            return self.validate_immersion(input_data)
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+
+
+class StreamingCleaner:
+    """
+    Nettoyage incrémental d'un flux de réponse (équivalent clean_artifacts)
+    - Spans <think>...</think> supprimés au fil des chunks (modèles deepseek)
+    - Meta-commentaires supprimés par phrase complète (terminée par . ou \n)
+    - Score immersion courant sur le texte déjà émis
+    Hypothèse: un META_PATTERN ne traverse pas de terminateur (. ou \n)
+    """
+    
+    _OPEN_TAG = "<think>"
+    _CLOSE_TAG = "</think>"
+    
+    def __init__(self, model_name: str):
+        self.strip_think = "deepseek" in model_name.lower()
+        self._raw = ""           # texte reçu non encore filtré (think)
+        self._think = ""         # span <think> en cours (émis tel quel si jamais fermé)
+        self._in_think = False
+        self._pending = ""       # texte hors think en attente de fin de phrase
+        self._held_ws = ""       # espaces finaux retenus (collapse + strip final)
+        self._started = False
+        self._breaks: set = set()
+        self.text = ""           # texte nettoyé émis jusqu'ici
+    
+    @property
+    def immersion(self) -> Dict[str, Any]:
+        return ResponseProcessor.score_breaks(len(self._breaks))
+    
+    @staticmethod
+    def _partial_suffix(text: str, tag: str) -> int:
+        """Longueur du plus long suffixe de text qui est un préfixe de tag"""
+        for size in range(min(len(tag) - 1, len(text)), 0, -1):
+            if text.endswith(tag[:size]):
+                return size
+        return 0
+    
+    def _filter_think(self, final: bool = False):
+        """Déplace texte hors spans <think> de _raw vers _pending"""
+        if not self.strip_think:
+            self._pending += self._raw
+            self._raw = ""
+            return
+        
+        while self._raw:
+            if self._in_think:
+                end = self._raw.find(self._CLOSE_TAG)
+                if end < 0:
+                    keep = 0 if final else self._partial_suffix(self._raw, self._CLOSE_TAG)
+                    self._think += self._raw[:len(self._raw) - keep]
+                    self._raw = self._raw[len(self._raw) - keep:]
+                    break
+                self._raw = self._raw[end + len(self._CLOSE_TAG):]
+                self._think = ""
+                self._in_think = False
+            else:
+                start = self._raw.find(self._OPEN_TAG)
+                if start < 0:
+                    keep = 0 if final else self._partial_suffix(self._raw, self._OPEN_TAG)
+                    self._pending += self._raw[:len(self._raw) - keep]
+                    self._raw = self._raw[len(self._raw) - keep:]
+                    break
+                self._pending += self._raw[:start]
+                self._think = self._OPEN_TAG
+                self._raw = self._raw[start + len(self._OPEN_TAG):]
+                self._in_think = True
+        
+        if final and self._in_think:
+            # Span jamais fermé : conservé comme clean_artifacts
+            self._pending += self._think + self._raw
+            self._think = self._raw = ""
+            self._in_think = False
+    
+    def _emit(self, segment: str, final: bool = False) -> str:
+        """Nettoie segment de phrases complètes et retourne texte à émettre"""
+        text = self._held_ws + ResponseProcessor._strip_meta(segment)
+        stripped = text.rstrip()
+        self._held_ws = "" if final else text[len(stripped):]
+        
+        if not self._started:
+            stripped = stripped.lstrip()
+            if not stripped:
+                return ""
+            self._started = True
+        
+        out = ResponseProcessor._BLANK_LINES_RE.sub('\n\n', stripped)
+        if out:
+            self._breaks |= ResponseProcessor.find_breaks(out)
+            self.text += out
+        return out
+    
+    def feed(self, chunk: str) -> str:
+        """Ajoute chunk brut, retourne texte nettoyé émissible"""
+        self._raw += chunk
+        self._filter_think()
+        
+        cut = max(self._pending.rfind("."), self._pending.rfind("\n"))
+        if cut < 0:
+            return ""
+        segment, self._pending = self._pending[:cut + 1], self._pending[cut + 1:]
+        return self._emit(segment)
+    
+    def finish(self) -> str:
+        """Fin de flux: émet le reste"""
+        self._filter_think(final=True)
+        segment, self._pending = self._pending, ""
+        return self._emit(segment, final=True)
+
+
+# ============================================
+# SECTION 6 : MODEL PROVIDERS
+# ============================================
+
+class ProviderError(Exception):
+    """Erreur appel modèle (status HTTP si connu)"""
+    
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_duration(value: Any) -> Optional[float]:
+    """Durée d'en-tête fournisseur en secondes: "7.66s", "2m59.56s", "120ms", "1h", "30" """
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", text)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """En-tête Retry-After en secondes: délai ("120") ou date HTTP, None si absent ou illisible"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class QuotaBucket:
+    """
+    Token bucket d'un quota fournisseur (requêtes ou tokens par minute)
+    Capacité inconnue = illimitée jusqu'à synchronisation sur les en-têtes
+    """
+    
+    __slots__ = ("capacity", "refill_per_s", "level", "updated")
+    
+    def __init__(self, per_minute: float = 0):
+        self.capacity = float(per_minute) if per_minute > 0 else math.inf
+        self.refill_per_s = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float):
+        if self.level < self.capacity:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.refill_per_s)
+        self.updated = now
+    
+    def wait_time(self, cost: float, now: float) -> float:
+        """Secondes avant que cost soit disponible (0: immédiat)"""
+        self._refill(now)
+        cost = min(cost, self.capacity)
+        return 0.0 if self.level >= cost else (cost - self.level) / self.refill_per_s
+    
+    def consume(self, cost: float, now: float):
+        self._refill(now)
+        self.level -= min(cost, self.capacity)
+    
+    def sync(self, limit: Optional[float], remaining: float, reset_s: Optional[float], now: float, pending: float = 0):
+        """Aligne sur l'état serveur (pending: envois postérieurs à la réponse, pas encore décomptés)"""
+        if limit and float(limit) != self.capacity:
+            self.capacity = float(limit)
+            self.refill_per_s = self.capacity / 60.0
+        if self.capacity == math.inf:
+            return
+        if reset_s and remaining < self.capacity:
+            # Recharge complète annoncée dans reset_s
+            self.refill_per_s = (self.capacity - remaining) / reset_s
+        self.level = min(self.capacity, remaining - pending)
+        self.updated = now
+    
+    def snapshot(self, now: float) -> Optional[float]:
+        self._refill(now)
+        return None if self.capacity == math.inf else round(self.level, 1)
+
+
+class ModelQuota:
+    """
+    État d'ordonnancement d'un modèle: buckets requêtes/tokens, blocage 429, file d'attente
+    issued/reserved: cumul des envois; tickets: cumul au moment de l'envoi, par tâche asyncio
+    """
+    
+    __slots__ = (
+        "requests", "tokens", "blocked_until", "queued", "in_flight", "issued", "reserved", "tickets",
+        "_lock", "_loop"
+    )
+    
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = QuotaBucket(rpm)
+        self.tokens = QuotaBucket(tpm)
+        self.blocked_until = 0.0
+        self.queued = 0
+        self.in_flight = 0
+        self.issued = 0
+        self.reserved = 0
+        self.tickets: Dict[Any, Tuple[int, int]] = {}
+        self._lock = None
+        self._loop = None
+    
+    def lock(self):
+        """Verrou FIFO (équitable) de la file, recréé si la boucle asyncio change"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+
+
+class ProviderScheduler:
+    """
+    Ordonnanceur des appels d'un provider, par modèle
+    - Quotas requêtes/tokens par minute en token buckets: configurés (CONFIG["providers"])
+      ou appris des en-têtes x-ratelimit-{limit,remaining,reset}-{requests,tokens}
+    - File FIFO par modèle: un appel part dès que le quota le permet (débit maximal sûr)
+    - 429/5xx (timeouts et erreurs réseau: 504/503) retentés avec backoff exponentiel
+      jitteré (full jitter, retry-after respecté);
+      un 429 bloque tout le modèle pour le délai (la file entière attend)
+    """
+    
+    def __init__(
+        self,
+        name: str = "provider",
+        rpm: float = 0,
+        tpm: float = 0,
+        limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        seed: Optional[int] = None
+    ):
+        self.name = name
+        self.defaults = (rpm, tpm)
+        self.limits = dict(limits or {})
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._rng = random.Random(seed)
+        self._models: Dict[str, ModelQuota] = {}
+        self.metrics = {
+            "scheduled": 0, "waited": 0, "wait_s": 0.0, "retries": 0, "throttled": 0, "queued": 0, "queued_max": 0
+        }
+    
+    @classmethod
+    def from_config(cls, name: str = "provider") -> "ProviderScheduler":
+        config = CONFIG["providers"]
+        limits = {}
+        for item in filter(None, config["limits"].split(",")):
+            model, _, quota = item.rpartition("=")
+            rpm, _, tpm = quota.partition(":")
+            limits[model.strip()] = (float(rpm or 0), float(tpm or 0))
+        return cls(
+            name, config["rpm"], config["tpm"], limits,
+            config["max_retries"], config["backoff_base"], config["backoff_max"]
+        )
+    
+    def quota(self, model: str) -> ModelQuota:
+        quota = self._models.get(model)
+        if quota is None:
+            quota = self._models[model] = ModelQuota(*self.limits.get(model, self.defaults))
+        return quota
+    
+    @staticmethod
+    def estimate_tokens(system: str, prompt: str, max_tokens: Optional[int]) -> int:
+        """Coût réservé: prompt (≈3 caractères/token, majorant) + réponse max; corrigé par les en-têtes"""
+        return (len(system) + len(prompt)) // 3 + (max_tokens or CONFIG["models"]["response_reserve"])
+    
+    async def acquire(self, model: str, tokens: int):
+        """Attend (file FIFO du modèle) que requête et tokens tiennent dans les quotas, puis les consomme"""
+        quota = self.quota(model)
+        metrics = self.metrics
+        quota.queued += 1
+        metrics["queued"] += 1
+        metrics["queued_max"] = max(metrics["queued_max"], metrics["queued"])
+        start = time.perf_counter()
+        try:
+            async with quota.lock():
+                while True:
+                    now = time.monotonic()
+                    wait = max(
+                        quota.blocked_until - now,
+                        quota.requests.wait_time(1, now),
+                        quota.tokens.wait_time(tokens, now)
+                    )
+                    if wait <= 0:
+                        break
+                    # Réveil au plus chaque seconde: une synchro d'en-têtes peut libérer du quota plus tôt
+                    await asyncio.sleep(min(wait, 1.0))
+                quota.requests.consume(1, now)
+                quota.tokens.consume(tokens, now)
+                quota.in_flight += 1
+                quota.issued += 1
+                quota.reserved += tokens
+                quota.tickets[asyncio.current_task()] = (quota.issued, quota.reserved)
+        finally:
+            quota.queued -= 1
+            metrics["queued"] -= 1
+        
+        waited = time.perf_counter() - start
+        metrics["scheduled"] += 1
+        if waited > 0.001:
+            metrics["waited"] += 1
+            metrics["wait_s"] += waited
+        METRICS.record(f"scheduler.{self.name}", model, waited * 1000)
+    
+    def observe(self, model: str, headers: Any):
+        """
+        En-têtes x-ratelimit-* d'une réponse → quotas resynchronisés sur l'état serveur
+        Les appels envoyés après celui-ci (ticket) sont retranchés: le serveur a pu ne pas encore les voir
+        """
+        quota = self.quota(model)
+        ticket = quota.tickets.get(asyncio.current_task())
+        issued_after = (quota.issued - ticket[0], quota.reserved - ticket[1]) if ticket else (0, 0)
+        now = time.monotonic()
+        for kind, after in zip(("requests", "tokens"), issued_after):
+            try:
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                if remaining is None:
+                    continue
+                limit = headers.get(f"x-ratelimit-limit-{kind}")
+                getattr(quota, kind).sync(
+                    float(limit) if limit else None,
+                    float(remaining),
+                    parse_duration(headers.get(f"x-ratelimit-reset-{kind}")),
+                    now,
+                    after
+                )
+            except (TypeError, ValueError):
+                continue
+    
+    def release(self, model: str):
+        """Fin d'un appel (succès ou erreur)"""
+        quota = self.quota(model)
+        quota.in_flight -= 1
+        quota.tickets.pop(asyncio.current_task(), None)
+    
+    def retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Délai avant nouvel essai (None: erreur définitive ou essais épuisés)"""
+        status = getattr(error, "status", None)
+        if attempt >= self.max_retries or status is None or (status != 429 and status < 500):
+            return None
+        delay = self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        retry_after = getattr(error, "retry_after", None)
+        return max(delay, retry_after) if retry_after else delay
+    
+    def throttle(self, model: str, delay: float):
+        """429: modèle bloqué pour delay secondes (appels en file compris)"""
+        quota = self.quota(model)
+        quota.blocked_until = max(quota.blocked_until, time.monotonic() + delay)
+        self.metrics["throttled"] += 1
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Compteurs globaux (gauges) + état par modèle"""
+        now = time.monotonic()
+        return {
+            **self.metrics,
+            "wait_s": round(self.metrics["wait_s"], 3),
+            "models": {
+                model: {
+                    "queued": quota.queued,
+                    "in_flight": quota.in_flight,
+                    "requests_available": quota.requests.snapshot(now),
+                    "tokens_available": quota.tokens.snapshot(now),
+                    "blocked_s": round(max(0.0, quota.blocked_until - now), 3)
+                }
+                for model, quota in self._models.items()
+            }
+        }
+
+
+class ModelProvider(ABC):
+    """
+    Interface provider LLM async
+    - Un pool de connexions keep-alive partagé par instance
+    - Limite de concurrence par provider (sémaphore par boucle asyncio)
+    """
+    
+    name = "provider"
+    
+    def __init__(self, max_concurrency: int = 8, scheduler: Optional[ProviderScheduler] = None):
+        self.max_concurrency = max_concurrency
+        self.scheduler = scheduler
+        self._loop = None
+        self._semaphore = None
+        self.metrics = {"calls": 0, "errors": 0, "in_flight": 0}
+    
+    def _get_semaphore(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._on_new_loop()
+        return self._semaphore
+    
+    def _on_new_loop(self):
+        """Hook: ressources liées à la boucle (pool HTTP) à recréer"""
+        pass
+    
+    async def complete(
+        self,
+        system: str,
+        prompt: str,
+        model: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Génère réponse complète (quotas ordonnancés, limite de concurrence, retry 429/5xx)"""
+        if temperature is None:
+            temperature = CONFIG["models"]["default_temperature"]
+        
+        attempt = 0
+        while True:
+            await self._schedule(system, prompt, model, max_tokens)
+            try:
+                async with self._get_semaphore():
+                    self.metrics["calls"] += 1
+                    self.metrics["in_flight"] += 1
+                    module = f"provider.{self.name}"
+                    METRICS.track_in_flight(module, 1)
+                    start = time.perf_counter()
+                    error = False
+                    try:
+                        return await self._complete(system, prompt, model, temperature, max_tokens)
+                    except Exception:
+                        self.metrics["errors"] += 1
+                        error = True
+                        raise
+                    finally:
+                        self.metrics["in_flight"] -= 1
+                        METRICS.track_in_flight(module, -1)
+                        METRICS.record(module, model, (time.perf_counter() - start) * 1000, error)
+                        if self.scheduler is not None:
+                            self.scheduler.release(model)
+            except ProviderError as e:
+                if not await self._backoff(model, e, attempt):
+                    raise
+            attempt += 1
+    
+    async def stream(
+        self,
+        system: str,
+        prompt: str,
+        model: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ):
+        """
+        Génère réponse en flux de chunks texte (quotas ordonnancés, limite de concurrence)
+        Retry 429/5xx seulement avant le premier chunk émis
+        """
+        if temperature is None:
+            temperature = CONFIG["models"]["default_temperature"]
+        
+        attempt = 0
+        while True:
+            await self._schedule(system, prompt, model, max_tokens)
+            emitted = False
+            try:
+                async with self._get_semaphore():
+                    self.metrics["calls"] += 1
+                    self.metrics["in_flight"] += 1
+                    module = f"provider.{self.name}"
+                    METRICS.track_in_flight(module, 1)
+                    start = time.perf_counter()
+                    error = False
+                    try:
+                        async for chunk in self._stream(system, prompt, model, temperature, max_tokens):
+                            emitted = True
+                            yield chunk
+                        return
+                    except Exception:
+                        self.metrics["errors"] += 1
+                        error = True
+                        raise
+                    finally:
+                        self.metrics["in_flight"] -= 1
+                        METRICS.track_in_flight(module, -1)
+                        METRICS.record(module, f"{model}:stream", (time.perf_counter() - start) * 1000, error)
+                        if self.scheduler is not None:
+                            self.scheduler.release(model)
+            except ProviderError as e:
+                if emitted or not await self._backoff(model, e, attempt):
+                    raise
+            attempt += 1
+    
+    async def _schedule(self, system: str, prompt: str, model: str, max_tokens: Optional[int]):
+        """Attend le créneau du scheduler (si configuré)"""
+        if self.scheduler is not None:
+            await self.scheduler.acquire(model, self.scheduler.estimate_tokens(system, prompt, max_tokens))
+    
+    async def _backoff(self, model: str, error: ProviderError, attempt: int) -> bool:
+        """Prépare un nouvel essai après erreur (False: erreur à propager)"""
+        delay = self.scheduler.retry_delay(error, attempt) if self.scheduler is not None else None
+        if delay is None:
+            return False
+        self.scheduler.metrics["retries"] += 1
+        logger.warning(f"{self.name}/{model} HTTP {error.status}, retry {attempt + 1} in {delay:.2f}s")
+        if error.status == 429:
+            # Toute la file du modèle attend (acquire), pas seulement cet appel
+            self.scheduler.throttle(model, delay)
+        else:
+            await asyncio.sleep(delay)
+        return True
+    
+    def _observe_limits(self, model: str, headers: Any):
+        """En-têtes de quota d'une réponse (succès ou erreur) → scheduler"""
+        if self.scheduler is not None:
+            self.scheduler.observe(model, headers)
+    
+    @abstractmethod
+    async def _complete(
+        self,
+        system: str,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> str:
+        """Implémentation appel spécifique provider"""
+        pass
+    
+    async def _stream(self, system, prompt, model, temperature, max_tokens):
+        """Streaming natif provider - par défaut réponse complète en un chunk"""
+        yield await self._complete(system, prompt, model, temperature, max_tokens)
+    
+    async def aclose(self):
+        """Ferme pool de connexions"""
+        pass
+
+
+class OpenAICompatibleProvider(ModelProvider):
+    """
+    Adapter API OpenAI-compatible (/chat/completions)
+    Pool httpx.AsyncClient keep-alive (httpx installé avec groq)
+    Scheduler par défaut depuis CONFIG["providers"] (quotas appris des en-têtes)
+    """
+    
+    name = "openai"
+    default_base_url = "https://api.openai.com/v1"
+    api_key_env = "OPENAI_API_KEY"
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: int = 8,
+        max_connections: int = 20,
+        timeout: float = 60.0,
+        scheduler: Optional[ProviderScheduler] = None
+    ):
+        super().__init__(max_concurrency, scheduler or ProviderScheduler.from_config(self.name))
+        self.api_key = api_key or os.getenv(self.api_key_env)
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client = None
+        self._httpx = None
+    
+    def _on_new_loop(self):
+        # Pool httpx lié à la boucle courante : recréé si la boucle change
+        self._client = None
+    
+    def _get_client(self):
+        if self._client is None:
+            try:
+                import httpx
+            except ImportError:
+                raise ImportError(f"{type(self).__name__} requires httpx (pip install groq or httpx)")
+            
+            self._httpx = httpx
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=self.timeout
+            )
+        return self._client
+    
+    def _payload(
+        self,
+        system: str,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> Dict:
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": temperature
+        }
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+        return payload
+    
+    def _transport_error(self, error: Exception) -> ProviderError:
+        """Timeout / erreur réseau httpx → ProviderError retentable (504 / 503 synthétiques)"""
+        if isinstance(error, self._httpx.TimeoutException):
+            return ProviderError(f"{self.name} timeout: {error!r}", status=504)
+        return ProviderError(f"{self.name} connection error: {error!r}", status=503)
+    
+    async def _complete(self, system, prompt, model, temperature, max_tokens) -> str:
+        if not self.api_key:
+            raise ProviderError(f"{self.api_key_env} not set")
+        
+        client = self._get_client()
+        try:
+            response = await client.post(
+                "/chat/completions",
+                json=self._payload(system, prompt, model, temperature, max_tokens)
+            )
+        except self._httpx.TransportError as e:
+            raise self._transport_error(e) from e
+        self._observe_limits(model, response.headers)
+        if response.status_code >= 400:
+            raise ProviderError(
+                f"{self.name} HTTP {response.status_code}: {response.text[:200]}",
+                status=response.status_code,
+                retry_after=parse_retry_after(response.headers.get("retry-after"))
+            )
+        try:
+            return response.json()["choices"][0]["message"]["content"] or ""
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            # Réponse 200 inexploitable (proxy, coupure): 502 synthétique, retentable
+            raise ProviderError(
+                f"{self.name} malformed response ({e!r}): {response.text[:200]}", status=502
+            ) from e
+    
+    async def _stream(self, system, prompt, model, temperature, max_tokens):
+        """Server-sent events /chat/completions (stream=true)"""
+        if not self.api_key:
+            raise ProviderError(f"{self.api_key_env} not set")
+        
+        payload = self._payload(system, prompt, model, temperature, max_tokens)
+        payload["stream"] = True
+        client = self._get_client()
+        # Erreur réseau après le premier chunk: propagée sans retry (ModelProvider.stream)
+        try:
+            async with client.stream("POST", "/chat/completions", json=payload) as response:
+                self._observe_limits(model, response.headers)
+                if response.status_code >= 400:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    raise ProviderError(
+                        f"{self.name} HTTP {response.status_code}: {body[:200]}",
+                        status=response.status_code,
+                        retry_after=parse_retry_after(response.headers.get("retry-after"))
+                    )
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        choices = json.loads(data).get("choices") or [{}]
+                        delta = choices[0].get("delta", {}).get("content")
+                    except (ValueError, AttributeError, IndexError) as e:
+                        raise ProviderError(
+                            f"{self.name} malformed stream chunk ({e!r}): {data[:200]}", status=502
+                        ) from e
+                    if delta:
+                        yield delta
+        except self._httpx.TransportError as e:
+            raise self._transport_error(e) from e
+    
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class GroqProvider(OpenAICompatibleProvider):
+    """Adapter Groq (endpoint OpenAI-compatible)"""
+    
+    name = "groq"
+    default_base_url = "https://api.groq.com/openai/v1"
+    api_key_env = "GROQ_API_KEY"
+
+
+class FakeProvider(ModelProvider):
+    """
+    Provider en process pour tests offline et benchmarks
+    Latence simulée (fixed, uniform, exponential, lognormal) et erreurs injectées
+    Quotas serveur simulés (quota_rpm/quota_tpm): 429 + en-têtes x-ratelimit-* façon Groq
+    Prefill simulé (prefill_ms_per_1k): latence croissante avec la taille du prompt
+    """
+    
+    name = "fake"
+    DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+    
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        distribution: str = "fixed",
+        jitter_ms: float = 0.0,
+        sigma: float = 0.5,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        response: Any = None,
+        seed: Optional[int] = None,
+        max_concurrency: int = 64,
+        stream_chunk_chars: int = 16,
+        quota_rpm: float = 0,
+        quota_tpm: float = 0,
+        scheduler: Optional[ProviderScheduler] = None,
+        prefill_ms_per_1k: float = 0.0
+    ):
+        super().__init__(max_concurrency, scheduler)
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.latency_ms = latency_ms
+        self.distribution = distribution
+        self.jitter_ms = jitter_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.response = response
+        self.stream_chunk_chars = stream_chunk_chars
+        self.prefill_ms_per_1k = prefill_ms_per_1k
+        self._rng = random.Random(seed)
+        self._quota = (QuotaBucket(quota_rpm), QuotaBucket(quota_tpm)) if quota_rpm or quota_tpm else None
+        self.rate_limited = 0
+    
+    def sample_latency_ms(self) -> float:
+        """Tire une latence selon la distribution configurée"""
+        if self.latency_ms <= 0:
+            return 0.0
+        if self.distribution == "uniform":
+            return max(0.0, self._rng.uniform(
+                self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms
+            ))
+        if self.distribution == "exponential":
+            return self._rng.expovariate(1.0 / self.latency_ms)
+        if self.distribution == "lognormal":
+            # Médiane = latency_ms
+            return self._rng.lognormvariate(math.log(self.latency_ms), self.sigma)
+        return self.latency_ms
+    
+    def prefill_ms(self, system: str, prompt: str) -> float:
+        """Latence de lecture du prompt simulée (≈4 caractères/token), proportionnelle à sa taille"""
+        return (len(system) + len(prompt)) / 4000 * self.prefill_ms_per_1k
+    
+    def _render_response(self, system: str, prompt: str, model: str) -> str:
+        if callable(self.response):
+            return self.response(system, prompt, model)
+        if self.response is not None:
+            return str(self.response)
+        return (
+            f"J'observe la salle et mes collègues. "
+            f"Je poursuis l'analyse de l'anomalie (tour {self.metrics['calls']}, {model})."
+        )
+    
+    def _enforce_quota(self, system: str, prompt: str, model: str):
+        """Quota serveur simulé: décompte requête + tokens prompt, en-têtes renvoyés, 429 si dépassé"""
+        if self._quota is None:
+            return
+        now = time.monotonic()
+        cost = (len(system) + len(prompt)) // 4
+        wait = max(bucket.wait_time(units, now) for bucket, units in zip(self._quota, (1, cost)))
+        if wait <= 0:
+            for bucket, units in zip(self._quota, (1, cost)):
+                bucket.consume(units, now)
+        
+        headers = {}
+        for kind, bucket in zip(("requests", "tokens"), self._quota):
+            if bucket.capacity != math.inf:
+                headers[f"x-ratelimit-limit-{kind}"] = str(int(bucket.capacity))
+                headers[f"x-ratelimit-remaining-{kind}"] = str(max(0, int(bucket.level)))
+                headers[f"x-ratelimit-reset-{kind}"] = f"{(bucket.capacity - bucket.level) / bucket.refill_per_s:.3f}s"
+        self._observe_limits(model, headers)
+        if wait > 0:
+            self.rate_limited += 1
+            raise ProviderError(f"Simulated rate limit for {model}", status=429, retry_after=round(wait, 3))
+    
+    async def _complete(self, system, prompt, model, temperature, max_tokens) -> str:
+        self._enforce_quota(system, prompt, model)
+        latency = self.sample_latency_ms() + self.prefill_ms(system, prompt)
+        failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+        if latency:
+            await asyncio.sleep(latency / 1000)
+        if failed:
+            raise ProviderError("Simulated provider error", status=self.error_status)
+        return self._render_response(system, prompt, model)
+    
+    async def _stream(self, system, prompt, model, temperature, max_tokens):
+        """Chunks de stream_chunk_chars, latence répartie uniformément"""
+        self._enforce_quota(system, prompt, model)
+        latency = self.sample_latency_ms() + self.prefill_ms(system, prompt)
+        if self.error_rate > 0 and self._rng.random() < self.error_rate:
+            raise ProviderError("Simulated provider error", status=self.error_status)
+        
+        text = self._render_response(system, prompt, model)
+        size = max(1, self.stream_chunk_chars)
+        chunks = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        for chunk in chunks:
+            if latency:
+                await asyncio.sleep(latency / len(chunks) / 1000)
+            yield chunk
+
+
+class ReplayProvider(ModelProvider):
+    """
+    Provider de rejeu: sert dans l'ordre des réponses brutes enregistrées
+    (SessionReplayer), sans latence ni appel réseau
+    """
+    
+    name = "replay"
+    
+    def __init__(self, max_concurrency: int = 64):
+        super().__init__(max_concurrency)
+        self.responses: deque = deque()
+    
+    def push(self, response: str):
+        """Réponse servie au prochain appel"""
+        self.responses.append(response)
+    
+    async def _complete(self, system, prompt, model, temperature, max_tokens) -> str:
+        if not self.responses:
+            raise ProviderError("Replay provider exhausted: no recorded response left")
+        return self.responses.popleft()
+
+
+PROVIDERS = {
+    "openai": OpenAICompatibleProvider,
+    "groq": GroqProvider,
+    "fake": FakeProvider
+}
+
+
+def create_provider(spec: str) -> ModelProvider:
+    """
+    Instancie provider depuis spec CLI: "groq", "fake:latency_ms=200,error_rate=0.1"
+    """
+    name, _, raw_options = spec.partition(":")
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown provider: {name} (available: {', '.join(PROVIDERS)})")
+    
+    options = {}
+    for item in filter(None, raw_options.split(",")):
+        key, _, value = item.partition("=")
+        try:
+            options[key.strip()] = json.loads(value)
+        except ValueError:
+            options[key.strip()] = value
+    return PROVIDERS[name](**options)
+
+
+class CacheMissError(ProviderError):
+    """Réponse absente du cache en mode replay strict"""
+    pass
+
+
+class ResponseCache:
+    """
+    Cache réponses modèle adressé par contenu
+    Clé = sha256(model, system_prompt, full_prompt, temperature)
+    - Niveau mémoire LRU (max_entries)
+    - Niveau disque <dir>/<aa>/<clé>.json, éviction par taille totale
+      (ordre LRU = mtime, rafraîchi à chaque hit disque)
+    - fetch (chemin async): lectures/écritures disque dans un thread, index
+      et compteurs mis à jour sur la boucle
+    Modes: read_write, read_only, replay (miss → CacheMissError), off
+    """
+    
+    MODES = ("off", "read_write", "read_only", "replay")
+    
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        mode: str = "read_write",
+        max_entries: int = 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cache mode: {mode}")
+        self.mode = mode
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         
-        # Nettoyer espaces multiples
-        cleaned = re.sub(r'\n\s*\n\s*\n', '\n\n', cleaned)
-        return cleaned.strip()
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # clé → taille, ordre LRU
+        self._disk_bytes = 0
+        self.metrics = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0
+        }
+        if self.cache_dir is not None:
+            self._load_disk_index()
+    
+    @classmethod
+    def from_config(cls) -> Optional["ResponseCache"]:
+        """Cache configuré par IR_CACHE_* (None si mode off)"""
+        config = CONFIG["cache"]
+        if config["mode"] == "off":
+            return None
+        return cls(config["dir"], config["mode"], config["max_entries"], config["max_disk_bytes"])
     
     @staticmethod
-    def validate_immersion(text: str) -> Dict[str, Any]:
-        """Score immersion 0.0-1.0"""
-        text_lower = text.lower()
-        
-        break_words = [
-            'modèle de langage', 'language model', 'llm',
-            'assistant ai', 'intelligence artificielle',
-            'je ne peux pas vraiment', 'simulation',
-            'en tant qu\'ia', 'as an ai'
-        ]
+    def make_key(model: str, system: str, prompt: str, temperature: float) -> str:
+        payload = json.dumps([model, system, prompt, temperature], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+    
+    def _load_disk_index(self):
+        """Index disque existant, du plus ancien au plus récent (mtime)"""
+        entries = []
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*/*.json"):
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+    
+    def get(self, key: str) -> Optional[str]:
+        """Lookup mémoire puis disque (promotion en mémoire)"""
+        response = self._memory_get(key)
+        if response is None and key in self._disk:
+            response = self._disk_result(key, self._read_disk(key))
+        if response is None:
+            self.metrics["misses"] += 1
+        return response
+    
+    async def aget(self, key: str) -> Optional[str]:
+        """get sans bloquer la boucle (lecture disque dans un thread)"""
+        response = self._memory_get(key)
+        if response is None and key in self._disk:
+            response = self._disk_result(key, await asyncio.to_thread(self._read_disk, key))
+        if response is None:
+            self.metrics["misses"] += 1
+        return response
+    
+    def _memory_get(self, key: str) -> Optional[str]:
+        response = self._memory.get(key)
+        if response is not None:
+            self._memory.move_to_end(key)
+            self.metrics["memory_hits"] += 1
+        return response
+    
+    def _read_disk(self, key: str) -> Optional[str]:
+        """Réponse stockée sur disque (None si illisible), mtime rafraîchi: ordre LRU au rechargement"""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                response = json.load(f)["response"]
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return response
+    
+    def _disk_result(self, key: str, response: Optional[str]) -> Optional[str]:
+        """Index disque après lecture: hit → fin LRU + promotion mémoire, illisible → oublié"""
+        if response is None:
+            self._disk_bytes -= self._disk.pop(key, 0)
+            return None
+        if key in self._disk:
+            self._disk.move_to_end(key)
+        self.metrics["disk_hits"] += 1
+        self._remember(key, response)
+        return response
+    
+    def _remember(self, key: str, response: str):
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.metrics["memory_evictions"] += 1
+    
+    def put(self, key: str, response: str, meta: Optional[Dict] = None):
+        """Enregistre réponse (mémoire + disque si configuré)"""
+        self._remember(key, response)
+        self.metrics["writes"] += 1
+        if self.cache_dir is None:
+            return
+        evicted = self._index_disk(key, self._write_disk(key, response, meta))
+        self._unlink(evicted)
+    
+    async def aput(self, key: str, response: str, meta: Optional[Dict] = None):
+        """put sans bloquer la boucle (écriture et évictions disque dans un thread)"""
+        self._remember(key, response)
+        self.metrics["writes"] += 1
+        if self.cache_dir is None:
+            return
+        size = await asyncio.to_thread(self._write_disk, key, response, meta)
+        evicted = self._index_disk(key, size)
+        if evicted:
+            await asyncio.to_thread(self._unlink, evicted)
+    
+    def _write_disk(self, key: str, response: str, meta: Optional[Dict]) -> int:
+        """Écriture atomique (tmp unique + rename) → taille en octets"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"response": response, **(meta or {})}, ensure_ascii=False).encode("utf-8")
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
+    
+    def _index_disk(self, key: str, size: int) -> List[str]:
+        """Ajoute clé à l'index disque → clés évincées (taille totale)"""
+        self._disk_bytes += size - self._disk.pop(key, 0)
+        self._disk[key] = size
+        evicted = []
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            old_key, old_size = self._disk.popitem(last=False)
+            self._disk_bytes -= old_size
+            self.metrics["disk_evictions"] += 1
+            evicted.append(old_key)
+        return evicted
+    
+    def _unlink(self, keys: List[str]):
+        for key in keys:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+    
+    async def fetch(self, model: str, system: str, prompt: str, temperature: float, call) -> str:
+        """Réponse cachée ou résultat de await call() (selon mode)"""
+        if self.mode == "off":
+            return await call()
         
-        breaks_found = sum(1 for word in break_words if word in text_lower)
-        penalty = min(breaks_found * 0.3, 1.0)
-        score = max(0.0, 1.0 - penalty)
+        key = self.make_key(model, system, prompt, temperature)
+        response = await self.aget(key)
+        if response is not None:
+            return response
+        if self.mode == "replay":
+            raise CacheMissError(f"Replay cache miss for {model} (key {key[:12]})")
         
+        response = await call()
+        if self.mode == "read_write":
+            await self.aput(key, response, {"model": model, "temperature": temperature})
+        return response
+    
+    def get_metrics(self) -> Dict:
+        hits = self.metrics["memory_hits"] + self.metrics["disk_hits"]
+        lookups = hits + self.metrics["misses"]
         return {
-            'score': score,
-            'breaks': breaks_found,
-            'maintained': score >= 0.7
+            "mode": self.mode,
+            **self.metrics,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes
         }
-    
-    async def _process(self, input_data: Any, operation: str, metadata: Dict) -> Any:
-        """Process response cleaning/validation"""
-        if operation == "clean":
-            model_name = metadata.get("model", "")
-            return self.clean_artifacts(input_data, model_name)
-        elif operation == "validate":
-            return self.validate_immersion(input_data)
-        else:
-            raise ValueError(f"Unknown operation: {operation}")
 
 
 # ============================================
-# SECTION 6 : ORCHESTRATOR
+# SECTION 7 : ORCHESTRATOR
 # ============================================
 
 class Orchestrator:
@@ -459,33 +3683,276 @@ class Orchestrator:
     Coordonne modules IR et gère exécution pipeline
     """
     
-    def __init__(self):
-        self.reality_engine = RealityEngineV3()
+    CONTEXT_MODES = ("full", "delta")
+    
+    def __init__(
+        self,
+        world_id: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
+        context_mode: Optional[str] = None
+    ):
+        self.context_mode = context_mode or CONFIG["orchestrator"]["context_mode"]
+        if self.context_mode not in self.CONTEXT_MODES:
+            raise ValueError(f"Unknown context mode: {self.context_mode}")
+        self.world_id = world_id or uuid.uuid4().hex
+        self.created_at = datetime.now().isoformat()
+        self.response_cache = response_cache
+        self.reality_engine = RealityEngineV3(self.world_id)
         self.response_processor = ResponseProcessor()
-        self.conversation_log: List[Dict] = []
+        spill_dir = CONFIG["history"]["spill_dir"]
+        self.conversation_log = BoundedLog(
+            CONFIG["history"]["conversation_window"],
+            spill_path=Path(spill_dir) / self.world_id / "conversation.jsonl" if spill_dir else None
+        )
+        # Mutations hors tour (agents, config, événement direct): conversation_log reste tours seuls
+        self.session_log = BoundedLog(
+            CONFIG["history"]["conversation_window"],
+            spill_path=Path(spill_dir) / self.world_id / "session.jsonl" if spill_dir else None
+        )
+        
+        # Session rejouable (SessionReplayer): état d'origine (None = monde initial par défaut),
+        # tours (conversation_log) et mutations hors tour (session_log), empreinte chaînée des mutations
+        self.session_origin: Optional[Dict[str, Any]] = None
+        self.session_digest = ""
+        self._session_spill_offsets = (0, 0)
+        # Mutations observées (version du monde pour WorldStore: ré-estimation mémoire)
+        self.mutations = 0
+        self._in_turn = False
+        self.reality_engine.recorder = self._record_mutation
     
     async def execute_agent_action(
         self,
         agent_name: str,
         task_prompt: str,
         model_client: Any,  # Groq client ou autre
-        agent_config: AgentConfig
+        agent_config: AgentConfig,
+        context: Optional[str] = None
     ) -> Dict:
-        """Exécute action agent complète avec pipeline IR"""
+        """
+        Exécute action agent complète avec pipeline IR
+        context: contexte pré-rendu (ex: RoundContext.for_agent), sinon généré
+        """
         
-        # 1. Obtenir contexte RI
-        context_result = await self.reality_engine.execute(
-            agent_name,
-            "get_context",
-            {}
+        # 1. Obtenir contexte RI (borné au budget tokens du modèle, complet ou delta)
+        if context is None:
+            context_result = await self._render_context(agent_name, task_prompt, agent_config)
+            
+            if not context_result["success"]:
+                return context_result
+            
+            context = context_result["result"]
+        
+        # 2. Construire prompt complet
+        system_prompt, full_prompt = self._build_prompts(
+            agent_name, task_prompt, agent_config, context
+        )
+        
+        # 3. Appel modèle (provider, client SDK ou placeholder sans client)
+        try:
+            raw_response = await self._call_model(
+                model_client,
+                system_prompt,
+                full_prompt,
+                agent_config.model
+            )
+        except Exception as e:
+            # Même contrat que execute_round / stream_agent_action
+            logger.error(f"Model call failed for {agent_name}: {str(e)}")
+            self.reality_engine.forget_view(agent_name)
+            return {"success": False, "error": str(e)}
+        
+        # 4-7. Post-processing, validation, update monde, log
+        return await self._finalize_action(agent_name, task_prompt, agent_config, raw_response)
+    
+    async def stream_agent_action(
+        self,
+        agent_name: str,
+        task_prompt: str,
+        model_client: Any,
+        agent_config: AgentConfig,
+        context: Optional[str] = None
+    ):
+        """
+        Version streaming de execute_agent_action (générateur async)
+        Événements: {"type": "delta", "text", "immersion"} puis
+        {"type": "final", ...résultat execute_agent_action} après update monde
+        """
+        if context is None:
+            context_result = await self._render_context(agent_name, task_prompt, agent_config)
+            if not context_result["success"]:
+                yield {"type": "final", **context_result}
+                return
+            context = context_result["result"]
+        
+        system_prompt, full_prompt = self._build_prompts(
+            agent_name, task_prompt, agent_config, context
         )
         
-        if not context_result["success"]:
-            return context_result
+        cleaner = StreamingCleaner(agent_config.model)
+        raw_parts = []
+        try:
+            async for chunk in self._stream_model(
+                model_client, system_prompt, full_prompt, agent_config.model
+            ):
+                raw_parts.append(chunk)
+                text = cleaner.feed(chunk)
+                if text:
+                    yield {"type": "delta", "text": text, "immersion": cleaner.immersion}
+        except Exception as e:
+            logger.error(f"Model stream failed for {agent_name}: {str(e)}")
+            self.reality_engine.forget_view(agent_name)
+            yield {"type": "final", "success": False, "error": str(e)}
+            return
         
-        context = context_result["result"]
+        text = cleaner.finish()
+        if text:
+            yield {"type": "delta", "text": text, "immersion": cleaner.immersion}
         
-        # 2. Construire prompt complet
+        result = await self._commit_action(
+            agent_name, task_prompt, agent_config, cleaner.text, cleaner.immersion,
+            raw_response="".join(raw_parts), stream=True
+        )
+        yield {"type": "final", **result}
+    
+    async def _render_context(self, agent_name: str, task_prompt: str, agent_config: AgentConfig) -> Dict:
+        """Contexte RI borné au budget, complet ou delta selon context_mode (résultat execute)"""
+        metadata = {"max_tokens": self._context_budget(agent_name, task_prompt, agent_config)}
+        if self.context_mode != "delta":
+            return await self.reality_engine.execute(agent_name, "get_context", metadata)
+        result = await self.reality_engine.execute(agent_name, "get_delta_context", metadata)
+        if result["success"]:
+            result["result"] = result["result"]["context"]
+        return result
+    
+    async def _stream_model(
+        self,
+        client: Any,
+        system: str,
+        prompt: str,
+        model: str,
+        temperature: Optional[float] = None
+    ):
+        """Flux de chunks bruts (cache consulté avant, alimenté en fin de flux)"""
+        if temperature is None:
+            temperature = CONFIG["models"]["default_temperature"]
+        
+        cache = self.response_cache
+        key = None
+        if cache is not None and cache.mode != "off":
+            key = cache.make_key(model, system, prompt, temperature)
+            cached = cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+            if cache.mode == "replay":
+                raise CacheMissError(f"Replay cache miss for {model} (key {key[:12]})")
+        
+        if isinstance(client, ModelProvider):
+            parts = []
+            async for chunk in client.stream(system, prompt, model, temperature):
+                parts.append(chunk)
+                yield chunk
+            raw_response = "".join(parts)
+        else:
+            raw_response = await self._invoke_model(client, system, prompt, model, temperature)
+            yield raw_response
+        
+        if key is not None and cache.mode == "read_write":
+            cache.put(key, raw_response, {"model": model, "temperature": temperature})
+    
+    async def execute_round(
+        self,
+        tasks: List[Tuple[AgentConfig, str]],
+        model_client: Any,
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Tour simultané: tous les agents perçoivent le même instantané du monde,
+        appels modèle concurrents (asyncio.gather sous sémaphore), puis mises
+        à jour monde appliquées dans l'ordre des tâches (déterministe)
+        
+        Args:
+            tasks: [(AgentConfig, task_prompt), ...] - un agent au plus par tour
+        """
+        names = [agent_config.name for agent_config, _ in tasks]
+        if len(set(names)) != len(names):
+            raise ValueError("An agent can act at most once per simultaneous round")
+        
+        # 1. Instantané commun (rendu partagé une seule fois; en delta: vue propre à chaque agent)
+        delta = self.context_mode == "delta"
+        round_context = None
+        if delta:
+            unknown = [name for name in names if name not in self.reality_engine.world_state.agents]
+            if unknown:
+                return [{"success": False, "error": f"Agent {unknown[0]} not registered"} for _ in tasks]
+        else:
+            round_result = await self.reality_engine.execute(names, "get_round_context", {})
+            if not round_result["success"]:
+                return [round_result for _ in tasks]
+            round_context = round_result["result"]
+        
+        # 2-3. Appels modèle concurrents
+        semaphore = asyncio.Semaphore(
+            max_concurrency or CONFIG["orchestrator"]["max_concurrency"]
+        )
+        
+        estimate = self.reality_engine.token_estimator.estimate
+        shared_tokens = 0 if delta else estimate(round_context.shared)
+        
+        async def call(agent_config: AgentConfig, task_prompt: str) -> str:
+            name = agent_config.name
+            budget = self._context_budget(name, task_prompt, agent_config)
+            if delta:
+                # Rendu avant le premier await: toutes les vues sur le même instantané
+                context, _ = self.reality_engine.get_delta_context(name, budget)
+            elif shared_tokens + estimate(round_context.identities[name]) <= budget:
+                context = round_context.for_agent(name)
+            else:
+                # Monde inchangé pendant le rendu: même instantané, réduit au budget
+                context = self.reality_engine.get_hierarchical_context(name, budget)
+            system_prompt, full_prompt = self._build_prompts(
+                name, task_prompt, agent_config, context
+            )
+            async with semaphore:
+                return await self._call_model(
+                    model_client, system_prompt, full_prompt, agent_config.model
+                )
+        
+        raw_responses = await asyncio.gather(
+            *(call(agent_config, task_prompt) for agent_config, task_prompt in tasks),
+            return_exceptions=True
+        )
+        
+        # 4-7. Fusion ordonnée dans le monde
+        results = []
+        for (agent_config, task_prompt), raw_response in zip(tasks, raw_responses):
+            if isinstance(raw_response, BaseException):
+                logger.error(f"Model call failed for {agent_config.name}: {str(raw_response)}")
+                self.reality_engine.forget_view(agent_config.name)
+                results.append({"success": False, "error": str(raw_response)})
+                continue
+            results.append(await self._finalize_action(
+                agent_config.name, task_prompt, agent_config, raw_response
+            ))
+        return results
+    
+    def _context_budget(self, agent_name: str, task_prompt: str, agent_config: AgentConfig) -> int:
+        """Budget contexte: max_context - réserve réponse - prompts hors contexte"""
+        system_prompt, frame = self._build_prompts(agent_name, task_prompt, agent_config, "")
+        estimate = self.reality_engine.token_estimator.estimate
+        return max(0, (
+            CONFIG["models"]["max_context"] - CONFIG["models"]["response_reserve"]
+            - estimate(system_prompt) - estimate(frame)
+        ))
+    
+    @staticmethod
+    def _build_prompts(
+        agent_name: str,
+        task_prompt: str,
+        agent_config: AgentConfig,
+        context: str
+    ) -> Tuple[str, str]:
+        """Prompts système et utilisateur d'une action"""
         system_prompt = f"""Vous êtes {agent_name}, android incarné spécialisé en {agent_config.role}.
 
 DIRECTIVES COMPORTEMENTALES:
@@ -506,16 +3973,16 @@ Votre perception est immédiate et contextuelle."""
 
 Répondez selon votre spécialité ({agent_config.specialty}) et votre perception de la situation.
 """
-        
-        # 3. Appel modèle (à implémenter selon client)
-        # Ici placeholder - sera remplacé par vrai appel Groq/OpenAI
-        raw_response = await self._call_model(
-            model_client,
-            system_prompt,
-            full_prompt,
-            agent_config.model
-        )
-        
+        return system_prompt, full_prompt
+    
+    async def _finalize_action(
+        self,
+        agent_name: str,
+        task_prompt: str,
+        agent_config: AgentConfig,
+        raw_response: str
+    ) -> Dict:
+        """Nettoyage, validation immersion, update monde et log d'une réponse"""
         # 4. Post-processing
         clean_result = await self.response_processor.execute(
             raw_response,
@@ -537,70 +4004,815 @@ Répondez selon votre spécialité ({agent_config.specialty}) et votre perceptio
         
         immersion = immersion_result["result"]
         
-        # 6. Update world state
-        action_summary = cleaned_response[:80] + "..." if len(cleaned_response) > 80 else cleaned_response
+        return await self._commit_action(
+            agent_name, task_prompt, agent_config, cleaned_response, immersion,
+            raw_response=raw_response
+        )
+    
+    async def _commit_action(
+        self,
+        agent_name: str,
+        task_prompt: str,
+        agent_config: AgentConfig,
+        cleaned_response: str,
+        immersion: Dict[str, Any],
+        raw_response: Optional[str] = None,
+        stream: bool = False
+    ) -> Dict:
+        """Update monde et log conversation d'une réponse nettoyée"""
+        # 6. Update world state (mutation du tour: pas d'entrée de session séparée)
+        action_summary = cleaned_response[:80] + "..." if len(cleaned_response) > 80 else cleaned_response
+        
+        self._in_turn = True
+        try:
+            await self.reality_engine.execute(
+                {
+                    "agent_name": agent_name,
+                    "action_summary": action_summary,
+                    "full_response": cleaned_response
+                },
+                "update",
+                {}
+            )
+        finally:
+            self._in_turn = False
+        
+        # 7. Log conversation (réponse brute seulement si le nettoyage l'a modifiée)
+        entry = {
+            "agent": agent_name,
+            "model": agent_config.model,
+            "task": task_prompt,
+            "response": cleaned_response,
+            "immersion_score": immersion['score'],
+            "immersion_maintained": immersion['maintained'],
+            "event": self.reality_engine.world_state.time_event,
+            "state_digest": self.session_digest
+        }
+        if raw_response is not None and raw_response != cleaned_response:
+            entry["raw_response"] = raw_response
+        if stream:
+            entry["stream"] = True
+        self.conversation_log.append(entry)
+        
+        return {
+            "success": True,
+            "response": cleaned_response,
+            "immersion": immersion
+        }
+    
+    async def _call_model(
+        self,
+        client: Any,
+        system: str,
+        prompt: str,
+        model: str,
+        temperature: Optional[float] = None
+    ) -> str:
+        """
+        Appel modèle LLM
+        - ModelProvider: appel async natif (pool partagé)
+        - Client SDK (Groq/OpenAI, sync ou async): sync exécuté hors boucle
+        - None: réponse placeholder
+        """
+        if temperature is None:
+            temperature = CONFIG["models"]["default_temperature"]
+        
+        if self.response_cache is not None:
+            return await self.response_cache.fetch(
+                model, system, prompt, temperature,
+                lambda: self._invoke_model(client, system, prompt, model, temperature)
+            )
+        return await self._invoke_model(client, system, prompt, model, temperature)
+    
+    async def _invoke_model(
+        self,
+        client: Any,
+        system: str,
+        prompt: str,
+        model: str,
+        temperature: float
+    ) -> str:
+        """Dispatch selon type de client"""
+        if isinstance(client, ModelProvider):
+            return await client.complete(system, prompt, model, temperature)
+        
+        if client is None:
+            return f"[Response from {model}]"
+        
+        create = client.chat.completions.create
+        kwargs = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": temperature
+        }
+        if inspect.iscoroutinefunction(create):
+            completion = await create(**kwargs)
+        else:
+            # Client synchrone : thread pour ne pas bloquer la boucle
+            completion = await asyncio.to_thread(create, **kwargs)
+        return completion.choices[0].message.content or ""
+    
+    # --- Session rejouable ---
+    
+    def _record_mutation(self, op: str, args: Tuple[Any, ...]):
+        """
+        Observateur des mutations du moteur: empreinte chaînée (op, args, compteurs)
+        et entrée session_log pour les mutations hors tour (agents, config, événement direct),
+        repérée par le nombre de tours déjà exécutés (turn)
+        """
+        self.mutations += 1
+        state = self.reality_engine.world_state
+        encoded = "\x1f".join((
+            op, str(state.time_event), str(log_count(state.knowledge["hypotheses"])), *map(str, args)
+        )).encode("utf-8")
+        self.session_digest = f"{zlib.crc32(encoded, int(self.session_digest or '0', 16)):08x}"
+        if not self._in_turn:
+            self.session_log.append({
+                "op": op,
+                "args": list(args),
+                "event": state.time_event,
+                "turn": self.conversation_log.total,
+                "state_digest": self.session_digest
+            })
+    
+    def export_session(self) -> Dict[str, Any]:
+        """
+        Session rejouable hors ligne (SessionReplayer): origine, tours et mutations
+        fusionnés dans l'ordre d'exécution (segments disque compris) et empreinte
+        finale de l'état complet
+        """
+        for log in (self.conversation_log, self.session_log):
+            if log.dropped:
+                raise ValueError(
+                    f"Session of world {self.world_id} is truncated ({log.dropped} entries dropped): "
+                    "set IR_SPILL_DIR or raise IR_CONVERSATION_WINDOW"
+                )
+        turn_offset, mutation_offset = self._session_spill_offsets
+        mutations = self.session_log.history(mutation_offset)
+        mutation = next(mutations, None)
+        entries = []
+        for turn, entry in enumerate(self.conversation_log.history(turn_offset)):
+            while mutation is not None and mutation["turn"] <= turn:
+                entries.append(mutation)
+                mutation = next(mutations, None)
+            entries.append(entry)
+        if mutation is not None:
+            entries.append(mutation)
+            entries.extend(mutations)
+        return {
+            "format": 1,
+            "world_id": self.world_id,
+            "created_at": self.created_at,
+            "origin": self.session_origin,
+            "entries": entries,
+            "state_digest": self.session_digest,
+            "final_state_digest": self.reality_engine.state_digest()
+        }
+    
+    def flush_history(self):
+        """Écrit historiques évincés en attente (monde + logs conversation et session)"""
+        self.reality_engine.flush_history()
+        self.conversation_log.flush()
+        self.session_log.flush()
+    
+    # --- Persistance ---
+    
+    def enable_persistence(self, directory: Path):
+        """Journalise les mutations du monde (WAL + snapshots) dans directory"""
+        self.reality_engine.attach_journal(
+            WorldJournal.from_config(directory), {"created_at": self.created_at}
+        )
+    
+    @classmethod
+    def restore(cls, directory: Path, response_cache: Optional[ResponseCache] = None) -> "Orchestrator":
+        """
+        Recharge un monde persisté: dernier snapshot puis rejeu de la queue du WAL
+        (conversation_log et session_log non persistés: historique de session seulement)
+        """
+        directory = Path(directory)
+        journal = WorldJournal.from_config(directory)
+        snapshot, records = journal.load()
+        if snapshot is None and not records:
+            raise FileNotFoundError(f"No persisted world in {directory}")
+        
+        world = cls(world_id=directory.name, response_cache=response_cache)
+        engine = world.reality_engine
+        engine.recorder = None
+        if snapshot is not None:
+            engine.load_state(snapshot)
+            world.created_at = snapshot["meta"].get("created_at", world.created_at)
+        for record in records:
+            engine.apply_record(record)
+        # Nouvelle session: origine = état restauré, entrées déjà sur disque exclues
+        world.session_origin = engine.export_state()
+        world._session_spill_offsets = tuple(
+            log.spill_path.stat().st_size if log.spill_path is not None and log.spill_path.exists() else 0
+            for log in (world.conversation_log, world.session_log)
+        )
+        engine.recorder = world._record_mutation
+        
+        # Queue longue rejouée: compactée tout de suite
+        engine.attach_journal(
+            journal, {"created_at": world.created_at}, snapshot=len(records) >= journal.snapshot_every
+        )
+        return world
+    
+    def sync_journal(self):
+        """fsync des mutations journalisées en attente"""
+        if self.reality_engine.journal is not None:
+            self.reality_engine.journal.sync()
+    
+    def close_journal(self):
+        """fsync + fermeture du WAL (monde déchargé, état conservé sur disque)"""
+        if self.reality_engine.journal is not None:
+            self.reality_engine.journal.close()
+    
+    def discard_persistence(self):
+        """Supprime l'état persisté du monde"""
+        if self.reality_engine.journal is not None:
+            self.reality_engine.journal.destroy()
+            self.reality_engine.journal = None
+    
+    def get_health(self) -> Dict:
+        """Health check global"""
+        return {
+            "status": "healthy",
+            "modules": {
+                "reality_engine": self.reality_engine.get_health(),
+                "response_processor": self.response_processor.get_health()
+            },
+            "conversation_turns": log_count(self.conversation_log),
+            "response_cache": (
+                self.response_cache.get_metrics() if self.response_cache is not None else None
+            )
+        }
+
+
+class SessionReplayer:
+    """
+    Rejeu déterministe hors ligne d'une session (Orchestrator.export_session)
+    Mêmes étapes RealityEngineV3 + ResponseProcessor que l'original, réponses
+    modèle servies depuis le log (ReplayProvider): vitesse CPU, sans réseau.
+    Vérifie après chaque étape réponse nettoyée, score immersion, numéro
+    d'événement et empreinte chaînée des mutations, puis l'état complet final.
+    """
+    
+    def __init__(self, session: Dict[str, Any], max_divergences: int = 100):
+        if session.get("format") != 1:
+            raise ValueError(f"Unsupported session format: {session.get('format')}")
+        self.session = session
+        self.max_divergences = max_divergences
+        self.provider = ReplayProvider()
+        self.world: Optional[Orchestrator] = None
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs) -> "SessionReplayer":
+        """Session exportée en JSON (GET /api/v1/world/{id}/session)"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+    
+    def build_world(self) -> Orchestrator:
+        """Monde de rejeu à l'état d'origine (sans spill disque ni journal)"""
+        world = Orchestrator(world_id=self.session.get("world_id"))
+        engine = world.reality_engine
+        state = engine.world_state
+        # Avant load_state: ne jamais toucher aux segments disque du monde original
+        for entries in (
+            state.event_sequence, state.communication, state.knowledge["hypotheses"],
+            world.conversation_log, world.session_log
+        ):
+            entries.spill_path = None
+        origin = self.session.get("origin")
+        if origin is not None:
+            engine.recorder = None
+            engine.load_state(origin)
+            engine.recorder = world._record_mutation
+        return world
+    
+    async def _replay_turn(self, world: Orchestrator, entry: Dict[str, Any]) -> Dict[str, Any]:
+        agent_name = entry["agent"]
+        agent = world.reality_engine.world_state.agents.get(agent_name)
+        if agent is None:
+            return {"success": False, "error": f"Agent {agent_name} not registered"}
+        agent_config = AgentConfig(
+            name=agent_name, model=entry["model"], role=agent.specialty, specialty=agent.specialty
+        )
+        self.provider.push(entry.get("raw_response", entry["response"]))
+        if entry.get("stream"):
+            result: Dict[str, Any] = {}
+            async for event in world.stream_agent_action(
+                agent_name, entry["task"], self.provider, agent_config
+            ):
+                if event["type"] == "final":
+                    result = event
+            return result
+        return await world.execute_agent_action(agent_name, entry["task"], self.provider, agent_config)
+    
+    @staticmethod
+    def _compare(step: int, expected: Dict[str, Any], actual: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Champs divergents entre entrée originale et entrée rejouée"""
+        fields = ("op", "args", "agent", "response", "immersion_score", "event", "state_digest")
+        divergences = []
+        for name in fields:
+            if name in expected and expected[name] != actual.get(name):
+                divergences.append({
+                    "step": step,
+                    "event": expected.get("event"),
+                    "agent": expected.get("agent"),
+                    "field": name,
+                    "expected": str(expected[name])[:200],
+                    "actual": str(actual.get(name))[:200]
+                })
+        return divergences
+    
+    async def run(self) -> Dict[str, Any]:
+        """Rejoue toutes les entrées; rapport (divergences vide = rejeu identique)"""
+        self.world = world = self.build_world()
+        engine = world.reality_engine
+        divergences: List[Dict[str, Any]] = []
+        turns = mutations = 0
+        
+        start = time.perf_counter()
+        for step, entry in enumerate(self.session["entries"]):
+            log = world.session_log if "op" in entry else world.conversation_log
+            before = log.total
+            if "op" in entry:
+                mutations += 1
+                engine.apply_record([entry.get("event"), entry["op"], *entry["args"]])
+            else:
+                turns += 1
+                result = await self._replay_turn(world, entry)
+                if not result.get("success"):
+                    divergences.append({
+                        "step": step, "event": entry.get("event"), "agent": entry.get("agent"),
+                        "field": "success", "expected": "True", "actual": str(result.get("error"))[:200]
+                    })
+            if len(divergences) < self.max_divergences:
+                actual = log[-1] if log.total > before else {}
+                divergences.extend(self._compare(step, entry, actual))
+            # Empreinte resynchronisée: une divergence n'est signalée qu'à l'étape fautive
+            world.session_digest = entry.get("state_digest", world.session_digest)
+        elapsed = time.perf_counter() - start
+        
+        final_digest = engine.state_digest()
+        expected_digest = self.session.get("final_state_digest")
+        final_match = final_digest == expected_digest if expected_digest else None
+        steps = turns + mutations
+        return {
+            "world_id": world.world_id,
+            "steps": steps,
+            "turns": turns,
+            "mutations": mutations,
+            "elapsed_s": round(elapsed, 4),
+            "steps_per_s": round(steps / elapsed, 1) if elapsed else None,
+            "identical": not divergences and final_match is not False,
+            "final_state_match": final_match,
+            "final_state_digest": final_digest,
+            "divergences": divergences[:self.max_divergences]
+        }
+
+
+class TaskGraph:
+    """
+    DAG des tâches d'un scénario (IRAPI.stream_scenario)
+    Arêtes: depends_on explicites (ids de tâches, ou indices si pas d'id)
+    + ordre implicite des tâches d'un même agent (un agent agit une fois à la fois;
+    seul un échec de dépendance explicite fait sauter une tâche)
+    Validé à la construction: ids dupliqués ou inconnus, cycles → ValueError
+    """
+    
+    def __init__(self, tasks: List[Dict[str, Any]]):
+        self.tasks = tasks
+        self.ids = [str(task.get("id", index)) for index, task in enumerate(tasks)]
+        index_of: Dict[str, int] = {}
+        for index, task_id in enumerate(self.ids):
+            if task_id in index_of:
+                raise ValueError(f"Duplicate task id: {task_id}")
+            index_of[task_id] = index
+        
+        self.depends: List[List[int]] = []
+        self.requires: List[set] = []
+        last_by_agent: Dict[str, int] = {}
+        for index, task in enumerate(tasks):
+            requires = set()
+            for dependency in task.get("depends_on") or []:
+                if str(dependency) not in index_of:
+                    raise ValueError(f"Task {self.ids[index]} depends on unknown task {dependency}")
+                requires.add(index_of[str(dependency)])
+            depends = set(requires)
+            if task["agent"] in last_by_agent:
+                depends.add(last_by_agent[task["agent"]])
+            last_by_agent[task["agent"]] = index
+            self.requires.append(requires)
+            self.depends.append(sorted(depends))
+        
+        self.dependents: List[List[int]] = [[] for _ in tasks]
+        for index, depends in enumerate(self.depends):
+            for dependency in depends:
+                self.dependents[dependency].append(index)
+        self.order = self._topological_order()
+    
+    def __len__(self) -> int:
+        return len(self.tasks)
+    
+    def _topological_order(self) -> List[int]:
+        """Ordre topologique (Kahn); tâches restantes = cycle"""
+        pending = [len(depends) for depends in self.depends]
+        ready = deque(index for index, count in enumerate(pending) if count == 0)
+        order = []
+        while ready:
+            index = ready.popleft()
+            order.append(index)
+            for dependent in self.dependents[index]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.tasks):
+            cycle = [self.ids[index] for index, count in enumerate(pending) if count]
+            raise ValueError(f"Dependency cycle between tasks: {', '.join(cycle[:10])}")
+        return order
+    
+    def roots(self) -> List[int]:
+        return [index for index, depends in enumerate(self.depends) if not depends]
+    
+    def critical_path(self, durations: Optional[List[float]] = None) -> Tuple[List[int], float]:
+        """
+        Plus long chemin du DAG: (indices des tâches, longueur)
+        Longueur en durées mesurées si fournies, sinon en nombre de tâches
+        """
+        if not self.tasks:
+            return [], 0.0
+        weights = durations if durations is not None else [1.0] * len(self.tasks)
+        finish = [0.0] * len(self.tasks)
+        previous: List[Optional[int]] = [None] * len(self.tasks)
+        for index in self.order:
+            start = 0.0
+            for dependency in self.depends[index]:
+                if previous[index] is None or finish[dependency] > start:
+                    start, previous[index] = finish[dependency], dependency
+            finish[index] = start + weights[index]
+        
+        end: Optional[int] = max(range(len(self.tasks)), key=finish.__getitem__)
+        length = finish[end]
+        path = []
+        while end is not None:
+            path.append(end)
+            end = previous[end]
+        return path[::-1], length
+
+
+# ============================================
+# SECTION 8 : API PUBLIQUE
+# ============================================
+
+def estimate_world_bytes(world: "Orchestrator") -> int:
+    """
+    Estimation mémoire résidente d'un monde (état + log conversation)
+    Objets partagés comptés une fois; chaînes internées (noms, spécialités,
+    statuts: partagées entre mondes) non comptées
+    """
+    seen = set()
+    
+    def size_of(value: Any) -> int:
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(
+                size_of(k) + size_of(v) for k, v in value.items()
+            )
+        if isinstance(value, WorldEvent):
+            return sys.getsizeof(value) + size_of(value.event_id) + size_of(value.summary)
+        if isinstance(value, (list, tuple, BoundedLog)):
+            return sys.getsizeof(value) + sum(size_of(v) for v in value)
+        if isinstance(value, AgentRecord):
+            return (
+                sys.getsizeof(value) + (0 if isinstance(value.energy, str) else size_of(value.energy))
+                + (size_of(value.extra) if value.extra else 0)
+            )
+        return sys.getsizeof(value)
+    
+    state = world.reality_engine.world_state
+    return sum(
+        size_of(part) for part in (
+            state.mission, state.agents, state.environment, state.knowledge,
+            state.communication, state.event_sequence, world.conversation_log, world.session_log
+        )
+    )
+
+
+class WorldStore:
+    """
+    Registre multi-mondes (world_id → Orchestrator)
+    - Lookup O(1), ordre LRU via OrderedDict
+    - Plafonds nombre de mondes et mémoire résidente
+    - Expiration TTL par sweeper asyncio en arrière-plan
+    - Mondes persistés: toute éviction = déchargement (restaurables) ;
+      ttl_discard: expiration TTL = suppression de l'état disque
+    """
+    
+    def __init__(
+        self,
+        max_worlds: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+        ttl_discard: Optional[bool] = None
+    ):
+        config = CONFIG["worlds"]
+        self.max_worlds = max_worlds if max_worlds is not None else config["max_worlds"]
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config["ttl_seconds"]
+        self.max_bytes = max_bytes if max_bytes is not None else config["max_bytes"]
+        self.sweep_interval = (
+            sweep_interval if sweep_interval is not None else config["sweep_interval"]
+        )
+        self.ttl_discard = ttl_discard if ttl_discard is not None else config["ttl_discard"]
+        
+        # world_id → [orchestrator, last_access, resident_bytes, sized_version]
+        self._entries: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._resident_bytes = 0
+        self._sweeper = None
+        self._syncer = None
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": {"ttl": 0, "lru": 0, "memory": 0}
+        }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, world_id: str) -> bool:
+        return world_id in self._entries
+    
+    @staticmethod
+    def _version(world: "Orchestrator") -> Tuple[int, int]:
+        """Mutations observées + invalidations (modifications directes de world_state)"""
+        return (world.mutations, world.reality_engine.world_version)
+    
+    def put(self, world: "Orchestrator"):
+        """Ajoute monde (le plus récent en LRU) puis applique plafonds"""
+        self.remove(world.world_id)
+        size = estimate_world_bytes(world)
+        self._entries[world.world_id] = [world, time.monotonic(), size, self._version(world)]
+        self._resident_bytes += size
+        self._enforce_limits(keep=world.world_id)
+    
+    def get(self, world_id: str) -> Optional["Orchestrator"]:
+        """Lookup O(1) + rafraîchit position LRU et TTL"""
+        entry = self._entries.get(world_id)
+        if entry is None:
+            self.metrics["misses"] += 1
+            return None
         
-        await self.reality_engine.execute(
-            {
-                "agent_name": agent_name,
-                "action_summary": action_summary,
-                "full_response": cleaned_response
-            },
-            "update",
-            {}
-        )
+        if time.monotonic() - entry[1] > self.ttl_seconds:
+            self._evict(world_id, "ttl")
+            self.metrics["misses"] += 1
+            return None
         
-        # 7. Log conversation
-        self.conversation_log.append({
-            "agent": agent_name,
-            "model": agent_config.model,
-            "task": task_prompt,
-            "response": cleaned_response,
-            "immersion_score": immersion['score'],
-            "immersion_maintained": immersion['maintained'],
-            "event": self.reality_engine.world_state.time_event
-        })
+        entry[1] = time.monotonic()
+        self._entries.move_to_end(world_id)
+        self.metrics["hits"] += 1
+        return entry[0]
+    
+    def remove(self, world_id: str) -> bool:
+        """Retire monde, True si il existait"""
+        entry = self._entries.pop(world_id, None)
+        if entry is None:
+            return False
+        self._resident_bytes -= entry[2]
+        entry[0].flush_history()
+        entry[0].close_journal()
+        return True
+    
+    def items(self):
+        """Itère (world_id, orchestrator) du moins au plus récemment utilisé"""
+        return [(world_id, entry[0]) for world_id, entry in self._entries.items()]
+    
+    def _evict(self, world_id: str, reason: str):
+        world = self._entries[world_id][0] if world_id in self._entries else None
+        if self.remove(world_id):
+            if reason == "ttl" and self.ttl_discard:
+                world.discard_persistence()
+            self.metrics["evictions"][reason] += 1
+            logger.info(f"World evicted ({reason}): {world_id}")
+    
+    def _enforce_limits(self, keep: Optional[str] = None):
+        """Évince en tête LRU tant que plafonds dépassés"""
+        while len(self._entries) > self.max_worlds:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._evict(oldest, "lru")
         
-        return {
-            "success": True,
-            "response": cleaned_response,
-            "immersion": immersion
-        }
+        while self._resident_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._evict(oldest, "memory")
     
-    async def _call_model(self, client: Any, system: str, prompt: str, model: str) -> str:
+    def sweep(self) -> int:
         """
-        Appel modèle LLM - À implémenter selon provider
-        Placeholder ici
+        Passe d'entretien: expire TTL (depuis tête LRU, arrêt au premier
+        monde encore valide) puis ré-estime uniquement les mondes modifiés
         """
-        # TODO: Implémenter selon provider (Groq, OpenAI, etc.)
-        # Pour l'instant retourne placeholder
-        return f"[Response from {model}]"
+        now = time.monotonic()
+        expired = 0
+        while self._entries:
+            world_id, entry = next(iter(self._entries.items()))
+            if now - entry[1] <= self.ttl_seconds:
+                break
+            self._evict(world_id, "ttl")
+            expired += 1
+        
+        for entry in self._entries.values():
+            version = self._version(entry[0])
+            if version != entry[3]:
+                size = estimate_world_bytes(entry[0])
+                self._resident_bytes += size - entry[2]
+                entry[2], entry[3] = size, version
+        
+        self._enforce_limits()
+        return expired
     
-    def get_health(self) -> Dict:
-        """Health check global"""
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"World sweeper error: {str(e)}")
+    
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(CONFIG["persistence"]["fsync_interval"])
+            try:
+                self.sync_journals()
+            except Exception as e:
+                logger.error(f"Journal sync error: {str(e)}")
+    
+    def sync_journals(self):
+        """fsync des WAL des mondes résidents (borne la perte sur mondes inactifs)"""
+        for entry in self._entries.values():
+            entry[0].sync_journal()
+    
+    def start_sweeper(self):
+        """Lance sweeper (et sync des journaux si persistance) en tâche de fond"""
+        loop = asyncio.get_running_loop()
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = loop.create_task(self._sweep_loop())
+        if CONFIG["persistence"]["dir"] and (self._syncer is None or self._syncer.done()):
+            self._syncer = loop.create_task(self._sync_loop())
+    
+    async def stop_sweeper(self):
+        """Arrête sweeper et sync des journaux"""
+        for task in (self._sweeper, self._syncer):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._sweeper = None
+        self._syncer = None
+    
+    def get_metrics(self) -> Dict:
+        """Métriques registre (évictions, hit rate, mémoire)"""
+        lookups = self.metrics["hits"] + self.metrics["misses"]
         return {
-            "status": "healthy",
-            "modules": {
-                "reality_engine": self.reality_engine.get_health(),
-                "response_processor": self.response_processor.get_health()
-            },
-            "conversation_turns": len(self.conversation_log)
+            "worlds": len(self._entries),
+            "max_worlds": self.max_worlds,
+            "resident_bytes": self._resident_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.metrics["hits"],
+            "misses": self.metrics["misses"],
+            "hit_rate": round(self.metrics["hits"] / lookups, 4) if lookups else 0.0,
+            "evictions": dict(self.metrics["evictions"])
         }
 
 
-# ============================================
-# SECTION 7 : API PUBLIQUE
-# ============================================
+def shard_for(world_id: str, shards: int) -> int:
+    """Shard propriétaire d'un monde (crc32: stable entre process, contrairement à hash())"""
+    return zlib.crc32(world_id.encode("utf-8")) % shards
+
 
 class IRAPI:
     """
     API publique Informatique Réalitaire
+    shard (index, total): process worker d'un ShardedHTTPApp, ne crée et ne
+    restaure que les mondes dont shard_for(world_id) == index
     """
     
-    def __init__(self):
-        self.orchestrator = Orchestrator()
+    def __init__(
+        self,
+        response_cache: Optional[ResponseCache] = None,
+        shard: Optional[Tuple[int, int]] = None
+    ):
+        # Cache réponses partagé par tous les mondes (IR_CACHE_MODE par défaut)
+        self.response_cache = response_cache or ResponseCache.from_config()
+        self.orchestrator = Orchestrator(response_cache=self.response_cache)
+        self.shard = shard
+        self.worlds = WorldStore()
+        persistence_dir = CONFIG["persistence"]["dir"]
+        self.persistence_dir = Path(persistence_dir) if persistence_dir else None
         logger.info("IR API initialized")
     
+    def create_world(
+        self,
+        name: Optional[str] = None,
+        objects: Optional[List[Dict[str, Any]]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        agents: Optional[List[AgentConfig]] = None
+    ) -> Orchestrator:
+        """Crée un monde IR indépendant (un Orchestrator par monde)"""
+        world = Orchestrator(world_id=self._new_world_id(), response_cache=self.response_cache)
+        if self.persistence_dir is not None:
+            world.enable_persistence(self.persistence_dir / world.world_id)
+        world.reality_engine.configure_world(name, objects, metadata)
+        for agent_config in agents or []:
+            world.reality_engine.register_agent(agent_config)
+        self.worlds.put(world)
+        logger.info(f"World created: {world.world_id}")
+        return world
+    
+    def owns(self, world_id: str) -> bool:
+        """Monde attribué à ce process (toujours vrai hors sharding)"""
+        return self.shard is None or shard_for(world_id, self.shard[1]) == self.shard[0]
+    
+    def _new_world_id(self) -> Optional[str]:
+        """Identifiant aléatoire appartenant à ce shard (None: défaut Orchestrator)"""
+        if self.shard is None:
+            return None
+        while True:
+            world_id = uuid.uuid4().hex
+            if self.owns(world_id):
+                return world_id
+    
+    def get_world(self, world_id: str) -> Optional[Orchestrator]:
+        """Retourne le monde demandé ou None (rechargé depuis disque si déchargé)"""
+        world = self.worlds.get(world_id)
+        if world is None and self._persisted_path(world_id) is not None:
+            world = self._restore_world(self._persisted_path(world_id))
+        return world
+    
+    def delete_world(self, world_id: str) -> bool:
+        """Supprime un monde (et son état persisté), True si il existait"""
+        existed = self.worlds.remove(world_id)
+        path = self._persisted_path(world_id)
+        if path is not None:
+            WorldJournal(path).destroy()
+            existed = True
+        return existed
+    
+    def _persisted_path(self, world_id: str) -> Optional[Path]:
+        """Répertoire persisté du monde, None si absent"""
+        if self.persistence_dir is None or not re.fullmatch(r"[\w-]+", world_id) or not self.owns(world_id):
+            return None
+        path = self.persistence_dir / world_id
+        return path if path.is_dir() else None
+    
+    def _restore_world(self, path: Path) -> Optional[Orchestrator]:
+        try:
+            world = Orchestrator.restore(path, self.response_cache)
+        except Exception as e:
+            logger.error(f"World restore failed ({path.name}): {str(e)}")
+            return None
+        self.worlds.put(world)
+        return world
+    
+    def restore_worlds(self) -> int:
+        """Recharge tous les mondes persistés (démarrage), retourne leur nombre"""
+        if self.persistence_dir is None or not self.persistence_dir.is_dir():
+            return 0
+        start = time.perf_counter()
+        restored = sum(
+            1 for path in sorted(self.persistence_dir.iterdir())
+            if path.is_dir() and self.owns(path.name) and self._restore_world(path) is not None
+        )
+        logger.info(f"Restored {restored} worlds in {time.perf_counter() - start:.2f}s")
+        return restored
+    
+    def close_worlds(self):
+        """fsync + fermeture des journaux des mondes résidents (arrêt serveur)"""
+        for _, world in self.worlds.items():
+            world.close_journal()
+    
+    def list_worlds(self) -> List[Dict]:
+        """Résumé des mondes actifs"""
+        return [
+            {
+                "world_id": world_id,
+                "name": world.reality_engine.world_state.environment["location"],
+                "created_at": world.created_at,
+                "agents": len(world.reality_engine.world_state.agents),
+                "time_event": world.reality_engine.world_state.time_event
+            }
+            for world_id, world in self.worlds.items()
+        ]
+    
     async def execute_scenario(self, scenario_config: Dict) -> Dict:
         """
         Exécute scénario multi-agent complet
@@ -609,79 +4821,1121 @@ class IRAPI:
             scenario_config: {
                 "agents": [AgentConfig, ...],
                 "tasks": [{"agent": str, "task": str}, ...],
-                "model_client": client object
+                "model_client": client object,
+                "mode": "sequential" | "simultaneous" | "dag" (optionnel; défaut
+                        "dag" si une tâche déclare depends_on, sinon "sequential"),
+                "max_concurrency": int (optionnel, modes simultané et dag),
+                "world_id": str (optionnel, monde du registre; défaut monde principal)
             }
+            Mode dag: tâches {"id"?, "agent", "task", "depends_on"?: [id, ...]},
+            voir stream_scenario; résultats rendus dans l'ordre des tâches
+            Tâche d'un agent absent de "agents" (tout mode), graphe invalide (dag)
+            → {"success": False, "error": str} avant toute exécution
         """
         results = []
+        agent_configs = {a.name: a for a in scenario_config["agents"]}
+        
+        mode = scenario_config.get("mode") or (
+            "dag" if any(task.get("depends_on") for task in scenario_config["tasks"]) else "sequential"
+        )
+        graph = None
+        try:
+            self._check_scenario_agents(scenario_config)
+            if mode == "dag":
+                graph = TaskGraph(scenario_config["tasks"])
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        
+        orchestrator = await self._prepare_scenario(scenario_config)
+        if orchestrator is None:
+            return {"success": False, "error": f"World {scenario_config['world_id']} not found"}
+        
+        if graph is not None:
+            results = [None] * len(graph)
+            async for event in self._run_task_graph(orchestrator, graph, scenario_config):
+                if event["type"] == "result":
+                    results[event.pop("index")] = {
+                        key: value for key, value in event.items() if key not in ("type", "task_id")
+                    }
+                else:
+                    schedule = event
+            return {
+                "success": True,
+                "results": results,
+                "schedule": {key: value for key, value in schedule.items() if key not in ("type", "success")},
+                "health": orchestrator.get_health()
+            }
+        
+        if mode == "simultaneous":
+            # Tours simultanés: un tour s'arrête dès qu'un agent réapparaît
+            rounds: List[List[Tuple[AgentConfig, str]]] = [[]]
+            for task in scenario_config["tasks"]:
+                if any(a.name == task["agent"] for a, _ in rounds[-1]):
+                    rounds.append([])
+                rounds[-1].append((agent_configs[task["agent"]], task["task"]))
+            
+            for round_tasks in rounds:
+                results.extend(await orchestrator.execute_round(
+                    round_tasks,
+                    scenario_config["model_client"],
+                    scenario_config.get("max_concurrency")
+                ))
+        else:
+            # Execute tasks
+            for task in scenario_config["tasks"]:
+                agent_name = task["agent"]
+                agent_config = agent_configs[agent_name]
+                
+                result = await orchestrator.execute_agent_action(
+                    agent_name,
+                    task["task"],
+                    scenario_config["model_client"],
+                    agent_config
+                )
+                
+                results.append(result)
+        
+        return {
+            "success": True,
+            "results": results,
+            "health": orchestrator.get_health()
+        }
+    
+    @staticmethod
+    def _check_scenario_agents(scenario_config: Dict):
+        """Agent de chaque tâche déclaré dans scenario_config["agents"], sinon ValueError (tous modes)"""
+        names = {agent_config.name for agent_config in scenario_config["agents"]}
+        for index, task in enumerate(scenario_config["tasks"]):
+            if task.get("agent") not in names:
+                raise ValueError(f"Task {task.get('id', index)} references unknown agent {task.get('agent')}")
+    
+    async def _prepare_scenario(self, scenario_config: Dict) -> Optional[Orchestrator]:
+        """Monde du scénario (None si world_id inconnu), agents enregistrés"""
+        orchestrator = self.orchestrator
+        if scenario_config.get("world_id"):
+            orchestrator = self.get_world(scenario_config["world_id"])
+            if orchestrator is None:
+                return None
         
         # Register agents
         for agent_config in scenario_config["agents"]:
-            await self.orchestrator.reality_engine.execute(
+            await orchestrator.reality_engine.execute(
                 agent_config,
                 "register_agent",
                 {}
             )
+        return orchestrator
+    
+    async def stream_scenario(self, scenario_config: Dict):
+        """
+        Scénario en DAG de dépendances (générateur async, même config que execute_scenario)
+        Toute tâche prête (dépendances terminées) démarre aussitôt sous plafond global
+        max_concurrency; son contexte voit donc le monde après ses dépendances.
+        Événements dans l'ordre de fin: {"type": "result", "task_id", "index", ...résultat}
+        (tâche sautée si une dépendance a échoué) puis {"type": "final", "success",
+        "wall_s", "busy_s", "critical_path": {...}}
+        """
+        try:
+            self._check_scenario_agents(scenario_config)
+            graph = TaskGraph(scenario_config["tasks"])
+        except ValueError as e:
+            yield {"type": "final", "success": False, "error": str(e)}
+            return
+        orchestrator = await self._prepare_scenario(scenario_config)
+        if orchestrator is None:
+            yield {"type": "final", "success": False, "error": f"World {scenario_config['world_id']} not found"}
+            return
+        async for event in self._run_task_graph(orchestrator, graph, scenario_config):
+            yield event
+    
+    async def _run_task_graph(self, orchestrator: Orchestrator, graph: TaskGraph, scenario_config: Dict):
+        """Ordonnanceur DAG: lance les tâches prêtes, émet les résultats à la fin de chacune"""
+        agent_configs = {a.name: a for a in scenario_config["agents"]}
+        model_client = scenario_config["model_client"]
+        semaphore = asyncio.Semaphore(
+            scenario_config.get("max_concurrency") or CONFIG["orchestrator"]["max_concurrency"]
+        )
+        pending = [len(depends) for depends in graph.depends]
+        failed_dependency: List[Optional[str]] = [None] * len(graph)
+        durations = [0.0] * len(graph)
         
-        # Execute tasks
-        for task in scenario_config["tasks"]:
-            agent_name = task["agent"]
-            agent_config = next(
-                a for a in scenario_config["agents"]
-                if a.name == agent_name
-            )
-            
-            result = await self.orchestrator.execute_agent_action(
-                agent_name,
-                task["task"],
-                scenario_config["model_client"],
-                agent_config
-            )
-            
-            results.append(result)
+        async def run(index: int) -> Tuple[int, Dict]:
+            task = graph.tasks[index]
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result = await orchestrator.execute_agent_action(
+                        task["agent"], task["task"], model_client, agent_configs[task["agent"]]
+                    )
+                except Exception as e:
+                    logger.error(f"Scenario task {graph.ids[index]} failed: {str(e)}")
+                    result = {"success": False, "error": str(e)}
+                durations[index] = time.perf_counter() - start
+            return index, result
         
-        return {
+        running = set()
+        settled = deque((index, None) for index in graph.roots())
+        start = time.perf_counter()
+        try:
+            while settled or running:
+                # Tâches prêtes lancées, tâches à dépendance échouée sautées (en cascade)
+                while settled:
+                    index, result = settled.popleft()
+                    if result is None:
+                        if failed_dependency[index] is None:
+                            running.add(asyncio.ensure_future(run(index)))
+                            continue
+                        result = {
+                            "success": False,
+                            "skipped": True,
+                            "error": f"Dependency {failed_dependency[index]} failed"
+                        }
+                    yield {"type": "result", "task_id": graph.ids[index], "index": index, **result}
+                    for dependent in graph.dependents[index]:
+                        if (
+                            not result["success"] and index in graph.requires[dependent]
+                            and failed_dependency[dependent] is None
+                        ):
+                            failed_dependency[dependent] = graph.ids[index]
+                        pending[dependent] -= 1
+                        if pending[dependent] == 0:
+                            settled.append((dependent, None))
+                if running:
+                    done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    settled.extend(future.result() for future in done)
+        finally:
+            for future in running:
+                future.cancel()
+        
+        wall = time.perf_counter() - start
+        path, length = graph.critical_path(durations)
+        yield {
+            "type": "final",
             "success": True,
-            "results": results,
-            "health": self.orchestrator.get_health()
+            "tasks": len(graph),
+            "wall_s": round(wall, 4),
+            "busy_s": round(sum(durations), 4),
+            "critical_path": {
+                "tasks": [graph.ids[index] for index in path],
+                "duration_s": round(length, 4)
+            }
         }
     
     def get_health(self) -> Dict:
         """Health check API"""
-        return self.orchestrator.get_health()
+        health = self.orchestrator.get_health()
+        health["worlds"] = self.worlds.get_metrics()
+        health["rate_limiter"] = SecurityGateway.get_rate_limiter().get_metrics()
+        audit_writer = SecurityGateway.get_audit_writer()
+        health["audit"] = audit_writer.get_metrics() if audit_writer else None
+        return health
+    
+    def render_metrics(self, model_client: Any = None) -> str:
+        """Métriques process au format texte Prometheus"""
+        audit_writer = SecurityGateway.get_audit_writer()
+        gauges = {
+            "worlds": self.worlds.get_metrics(),
+            "rate_limiter": SecurityGateway.get_rate_limiter().get_metrics(),
+            "audit": audit_writer.get_metrics() if audit_writer else None,
+            "response_cache": self.response_cache.get_metrics() if self.response_cache else None
+        }
+        if isinstance(model_client, ModelProvider):
+            gauges["provider"] = model_client.metrics
+            if model_client.scheduler is not None:
+                gauges["provider_scheduler"] = model_client.scheduler.get_metrics()
+        return METRICS.render_prometheus(gauges)
 
 
 # ============================================
-# SECTION 8 : CLI/SERVER
+# SECTION 9 : CLI/SERVER
 # ============================================
 
+class HTTPError(Exception):
+    """Erreur HTTP remontée par les routes (status + message)"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class IRHTTPApp:
+    """
+    Routes HTTP de l'API monde (indépendantes du framework)
+    Servies par FastAPI/uvicorn si installés, sinon par le serveur asyncio stdlib
+    """
+    
+    API_PREFIX = "/api/v1"
+    
+    def __init__(self, api: IRAPI, model_client: Any = None):
+        self.api = api
+        self.model_client = model_client
+        prefix = re.escape(self.API_PREFIX)
+        self.routes = [
+            ("GET", re.compile(r"^/health$"), self._health),
+            ("GET", re.compile(r"^/metrics$"), self._prometheus),
+            ("POST", re.compile(rf"^{prefix}/world/create$"), self._create_world),
+            ("GET", re.compile(rf"^{prefix}/world/(?P<world_id>[\w-]+)/context$"), self._context),
+            ("POST", re.compile(rf"^{prefix}/world/(?P<world_id>[\w-]+)/update$"), self._update),
+            ("GET", re.compile(rf"^{prefix}/world/(?P<world_id>[\w-]+)/metrics$"), self._metrics),
+            ("GET", re.compile(rf"^{prefix}/world/(?P<world_id>[\w-]+)/session$"), self._session),
+            ("GET", re.compile(rf"^{prefix}/worlds$"), self._list_worlds),
+            ("DELETE", re.compile(rf"^{prefix}/world/(?P<world_id>[\w-]+)$"), self._delete_world),
+        ]
+    
+    async def startup(self):
+        """Démarrage serveur: restauration des mondes persistés + tâches de fond"""
+        self.api.restore_worlds()
+        self.api.worlds.start_sweeper()
+    
+    async def shutdown(self):
+        """Arrêt serveur: tâches de fond, journaux et audit vidés"""
+        await self.api.worlds.stop_sweeper()
+        self.api.close_worlds()
+        SecurityGateway.close_audit_writer()
+    
+    async def handle(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, str],
+        body: Optional[Dict],
+        client_id: str = "anonymous"
+    ) -> Tuple[int, Any]:
+        """
+        Dispatch requête → (status HTTP, payload JSON)
+        Le payload peut être un itérateur async de dicts (réponse NDJSON streamée)
+        ou une chaîne (texte brut, ex: exposition Prometheus)
+        """
+        start = time.perf_counter()
+        status, payload = 500, {"success": False, "error": "Internal server error"}
+        route = "unmatched"
+        METRICS.track_in_flight("http", 1)
+        
+        try:
+            handler, params = self._resolve(method, path)
+            route = handler.__name__.lstrip("_")
+            if body is not None and not isinstance(body, dict):
+                raise HTTPError(400, "JSON body must be an object")
+            status, payload = await handler(params, query, body or {}, client_id)
+        except HTTPError as e:
+            status, payload = e.status, {"success": False, "error": e.message}
+        except RateLimitError as e:
+            status, payload = 429, {"success": False, "error": str(e)}
+        except SecurityError as e:
+            status, payload = 400, {"success": False, "error": str(e)}
+        except Exception as e:
+            logger.error(f"Unhandled error on {method} {path}: {str(e)}")
+        
+        duration = (time.perf_counter() - start) * 1000
+        METRICS.track_in_flight("http", -1)
+        METRICS.record("http", route, duration, status >= 500)
+        SecurityGateway.audit_log(
+            f"{method} {path}",
+            "IRHTTPApp",
+            {"success": status < 400, "duration": duration},
+            {"client_id": client_id, "status": status}
+        )
+        return status, payload
+    
+    def _resolve(self, method: str, path: str):
+        """Trouve handler correspondant au chemin"""
+        path_matched = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match:
+                path_matched = True
+                if route_method == method:
+                    return handler, match.groupdict()
+        if path_matched:
+            raise HTTPError(405, f"Method {method} not allowed on {path}")
+        raise HTTPError(404, f"Route not found: {path}")
+    
+    def _get_world(self, world_id: str) -> Orchestrator:
+        world = self.api.get_world(world_id)
+        if world is None:
+            raise HTTPError(404, f"World {world_id} not found")
+        return world
+    
+    _TYPE_NAMES = {str: "a string", bool: "a boolean", list: "a list", dict: "an object"}
+    
+    @classmethod
+    def _field(cls, body: Dict, key: str, expected: type) -> Any:
+        """Champ optionnel du payload (None si absent), de type expected sinon 400"""
+        value = body.get(key)
+        if value is not None and not isinstance(value, expected):
+            raise HTTPError(400, f"'{key}' must be {cls._TYPE_NAMES[expected]}")
+        return value
+    
+    @staticmethod
+    def _parse_agents(raw_agents: Any) -> List[AgentConfig]:
+        """Convertit payload JSON → AgentConfig (champs texte validés, position [x, y] → "x,y")"""
+        if not isinstance(raw_agents, list):
+            raise HTTPError(400, "'agents' must be a list")
+        agents = []
+        for raw in raw_agents:
+            try:
+                if not isinstance(raw, dict):
+                    raise TypeError("expected an object")
+                agent_config = AgentConfig(**raw)
+                for key in ("name", "model", "role", "specialty"):
+                    if not isinstance(getattr(agent_config, key), str):
+                        raise TypeError(f"'{key}' must be a string")
+                if isinstance(agent_config.energy, bool) or not isinstance(agent_config.energy, (str, int, float)):
+                    raise TypeError("'energy' must be a string or a number")
+                agent_config.position = format_position(agent_config.position)
+            except (TypeError, ValueError) as e:
+                raise HTTPError(400, f"Invalid agent definition: {str(e)}")
+            agents.append(agent_config)
+        return agents
+    
+    async def _health(self, params, query, body, client_id) -> Tuple[int, Dict]:
+        return 200, {
+            "status": "healthy",
+            "worlds": self.api.worlds.get_metrics(),
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    async def _prometheus(self, params, query, body, client_id) -> Tuple[int, str]:
+        """Exposition texte Prometheus (latences par module/opération + jauges)"""
+        return 200, self.api.render_metrics(self.model_client)
+    
+    async def _create_world(self, params, query, body, client_id) -> Tuple[int, Dict]:
+        name = self._field(body, "name", str)
+        if name is not None:
+            SecurityGateway.validate_input(name, {"client_id": client_id})
+        objects = self._field(body, "objects", list)
+        if objects is not None and not all(isinstance(obj, dict) for obj in objects):
+            raise HTTPError(400, "'objects' must be a list of objects")
+        metadata = self._field(body, "metadata", dict)
+        radius = (metadata or {}).get("perception_radius")
+        if radius is not None and (isinstance(radius, bool) or not isinstance(radius, (int, float))):
+            raise HTTPError(400, "'metadata.perception_radius' must be a number")
+        
+        world = self.api.create_world(
+            name=name,
+            objects=objects,
+            metadata=metadata,
+            agents=self._parse_agents(body.get("agents", []))
+        )
+        return 201, {
+            "success": True,
+            "world_id": world.world_id,
+            "created_at": world.created_at,
+            "agents": list(world.reality_engine.world_state.agents)
+        }
+    
+    async def _context(self, params, query, body, client_id) -> Tuple[int, Dict]:
+        world = self._get_world(params["world_id"])
+        agent_name = query.get("agent")
+        if not agent_name:
+            raise HTTPError(400, "Query parameter 'agent' is required")
+        
+        metadata = {}
+        if query.get("max_tokens"):
+            try:
+                metadata["max_tokens"] = int(query["max_tokens"])
+            except ValueError:
+                raise HTTPError(400, "Query parameter 'max_tokens' must be an integer")
+        
+        if agent_name not in world.reality_engine.world_state.agents:
+            raise HTTPError(404, f"Agent {agent_name} not registered")
+        
+        # ?delta=1: changements depuis le dernier contexte servi à cet agent (client à état conversationnel)
+        delta = query.get("delta", "").lower() in ("1", "true", "yes")
+        operation = "get_delta_context" if delta else "get_context"
+        result = await world.reality_engine.execute(agent_name, operation, metadata)
+        if not result["success"]:
+            return 500, {"success": False, "error": result["error"]}
+        
+        payload = {
+            "success": True,
+            "world_id": world.world_id,
+            "agent": agent_name,
+            "time_event": world.reality_engine.world_state.time_event,
+            "formatted_context": result["result"]["context"] if delta else result["result"]
+        }
+        if delta:
+            payload["full"] = result["result"]["full"]
+        return 200, payload
+    
+    async def _update(self, params, query, body, client_id) -> Tuple[int, Dict]:
+        """
+        Trois formes de payload:
+        - {"agents": [...]}                       → enregistre agents
+        - {"agent": str, "task": str}             → action complète (appel modèle)
+          (+ "stream": true → réponse NDJSON chunked)
+        - {"agent": str, "action_summary": str}   → événement direct
+        "position" (coordonnées "x,y", "zone@x,y" ou zone) déplace l'agent avant l'action, ou seul
+        """
+        world = self._get_world(params["world_id"])
+        engine = world.reality_engine
+        
+        if "agents" in body:
+            registered = []
+            for agent_config in self._parse_agents(body["agents"]):
+                await engine.execute(agent_config, "register_agent", {})
+                registered.append(agent_config.name)
+            return 200, {"success": True, "registered": registered}
+        
+        agent_name = self._field(body, "agent", str)
+        if agent_name not in engine.world_state.agents:
+            raise HTTPError(404, f"Agent {agent_name} not registered")
+        for key in ("task", "action_summary", "full_response", "model", "role"):
+            self._field(body, key, str)
+        self._field(body, "stream", bool)
+        
+        if "position" in body:
+            try:
+                position = format_position(body["position"])
+            except ValueError as e:
+                raise HTTPError(400, str(e))
+            SecurityGateway.validate_input(position, {"client_id": client_id})
+            await engine.execute({"agent_name": agent_name, "position": position}, "move", {})
+            if "task" not in body and "action_summary" not in body:
+                return 200, {"success": True, "agent": agent_name, "position": position}
+        
+        if "task" in body:
+            SecurityGateway.validate_input(body["task"], {"client_id": client_id})
+            agent_config = AgentConfig(
+                name=agent_name,
+                model=body.get("model", "llama-3.3-70b-versatile"),
+                role=body.get("role", engine.world_state.agents[agent_name]["specialty"]),
+                specialty=engine.world_state.agents[agent_name]["specialty"]
+            )
+            if body.get("stream"):
+                # Flux NDJSON: deltas nettoyés puis événement final
+                return 200, world.stream_agent_action(
+                    agent_name, body["task"], self.model_client, agent_config
+                )
+            result = await world.execute_agent_action(
+                agent_name, body["task"], self.model_client, agent_config
+            )
+            return (200 if result["success"] else 500), result
+        
+        if "action_summary" in body:
+            SecurityGateway.validate_input(body["action_summary"], {"client_id": client_id})
+            result = await engine.execute(
+                {
+                    "agent_name": agent_name,
+                    "action_summary": body["action_summary"],
+                    "full_response": body.get("full_response", body["action_summary"])
+                },
+                "update",
+                {}
+            )
+            return 200, {
+                "success": result["success"],
+                "time_event": engine.world_state.time_event
+            }
+        
+        raise HTTPError(400, "Payload requires 'agents', 'position', 'task' or 'action_summary'")
+    
+    async def _metrics(self, params, query, body, client_id) -> Tuple[int, Dict]:
+        world = self._get_world(params["world_id"])
+        state = world.reality_engine.world_state
+        return 200, {
+            "success": True,
+            "world_id": world.world_id,
+            "time_event": state.time_event,
+            "agents": len(state.agents),
+            "events": log_count(state.event_sequence),
+            "health": world.get_health()
+        }
+    
+    async def _session(self, params, query, body, client_id) -> Tuple[int, Dict]:
+        """Session rejouable hors ligne (SessionReplayer / --mode replay)"""
+        world = self._get_world(params["world_id"])
+        try:
+            return 200, world.export_session()
+        except ValueError as e:
+            raise HTTPError(409, str(e))
+    
+    async def _list_worlds(self, params, query, body, client_id) -> Tuple[int, Dict]:
+        worlds = self.api.list_worlds()
+        return 200, {"success": True, "count": len(worlds), "worlds": worlds}
+    
+    async def _delete_world(self, params, query, body, client_id) -> Tuple[int, Dict]:
+        if not self.api.delete_world(params["world_id"]):
+            raise HTTPError(404, f"World {params['world_id']} not found")
+        return 200, {"success": True, "deleted": params["world_id"]}
+
+
+_HTTP_REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 429: "Too Many Requests",
+    500: "Internal Server Error"
+}
+
+
+async def _write_ndjson_stream(writer, status: int, events, keep_alive: bool):
+    """Réponse HTTP/1.1 chunked, un objet JSON par ligne"""
+    writer.write(
+        (
+            f"HTTP/1.1 {status} {_HTTP_REASONS.get(status, 'OK')}\r\n"
+            f"Content-Type: application/x-ndjson; charset=utf-8\r\n"
+            f"Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1")
+    )
+    async for event in events:
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        writer.write(f"{len(line):X}\r\n".encode("latin-1") + line + b"\r\n")
+        await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def _handle_stdlib_connection(app: IRHTTPApp, reader, writer, max_body: int = 1_048_576):
+    """Connexion HTTP/1.1 keep-alive (fallback sans FastAPI)"""
+    peer = writer.get_extra_info("peername")
+    client_id = peer[0] if peer else "anonymous"
+    
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                break
+            
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+            
+            keep_alive = (
+                headers.get("connection", "").lower() != "close"
+                and version.upper() == "HTTP/1.1"
+            )
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+            except ValueError:
+                length = -1
+            
+            if length < 0:
+                # Corps impossible à délimiter: réponse puis fermeture
+                status, payload = 400, {"success": False, "error": "Invalid Content-Length header"}
+                keep_alive = False
+            elif length > max_body:
+                status, payload = 413, {"success": False, "error": "Payload too large"}
+                keep_alive = False
+            else:
+                raw_body = await reader.readexactly(length) if length else b""
+                url = urlsplit(target)
+                try:
+                    body = json.loads(raw_body) if raw_body else None
+                except ValueError:
+                    status, payload = 400, {"success": False, "error": "Invalid JSON body"}
+                else:
+                    if body is not None and not isinstance(body, dict):
+                        status, payload = 400, {"success": False, "error": "JSON body must be an object"}
+                    else:
+                        status, payload = await app.handle(
+                            method.upper(), url.path, dict(parse_qsl(url.query)), body, client_id
+                        )
+            
+            if hasattr(payload, "__aiter__"):
+                await _write_ndjson_stream(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+                continue
+            
+            if isinstance(payload, str):
+                data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                data, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+            writer.write(
+                (
+                    f"HTTP/1.1 {status} {_HTTP_REASONS.get(status, 'OK')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                ).encode("latin-1") + data
+            )
+            await writer.drain()
+            
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_stdlib_server(app: IRHTTPApp, host: str, port: int):
+    """Démarre serveur asyncio stdlib, retourne asyncio.Server"""
+    return await asyncio.start_server(
+        lambda reader, writer: _handle_stdlib_connection(app, reader, writer),
+        host,
+        port,
+        backlog=1024
+    )
+
+
+def build_fastapi_app(app: IRHTTPApp):
+    """Adapte IRHTTPApp en application FastAPI (extra [server])"""
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+    
+    fastapi_app = FastAPI(title="IR Engine", version="3.0")
+    
+    @fastapi_app.api_route("/{path:path}", methods=["GET", "POST", "DELETE"])
+    async def dispatch(request: Request):
+        raw_body = await request.body()
+        try:
+            body = json.loads(raw_body) if raw_body else None
+        except ValueError:
+            return JSONResponse({"success": False, "error": "Invalid JSON body"}, status_code=400)
+        if body is not None and not isinstance(body, dict):
+            return JSONResponse({"success": False, "error": "JSON body must be an object"}, status_code=400)
+        
+        status, payload = await app.handle(
+            request.method,
+            request.url.path,
+            dict(request.query_params),
+            body,
+            request.client.host if request.client else "anonymous"
+        )
+        if hasattr(payload, "__aiter__"):
+            async def ndjson():
+                async for event in payload:
+                    yield json.dumps(event, ensure_ascii=False) + "\n"
+            return StreamingResponse(ndjson(), status_code=status, media_type="application/x-ndjson")
+        if isinstance(payload, str):
+            return PlainTextResponse(payload, status_code=status, media_type="text/plain; version=0.0.4")
+        return JSONResponse(payload, status_code=status)
+    
+    return fastapi_app
+
+
+# --------------------------------------------
+# Sharding multi-process (mondes répartis par crc32(world_id))
+# --------------------------------------------
+
+def _encode_frame(message: Dict[str, Any]) -> bytes:
+    """Trame front ↔ worker: longueur (4 octets big-endian) + JSON UTF-8"""
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    return len(data).to_bytes(4, "big") + data
+
+
+async def _read_frame(reader) -> Optional[Dict[str, Any]]:
+    """Trame suivante, None si connexion fermée"""
+    try:
+        header = await reader.readexactly(4)
+        return json.loads(await reader.readexactly(int.from_bytes(header, "big")))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+async def _serve_shard_request(app: IRHTTPApp, message: Dict[str, Any], send):
+    """Exécute une requête relayée et renvoie réponse (ou flux d'événements) au front"""
+    request_id = message["id"]
+    status, payload = await app.handle(
+        message["method"], message["path"], message["query"], message["body"], message["client_id"]
+    )
+    if hasattr(payload, "__aiter__"):
+        await send({"id": request_id, "status": status, "stream": True})
+        try:
+            async for event in payload:
+                await send({"id": request_id, "event": event})
+        except Exception as e:
+            logger.error(f"Shard stream error on {message['path']}: {str(e)}")
+        await send({"id": request_id, "end": True})
+    elif isinstance(payload, str):
+        await send({"id": request_id, "status": status, "text": payload})
+    else:
+        await send({"id": request_id, "status": status, "payload": payload})
+
+
+async def _run_shard_worker(index: int, count: int, provider_spec: Optional[str], port_conn):
+    api = IRAPI(shard=(index, count))
+    provider = create_provider(provider_spec) if provider_spec else None
+    app = IRHTTPApp(api, provider)
+    stop = asyncio.Event()
+    
+    async def serve_front(reader, writer):
+        write_lock = asyncio.Lock()
+        tasks = set()
+        
+        async def send(message):
+            async with write_lock:
+                writer.write(_encode_frame(message))
+                await writer.drain()
+        
+        while True:
+            message = await _read_frame(reader)
+            if message is None or message.get("op") == "shutdown":
+                break
+            task = asyncio.ensure_future(_serve_shard_request(app, message, send))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+        stop.set()
+    
+    server = await asyncio.start_server(serve_front, "127.0.0.1", 0)
+    await app.startup()
+    port_conn.send(server.sockets[0].getsockname()[1])
+    port_conn.close()
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+        await app.shutdown()
+        if provider is not None:
+            await provider.aclose()
+
+
+def _shard_worker_main(
+    index: int,
+    count: int,
+    provider_spec: Optional[str],
+    port_conn,
+    log_setup: Tuple[bool, int] = (True, logging.NOTSET)
+):
+    """
+    Point d'entrée process worker: IRAPI propre aux mondes du shard
+    log_setup: (configurer logging racine comme le parent, niveau logger IR-Engine du parent)
+    """
+    import signal
+    
+    # Ctrl-C reçu par tout le groupe de process: l'arrêt est piloté par le front
+    # (trame shutdown → requêtes en cours terminées, journaux et audit vidés)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    configure, level = log_setup
+    if configure:
+        configure_logging()
+    logger.setLevel(level)
+    # Fichier d'audit par process (rotation non partagée)
+    audit_path = CONFIG["audit"]["path"]
+    if audit_path:
+        path = Path(audit_path)
+        CONFIG["audit"]["path"] = str(path.with_name(f"{path.stem}.shard{index}{path.suffix}"))
+    asyncio.run(_run_shard_worker(index, count, provider_spec, port_conn))
+
+
+class _ShardClient:
+    """Connexion front → worker: requêtes multiplexées par id, réponses routées par tâche lectrice"""
+    
+    def __init__(self, index: int, process, reader, writer):
+        self.index = index
+        self.process = process
+        self._reader = reader
+        self._writer = writer
+        self._write_lock = asyncio.Lock()
+        self._pending: Dict[int, Any] = {}
+        self._next_id = 0
+        self.alive = True
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+    
+    async def _read_loop(self):
+        while True:
+            message = await _read_frame(self._reader)
+            if message is None:
+                break
+            queue_ = self._pending.get(message["id"])
+            if queue_ is not None:
+                queue_.put_nowait(message)
+        
+        # Worker perdu: requêtes en attente terminées en erreur
+        self.alive = False
+        for queue_ in self._pending.values():
+            queue_.put_nowait(None)
+    
+    async def send(self, message: Dict[str, Any]):
+        async with self._write_lock:
+            self._writer.write(_encode_frame(message))
+            await self._writer.drain()
+    
+    async def request(self, method: str, path: str, query: Dict, body: Optional[Dict], client_id: str):
+        """→ (status, payload dict | str | itérateur async d'événements)"""
+        if not self.alive:
+            return 503, {"success": False, "error": f"Shard {self.index} unavailable"}
+        self._next_id += 1
+        request_id = self._next_id
+        queue_ = asyncio.Queue()
+        self._pending[request_id] = queue_
+        try:
+            await self.send({
+                "id": request_id, "method": method, "path": path,
+                "query": query, "body": body, "client_id": client_id
+            })
+            message = await queue_.get()
+        except BaseException:
+            self._pending.pop(request_id, None)
+            raise
+        
+        if message is None:
+            self._pending.pop(request_id, None)
+            return 503, {"success": False, "error": f"Shard {self.index} unavailable"}
+        if not message.get("stream"):
+            self._pending.pop(request_id, None)
+            return message["status"], message["text"] if "text" in message else message["payload"]
+        return message["status"], self._stream(request_id, queue_)
+    
+    async def _stream(self, request_id: int, queue_):
+        try:
+            while True:
+                message = await queue_.get()
+                if message is None or message.get("end"):
+                    return
+                yield message["event"]
+        finally:
+            self._pending.pop(request_id, None)
+    
+    async def close(self, timeout: float = 10.0):
+        """Arrêt propre du worker (requêtes en cours terminées), sinon terminate"""
+        if self.alive:
+            try:
+                await self.send({"op": "shutdown"})
+            except ConnectionError:
+                pass
+        await asyncio.get_running_loop().run_in_executor(None, self.process.join, timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self._writer.close()
+        await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+class ShardedHTTPApp:
+    """
+    Front-end async multi-process: N workers (process) possédant chacun les
+    mondes dont shard_for(world_id) == index, avec leur IRAPI/IRHTTPApp
+    - Routes monde relayées au shard propriétaire (socket loopback, trames JSON)
+    - Création répartie en round-robin (le worker tire un id qui lui appartient)
+    - /health, /metrics, /worlds agrégés sur tous les shards
+    Rendu contexte, nettoyage, scoring et audit s'exécutent dans les workers:
+    le débit CPU évolue avec le nombre de cœurs. Même interface que IRHTTPApp
+    (handle/startup/shutdown). Rate limit et audit appliqués par shard.
+    """
+    
+    API_PREFIX = IRHTTPApp.API_PREFIX
+    
+    def __init__(self, workers: int, provider_spec: Optional[str] = None, start_method: str = "spawn"):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.workers = workers
+        self.provider_spec = provider_spec
+        self.start_method = start_method
+        self.shards: List[_ShardClient] = []
+        self._round_robin = 0
+        prefix = re.escape(self.API_PREFIX)
+        self._world_route = re.compile(rf"^{prefix}/world/(?P<world_id>[\w-]+)(?:/|$)")
+        self._create_path = f"{self.API_PREFIX}/world/create"
+        self._list_path = f"{self.API_PREFIX}/worlds"
+    
+    async def startup(self):
+        """Lance les workers et attend qu'ils écoutent (mondes persistés restaurés)"""
+        import multiprocessing
+        
+        context = multiprocessing.get_context(self.start_method)
+        loop = asyncio.get_running_loop()
+        # Workers: même configuration logging que le process parent
+        log_setup = (bool(logging.getLogger().handlers), logger.level)
+        pending = []
+        for index in range(self.workers):
+            parent_conn, child_conn = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_shard_worker_main,
+                args=(index, self.workers, self.provider_spec, child_conn, log_setup),
+                name=f"ir-shard-{index}",
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+            pending.append((index, process, parent_conn))
+        
+        for index, process, parent_conn in pending:
+            try:
+                port = await loop.run_in_executor(None, parent_conn.recv)
+            except EOFError:
+                await self.shutdown()
+                for _, other, _ in pending:
+                    if other.is_alive():
+                        other.terminate()
+                raise RuntimeError(f"Shard worker {index} failed to start (exit code {process.exitcode})")
+            parent_conn.close()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            self.shards.append(_ShardClient(index, process, reader, writer))
+        logger.info(f"Sharded runtime started: {self.workers} workers")
+    
+    async def shutdown(self):
+        """Arrête les workers (journaux, audit vidés côté worker)"""
+        await asyncio.gather(*(shard.close() for shard in self.shards), return_exceptions=True)
+        self.shards = []
+        SecurityGateway.close_audit_writer()
+    
+    async def handle(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, str],
+        body: Optional[Dict],
+        client_id: str = "anonymous"
+    ) -> Tuple[int, Any]:
+        """Relaie la requête au shard propriétaire (ou agrège sur tous)"""
+        if method == "POST" and path == self._create_path:
+            self._round_robin = (self._round_robin + 1) % self.workers
+            return await self.shards[self._round_robin].request(method, path, query, body, client_id)
+        
+        match = self._world_route.match(path)
+        if match:
+            shard = self.shards[shard_for(match.group("world_id"), self.workers)]
+            return await shard.request(method, path, query, body, client_id)
+        
+        if method == "GET" and path in ("/health", "/metrics", self._list_path):
+            return await self._aggregate(path, client_id)
+        return await self.shards[0].request(method, path, query, body, client_id)
+    
+    async def _aggregate(self, path: str, client_id: str) -> Tuple[int, Any]:
+        responses = await asyncio.gather(*(
+            shard.request("GET", path, {}, None, client_id) for shard in self.shards
+        ))
+        
+        if path == "/metrics":
+            return 200, MetricsRegistry.merge_expositions({
+                str(shard.index): payload
+                for shard, (status, payload) in zip(self.shards, responses) if status == 200
+            })
+        
+        if path == self._list_path:
+            worlds = [world for status, payload in responses if status == 200 for world in payload["worlds"]]
+            return 200, {"success": True, "count": len(worlds), "worlds": worlds}
+        
+        totals: Dict[str, Any] = {}
+        for status, payload in responses:
+            for key, value in (payload.get("worlds") or {}).items() if status == 200 else ():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    totals[key] = totals.get(key, 0) + value
+        lookups = totals.get("hits", 0) + totals.get("misses", 0)
+        totals["hit_rate"] = round(totals.get("hits", 0) / lookups, 4) if lookups else 0.0
+        healthy = all(status == 200 for status, _ in responses)
+        return (200 if healthy else 503), {
+            "status": "healthy" if healthy else "degraded",
+            "workers": self.workers,
+            "shards": {str(shard.index): payload for shard, (_, payload) in zip(self.shards, responses)},
+            "worlds": totals,
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+async def serve(app: IRHTTPApp, host: str, port: int, backend: str = "auto"):
+    """Lance serveur HTTP (FastAPI/uvicorn si dispo, sinon stdlib); app: IRHTTPApp ou ShardedHTTPApp"""
+    if backend in ("auto", "fastapi"):
+        try:
+            import uvicorn
+            fastapi_app = build_fastapi_app(app)
+        except ImportError:
+            if backend == "fastapi":
+                raise
+            logger.info("fastapi/uvicorn not installed - using stdlib asyncio server")
+        else:
+            logger.info(f"IR server (uvicorn) listening on {host}:{port}")
+            config = uvicorn.Config(fastapi_app, host=host, port=port, log_level="warning")
+            await app.startup()
+            try:
+                await uvicorn.Server(config).serve()
+            finally:
+                await app.shutdown()
+            return
+    
+    server = await start_stdlib_server(app, host, port)
+    logger.info(f"IR server (stdlib) listening on {host}:{port}")
+    await app.startup()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await app.shutdown()
+
+
 async def main():
     """Point d'entrée principal"""
     import argparse
     
     parser = argparse.ArgumentParser(description="IR Engine")
-    parser.add_argument("--mode", choices=["server", "cli", "test"], default="cli")
+    parser.add_argument("--mode", choices=["server", "cli", "test", "replay"], default="cli")
+    parser.add_argument("--host", default=CONFIG["server"]["host"])
     parser.add_argument("--port", type=int, default=CONFIG["server"]["port"])
+    parser.add_argument("--backend", choices=["auto", "fastapi", "stdlib"], default="auto")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=CONFIG["server"]["workers"],
+        help="Process workers (mondes répartis par world_id), 1 = mono-process"
+    )
+    parser.add_argument(
+        "--provider",
+        default=None,
+        help="Provider modèle du serveur: groq, openai, fake[:latency_ms=200,...]"
+    )
+    parser.add_argument("--session", default=None, help="Session JSON exportée (--mode replay)")
     
     args = parser.parse_args()
+    configure_logging()
+    
+    if args.mode == "server" and args.workers > 1:
+        logger.info(f"Starting IR server ({args.workers} workers)...")
+        await serve(ShardedHTTPApp(args.workers, args.provider), args.host, args.port, args.backend)
+        return
     
     api = IRAPI()
     
     if args.mode == "server":
         logger.info("Starting IR server...")
-        # TODO: Implémenter serveur HTTP (FastAPI, Flask, etc.)
-        print(f"Server mode not yet implemented. Use --mode cli or --mode test")
+        provider = create_provider(args.provider) if args.provider else None
+        try:
+            await serve(IRHTTPApp(api, provider), args.host, args.port, args.backend)
+        finally:
+            if provider is not None:
+                await provider.aclose()
     
     elif args.mode == "cli":
         logger.info("IR Engine ready - CLI mode")
         health = api.get_health()
         print(json.dumps(health, indent=2))
     
+    elif args.mode == "replay":
+        if not args.session:
+            parser.error("--mode replay requires --session")
+        report = await SessionReplayer.load(args.session).run()
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        if not report["identical"]:
+            sys.exit(1)
+    
     elif args.mode == "test":
+        # Scénario hors ligne (FakeProvider par défaut, --provider sinon): pipeline complet de bout en bout
         logger.info("Running test scenario...")
-        # TODO: Charger et exécuter scénario test
-        print("Test mode - load test scenario from tests/")
+        provider = create_provider(args.provider or "fake")
+        agents = [
+            AgentConfig(name="ALPHA-7", model="fake", role="Android", specialty="Diagnostic"),
+            AgentConfig(name="BETA-3", model="fake", role="Android", specialty="Énergie")
+        ]
+        world = api.create_world(name="Station de test", agents=agents)
+        try:
+            result = await api.execute_scenario({
+                "world_id": world.world_id,
+                "agents": agents,
+                "tasks": [
+                    {"agent": "ALPHA-7", "task": "Analysez le terminal nord."},
+                    {"agent": "BETA-3", "task": "Vérifiez l'alimentation secondaire."},
+                    {"agent": "ALPHA-7", "task": "Proposez une action corrective."}
+                ],
+                "model_client": provider
+            })
+        finally:
+            await provider.aclose()
+        print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+        if not result.get("success"):
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark cache de rendu RealityEngineV3.get_hierarchical_context
+
+Compare pour 10, 100 et 1000 agents :
+- cold : toutes sections invalidées avant chaque rendu
+- warm : monde inchangé depuis le dernier rendu
+- turn : update_world puis rendu (seuls historique/comms re-rendus)
+
+Usage:
+    python benchmarks/bench_context_cache.py [--events 500] [--repeat 200]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import AgentConfig, RealityEngineV3  # noqa: E402
+
+
+def build_engine(agents: int, events: int) -> RealityEngineV3:
+    engine = RealityEngineV3()
+    for i in range(agents):
+        engine.register_agent(AgentConfig(
+            name=f"AGENT-{i:04d}",
+            model="fake",
+            role="Android",
+            specialty=f"Spécialité {i % 7}",
+            position=f"Terminal {i % 12}"
+        ))
+    for i in range(events):
+        engine.update_world(f"AGENT-{i % agents:04d}", f"Action {i} en cours", "Réponse")
+    return engine
+
+
+def time_per_call(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench(agents: int, events: int, repeat: int) -> dict:
+    engine = build_engine(agents, events)
+    agent = "AGENT-0000"
+
+    def cold():
+        engine.invalidate()
+        engine._identity_cache.clear()
+        engine.get_hierarchical_context(agent)
+
+    turn_counter = [0]
+
+    def turn():
+        turn_counter[0] += 1
+        engine.update_world(agent, f"Tour {turn_counter[0]}", "Réponse")
+        engine.get_hierarchical_context(agent)
+
+    return {
+        "agents": agents,
+        "events": events,
+        "cold_us": round(time_per_call(cold, repeat), 1),
+        "warm_us": round(time_per_call(lambda: engine.get_hierarchical_context(agent), repeat), 1),
+        "turn_us": round(time_per_call(turn, repeat), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Context render cache benchmark")
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    results = [bench(n, args.events, args.repeat) for n in (10, 100, 1000)]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
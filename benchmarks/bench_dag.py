@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark ordonnancement DAG des scénarios (depends_on) vs exécution séquentielle
+
+Scénario synthétique : T tâches réparties sur A agents, chaque tâche dépend
+d'au plus --deps tâches tirées parmi les --window précédentes (type « Observez
+votre collègue X »), FakeProvider à latence fixe. Rapport par mode :
+- temps mur, temps cumulé des tâches
+- chemin critique (nombre de tâches et durée mesurée) : borne basse du mode dag
+- speedup dag vs séquentiel
+
+Usage:
+    python benchmarks/bench_dag.py [--tasks 200] [--agents 20] [--deps 2] [--window 10] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import CONFIG, IRAPI, AgentConfig, FakeProvider, TaskGraph  # noqa: E402
+
+
+def build_tasks(args) -> list:
+    rng = random.Random(args.seed)
+    tasks = []
+    for i in range(args.tasks):
+        candidates = list(range(max(0, i - args.window), i))
+        depends = rng.sample(candidates, min(len(candidates), rng.randint(0, args.deps)))
+        agent = f"AGENT-{rng.randrange(args.agents):03d}"
+        tasks.append({
+            "id": f"t{i}",
+            "agent": agent,
+            "task": f"Tour {i}: observez vos collègues " + ", ".join(tasks[d]["agent"] for d in depends),
+            "depends_on": [f"t{d}" for d in depends],
+        })
+    return tasks
+
+
+async def run_mode(api: IRAPI, args, tasks: list, mode: str) -> dict:
+    agents = [
+        AgentConfig(name=f"AGENT-{i:03d}", model="fake", role="Android", specialty=f"Spécialité {i % 7}")
+        for i in range(args.agents)
+    ]
+    world = api.create_world(name=f"DAG {mode}", agents=agents)
+    provider = FakeProvider(latency_ms=args.latency_ms, max_concurrency=args.max_concurrency)
+
+    start = time.perf_counter()
+    outcome = await api.execute_scenario({
+        "world_id": world.world_id,
+        "agents": agents,
+        "tasks": tasks,
+        "model_client": provider,
+        "mode": mode,
+        "max_concurrency": args.max_concurrency,
+    })
+    wall = time.perf_counter() - start
+    await provider.aclose()
+    api.delete_world(world.world_id)
+
+    report = {
+        "wall_s": round(wall, 3),
+        "errors": sum(1 for result in outcome["results"] if not result["success"]),
+    }
+    if "schedule" in outcome:
+        report["busy_s"] = outcome["schedule"]["busy_s"]
+        report["critical_path_s"] = outcome["schedule"]["critical_path"]["duration_s"]
+    return report
+
+
+async def run(args) -> dict:
+    tasks = build_tasks(args)
+    path, length = TaskGraph(tasks).critical_path()
+    api = IRAPI()
+
+    sequential = await run_mode(api, args, tasks, "sequential")
+    dag = await run_mode(api, args, tasks, "dag")
+    return {
+        "tasks": args.tasks,
+        "agents": args.agents,
+        "latency_ms": args.latency_ms,
+        "max_concurrency": args.max_concurrency,
+        "critical_path_tasks": int(length),
+        "ideal_wall_s": round(length * args.latency_ms / 1000, 3),
+        "sequential": sequential,
+        "dag": dag,
+        "speedup": round(sequential["wall_s"] / dag["wall_s"], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scenario DAG scheduler benchmark")
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--deps", type=int, default=2, help="Dépendances explicites max par tâche")
+    parser.add_argument("--window", type=int, default=10, help="Dépendances tirées parmi les N tâches précédentes")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    CONFIG["security"]["rate_limit"] = 10 ** 9
+    CONFIG["audit"]["path"] = ""
+    CONFIG["history"]["spill_dir"] = None
+    logging.getLogger("IR-Engine").setLevel(logging.WARNING)
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark contexte delta (context_mode="delta") vs réinjection complète
+
+Scénario séquentiel : A agents jouent T tours à tour de rôle, un indice ajouté
+tous les --clue-every tours, un agent déplacé tous les --move-every tours.
+FakeProvider à latence fixe + prefill proportionnel au prompt (--prefill-ms
+par 1k tokens, ordre de grandeur d'un modèle hébergé). Rapport par mode :
+- tokens de prompt par tour (moyenne, p50, max ; estimation TokenEstimator)
+- latence par tour (rendu contexte + appel simulé + update monde), p50 / p99
+- part des contextes complets (premier tour de chaque agent, refresh tous les K)
+- économies du mode delta (tokens, latence)
+
+Usage:
+    python benchmarks/bench_delta.py [--agents 20] [--turns 400] [--refresh 10] [--prefill-ms 40]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import CONFIG, IRAPI, AgentConfig, FakeProvider, TokenEstimator  # noqa: E402
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+async def run_mode(args, mode: str) -> dict:
+    api = IRAPI()
+    agents = [
+        AgentConfig(name=f"AGENT-{i:03d}", model="fake", role="Android", specialty=f"Spécialité {i % 7}")
+        for i in range(args.agents)
+    ]
+    world = api.create_world(name=f"Delta {mode}", agents=agents)
+    world.context_mode = mode
+    engine = world.reality_engine
+
+    estimator = TokenEstimator()
+    prompt_tokens = []
+    full_contexts = 0
+
+    def respond(system: str, prompt: str, model: str) -> str:
+        nonlocal full_contexts
+        prompt_tokens.append(estimator.estimate(system) + estimator.estimate(prompt))
+        full_contexts += "MISE À JOUR DEPUIS VOTRE DERNIER TOUR" not in prompt
+        return f"J'analyse le relais {len(prompt_tokens)} et je suppose une dérive d'horloge du module nord."
+
+    provider = FakeProvider(latency_ms=args.latency_ms, prefill_ms_per_1k=args.prefill_ms, response=respond)
+    latencies = []
+    start = time.perf_counter()
+    for turn in range(args.turns):
+        if turn and turn % args.clue_every == 0:
+            engine.world_state.knowledge["clues"].append(f"Indice {turn}: relais {turn % 9} instable")
+            engine.invalidate("knowledge")
+        if turn and turn % args.move_every == 0:
+            engine.move_agent(agents[turn % args.agents].name, f"Secteur {turn % 5}")
+        agent = agents[turn % args.agents]
+        turn_start = time.perf_counter()
+        result = await world.execute_agent_action(agent.name, f"Tour {turn}: analysez la situation.", provider, agent)
+        latencies.append((time.perf_counter() - turn_start) * 1000)
+        assert result["success"], result
+    wall = time.perf_counter() - start
+    await provider.aclose()
+    api.delete_world(world.world_id)
+
+    return {
+        "wall_s": round(wall, 3),
+        "prompt_tokens": {
+            "mean": round(statistics.mean(prompt_tokens)),
+            "p50": round(percentile(prompt_tokens, 0.5)),
+            "max": max(prompt_tokens),
+            "total": sum(prompt_tokens),
+        },
+        "turn_ms": {"p50": round(percentile(latencies, 0.5), 2), "p99": round(percentile(latencies, 0.99), 2)},
+        "full_contexts": full_contexts,
+    }
+
+
+async def run(args) -> dict:
+    CONFIG["orchestrator"]["context_refresh"] = args.refresh
+    full = await run_mode(args, "full")
+    delta = await run_mode(args, "delta")
+    return {
+        "agents": args.agents,
+        "turns": args.turns,
+        "refresh_every": args.refresh,
+        "latency_ms": args.latency_ms,
+        "prefill_ms_per_1k": args.prefill_ms,
+        "full": full,
+        "delta": delta,
+        "token_savings": round(1 - delta["prompt_tokens"]["total"] / full["prompt_tokens"]["total"], 3),
+        "latency_savings_p50": round(1 - delta["turn_ms"]["p50"] / full["turn_ms"]["p50"], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta context benchmark")
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=400)
+    parser.add_argument("--refresh", type=int, default=10, help="Contexte complet forcé tous les K tours d'un agent")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--prefill-ms", type=float, default=40.0, help="Latence simulée par 1k tokens de prompt")
+    parser.add_argument("--clue-every", type=int, default=25)
+    parser.add_argument("--move-every", type=int, default=15)
+    args = parser.parse_args()
+
+    CONFIG["security"]["rate_limit"] = 10 ** 9
+    CONFIG["audit"]["path"] = ""
+    CONFIG["history"]["spill_dir"] = None
+    logging.getLogger("IR-Engine").setLevel(logging.WARNING)
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
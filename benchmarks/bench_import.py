@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark temps d'import de app.py (démarrage à froid : workers prefork, serverless, tests)
+
+Lance --runs interpréteurs `python -X importtime -c "import app"` depuis un
+répertoire temporaire vide et rapporte :
+- temps cumulé d'import de app (µs, médiane / min), bytecode déjà compilé
+- modules les plus coûteux importés à cette occasion (temps cumulé, premier run)
+- fichiers créés dans le répertoire courant (doit rester vide : import sans effet de bord)
+Code retour 1 si la médiane dépasse --max-ms ou si l'import crée un fichier.
+
+Usage:
+    python benchmarks/bench_import.py [--runs 15] [--max-ms 120] [--top 10]
+"""
+
+import argparse
+import json
+import os
+import py_compile
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_importtime(stderr: str) -> list:
+    """[(module, self_us, cumulative_us, depth)] depuis la sortie -X importtime"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us), (len(name) - len(name.lstrip())) // 2))
+    return rows
+
+
+def import_once(cwd: str) -> list:
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="app.py import-time benchmark")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--top", type=int, default=10, help="Modules les plus coûteux listés")
+    parser.add_argument("--max-ms", type=float, default=None, help="Seuil régression (médiane, ms)")
+    args = parser.parse_args()
+
+    # Bytecode à jour : mesure l'exécution du module, pas la compilation du source
+    py_compile.compile(str(ROOT / "app.py"), doraise=True)
+
+    with tempfile.TemporaryDirectory(prefix="ir-import-") as cwd:
+        runs = [import_once(cwd) for _ in range(args.runs)]
+        created = sorted(os.listdir(cwd))
+
+    totals = [next(cumulative for name, _, cumulative, _ in rows if name == "app") for rows in runs]
+    app_depth = next(depth for name, _, _, depth in runs[0] if name == "app")
+    # Modules importés par app = bloc de lignes plus indentées juste avant la ligne app
+    app_index = next(i for i, row in enumerate(runs[0]) if row[0] == "app")
+    start = app_index
+    while start > 0 and runs[0][start - 1][3] > app_depth:
+        start -= 1
+    children = [row for row in runs[0][start:app_index] if row[3] == app_depth + 1]
+    app_self = next(row[1] for row in runs[0] if row[0] == "app")
+
+    report = {
+        "runs": args.runs,
+        "import_app_ms": {
+            "median": round(statistics.median(totals) / 1000, 2),
+            "min": round(min(totals) / 1000, 2),
+            "max": round(max(totals) / 1000, 2),
+        },
+        "app_module_self_ms": round(app_self / 1000, 2),
+        "top_imports_ms": {
+            name: round(cumulative / 1000, 2)
+            for name, _, cumulative, _ in sorted(children, key=lambda row: -row[2])[:args.top]
+        },
+        "files_created": created,
+    }
+    print(json.dumps(report, indent=2))
+
+    failed = bool(created)
+    if args.max_ms is not None and report["import_app_ms"]["median"] > args.max_ms:
+        print(f"Import regression: {report['import_app_ms']['median']} ms > {args.max_ms} ms", file=sys.stderr)
+        failed = True
+    if created:
+        print(f"Import created files: {created}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
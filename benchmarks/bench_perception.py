@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark perception spatiale (SpatialGrid) vs équipe complète dans le contexte
+
+Monde de N agents à coordonnées aléatoires sur une carte --size x --size,
+--objects objets positionnés. Pour chaque N, contexte hiérarchique d'un
+échantillon d'agents, après déplacement de l'agent (cas d'un tour) :
+- "full" : perception désactivée, toute l'équipe dans chaque prompt
+- "perception" : agents et objets dans le rayon seulement (index spatial)
+Rapport : ms par contexte (déplacement compris), taille (caractères, tokens
+estimés), voisins perçus en moyenne, speedup et réduction de taille.
+
+Usage:
+    python benchmarks/bench_perception.py [--agents 100,1000,5000] [--radius 10] [--size 200] [--samples 200]
+"""
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import CONFIG, AgentConfig, RealityEngineV3, TokenEstimator  # noqa: E402
+
+
+def int_list(value: str):
+    return [int(item) for item in value.split(",") if item]
+
+
+def build_engine(args, agents: int) -> RealityEngineV3:
+    rng = random.Random(args.seed)
+    engine = RealityEngineV3(world_id=f"perception-{agents}")
+    engine.configure_world("Carte", [
+        {"id": f"OBJ-{i}", "type": "balise", "position": f"{rng.uniform(0, args.size):.1f},{rng.uniform(0, args.size):.1f}"}
+        for i in range(args.objects)
+    ])
+    for i in range(agents):
+        engine.register_agent(AgentConfig(
+            name=f"AGENT-{i:05d}", model="fake", role="Android", specialty=f"Spécialité {i % 7}",
+            position=f"{rng.uniform(0, args.size):.1f},{rng.uniform(0, args.size):.1f}"
+        ))
+    return engine
+
+
+def run_mode(args, agents: int, radius: float) -> dict:
+    CONFIG["perception"]["radius"] = radius
+    engine = build_engine(args, agents)
+    rng = random.Random(args.seed + 1)
+    names = list(engine.world_state.agents)
+    estimator = TokenEstimator()
+
+    engine.get_hierarchical_context(names[0])  # fragments partagés en cache
+    timings, sizes, tokens, neighbours = [], [], [], []
+    for _ in range(args.samples):
+        name = rng.choice(names)
+        position = f"{rng.uniform(0, args.size):.1f},{rng.uniform(0, args.size):.1f}"
+        start = time.perf_counter()
+        engine.move_agent(name, position)
+        context = engine.get_hierarchical_context(name)
+        timings.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(context))
+        tokens.append(estimator.estimate(context))
+        neighbours.append(context.count("\n  • "))
+    return {
+        "context_ms": {"median": round(statistics.median(timings), 4), "max": round(max(timings), 4)},
+        "context_chars": round(statistics.mean(sizes)),
+        "context_tokens": round(statistics.mean(tokens)),
+        "agents_in_context": round(statistics.mean(neighbours), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spatial perception culling benchmark")
+    parser.add_argument("--agents", type=int_list, default=[100, 1000, 5000])
+    parser.add_argument("--objects", type=int, default=500)
+    parser.add_argument("--radius", type=float, default=10.0)
+    parser.add_argument("--size", type=float, default=200.0, help="Côté de la carte (unités)")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    CONFIG["history"]["spill_dir"] = None
+    logging.getLogger("IR-Engine").setLevel(logging.WARNING)
+
+    results = {}
+    for agents in args.agents:
+        full = run_mode(args, agents, 0)
+        perception = run_mode(args, agents, args.radius)
+        results[f"agents_{agents}"] = {
+            "full": full,
+            "perception": perception,
+            "speedup": round(full["context_ms"]["median"] / perception["context_ms"]["median"], 1),
+            "size_reduction": round(full["context_chars"] / perception["context_chars"], 1),
+        }
+        print(f"agents={agents:<6} x{results[f'agents_{agents}']['speedup']}", file=sys.stderr)
+
+    print(json.dumps({"radius": args.radius, "size": args.size, "objects": args.objects, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
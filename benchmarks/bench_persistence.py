@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark persistance event-sourced (WorldJournal : WAL + snapshots)
+
+Mesure :
+- coût d'un update_world journalisé (µs) : sans persistance, fsync groupé
+  (fsync_batch) et fsync à chaque record (fsync_batch=1)
+- temps de restauration de N mondes (snapshot + queue WAL) via IRAPI.restore_worlds
+
+Usage:
+    python benchmarks/bench_persistence.py [--worlds 1000] [--agents 10] [--events 300] [--dir /tmp/ir-bench]
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import CONFIG, IRAPI, AgentConfig, Orchestrator  # noqa: E402
+
+
+def agent_configs(count: int):
+    return [
+        AgentConfig(name=f"AGENT-{i:03d}", model="fake", role="Android", specialty=f"Spécialité {i % 7}")
+        for i in range(count)
+    ]
+
+
+def bench_append(directory: Path, mode: str, updates: int) -> float:
+    """µs par update_world selon mode de persistance"""
+    world = Orchestrator(world_id=f"append-{mode}")
+    if mode != "none":
+        CONFIG["persistence"]["fsync_batch"] = 1 if mode == "fsync_each" else 64
+        world.enable_persistence(directory / world.world_id)
+    engine = world.reality_engine
+    engine.register_agent(agent_configs(1)[0])
+
+    start = time.perf_counter()
+    for i in range(updates):
+        engine.update_world("AGENT-000", f"Action {i} sur le terminal nord", "Je suppose une dérive")
+    elapsed = time.perf_counter() - start
+    world.close_journal()
+    return round(elapsed / updates * 1e6, 3)
+
+
+def bench_restore(directory: Path, worlds: int, agents: int, events: int) -> dict:
+    CONFIG["persistence"]["dir"] = str(directory)
+    api = IRAPI()
+    api.worlds.max_worlds = max(api.worlds.max_worlds, worlds)
+    api.worlds.max_bytes = 1 << 40
+    configs = agent_configs(agents)
+
+    start = time.perf_counter()
+    for w in range(worlds):
+        world = api.create_world(name=f"Monde {w}", agents=configs)
+        for i in range(events):
+            world.reality_engine.update_world(configs[i % agents].name, f"Action {i}", "Réponse")
+    populate = time.perf_counter() - start
+    api.close_worlds()
+
+    fresh = IRAPI()
+    fresh.worlds.max_worlds = api.worlds.max_worlds
+    fresh.worlds.max_bytes = api.worlds.max_bytes
+    start = time.perf_counter()
+    restored = fresh.restore_worlds()
+    restore = time.perf_counter() - start
+
+    disk = sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())
+    return {
+        "worlds": worlds,
+        "restored": restored,
+        "events_per_world": events,
+        "populate_s": round(populate, 3),
+        "restore_s": round(restore, 3),
+        "restore_ms_per_world": round(restore / max(1, restored) * 1000, 3),
+        "disk_bytes_per_world": disk // max(1, worlds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark world persistence (WAL + snapshots)")
+    parser.add_argument("--worlds", type=int, default=1000)
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--events", type=int, default=300, help="update_world par monde avant restauration")
+    parser.add_argument("--updates", type=int, default=5000, help="Appels pour la mesure d'append")
+    parser.add_argument("--dir", default=None, help="Répertoire de données (défaut: temporaire)")
+    args = parser.parse_args()
+
+    CONFIG["security"]["rate_limit"] = 10 ** 9
+    CONFIG["history"]["spill_dir"] = None
+    logging.getLogger("IR-Engine").setLevel(logging.WARNING)
+
+    root = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="ir-persist-"))
+    try:
+        append = {
+            mode: bench_append(root / "append", mode, args.updates)
+            for mode in ("none", "fsync_batched", "fsync_each")
+        }
+        CONFIG["persistence"]["fsync_batch"] = 64
+        restore = bench_restore(root / "worlds", args.worlds, args.agents, args.events)
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(json.dumps({"append_us": append, "restore": restore}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
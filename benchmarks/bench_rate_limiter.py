@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark rate limiter SecurityGateway (TokenBucketLimiter)
+
+Mesure le coût par vérification avec 1k, 100k puis 1M clients distincts :
+- new  : premier passage (insertion, éviction LRU au-delà du plafond)
+- hot  : clients déjà suivis (recharge + consommation)
+Plafond max_clients fixe : la mémoire reste bornée quel que soit N.
+Option --threads : même charge répartie sur plusieurs threads (verrous striés).
+
+Usage:
+    python benchmarks/bench_rate_limiter.py [--max-clients 100000] [--threads 4]
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import TokenBucketLimiter  # noqa: E402
+
+CLIENTS = (1_000, 100_000, 1_000_000)
+
+
+def time_checks(limiter: TokenBucketLimiter, client_ids, threads: int) -> float:
+    """Durée moyenne (ns) par acquire, clients répartis entre threads"""
+    chunks = [client_ids[i::threads] for i in range(threads)]
+
+    def work(chunk):
+        acquire = limiter.acquire
+        for client_id in chunk:
+            acquire(client_id)
+
+    workers = [threading.Thread(target=work, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / len(client_ids) * 1e9
+
+
+def bench(clients: int, max_clients: int, threads: int) -> dict:
+    limiter = TokenBucketLimiter(rate=100, window=60, max_clients=max_clients)
+    client_ids = [f"client-{i}" for i in range(clients)]
+    new_ns = time_checks(limiter, client_ids, threads)
+
+    # Clients chauds : les plus récents (encore suivis)
+    hot = client_ids[-min(clients, max_clients) // 2:] * 2
+    hot_ns = time_checks(limiter, hot, threads)
+
+    return {
+        "clients": clients,
+        "threads": threads,
+        "new_ns_per_check": round(new_ns, 1),
+        "hot_ns_per_check": round(hot_ns, 1),
+        "tracked_clients": len(limiter),
+        "evicted_cap": limiter.metrics["evicted_cap"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate limiter benchmark")
+    parser.add_argument("--max-clients", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    print(json.dumps([bench(n, args.max_clients, args.threads) for n in CLIENTS], indent=2))
+
+
+if __name__ == "__main__":
+    main()
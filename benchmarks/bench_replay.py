@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark rejeu déterministe de session (SessionReplayer)
+
+Enregistre une session (W agents, T tours, FakeProvider à réponses variées :
+artefacts de raisonnement, hypothèses, méta-références) ou charge une session
+exportée (GET /api/v1/world/{id}/session), puis la rejoue --repeat fois :
+- débit du rejeu (étapes/s) : charge CPU réaliste pour le profilage
+- identité pas à pas (réponses, immersion, événements, empreinte d'état)
+- auto-contrôle : une réponse altérée doit être détectée comme divergence
+Code retour 1 si le rejeu n'est pas identique ou si l'altération passe inaperçue.
+
+Usage:
+    python benchmarks/bench_replay.py [--agents 8] [--turns 2000] [--repeat 5] [--out session.json]
+    python benchmarks/bench_replay.py --session session.json
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import CONFIG, IRAPI, AgentConfig, FakeProvider, SessionReplayer  # noqa: E402
+
+RESPONSES = (
+    "J'observe la salle et mes collègues. Je poursuis l'analyse du module de synchronisation.",
+    "<think>Vérifier les journaux d'abord.</think>Je suppose une dérive d'horloge sur le terminal nord.",
+    "En tant qu'IA, je recommande de couper le relais. Je me dirige vers le panneau central.",
+    "Mon hypothèse : la boucle de rétroaction amplifie l'anomalie. Je relève les mesures.",
+)
+
+
+def varied_response(system: str, prompt: str, model: str) -> str:
+    return RESPONSES[len(prompt) % len(RESPONSES)]
+
+
+async def record_session(args) -> dict:
+    api = IRAPI()
+    agents = [
+        AgentConfig(name=f"AGENT-{i:03d}", model="fake", role="Android", specialty=f"Spécialité {i % 7}")
+        for i in range(args.agents)
+    ]
+    world = api.create_world(name="Replay Bench", agents=agents)
+    provider = FakeProvider(response=varied_response, seed=1)
+    tasks = [
+        {"agent": agents[i % args.agents].name, "task": f"Tour {i}: analysez la situation."}
+        for i in range(args.turns)
+    ]
+    await api.execute_scenario({
+        "world_id": world.world_id,
+        "agents": agents,
+        "tasks": tasks,
+        "model_client": provider,
+        "mode": args.mode
+    })
+    await provider.aclose()
+    # Aller-retour JSON : même forme qu'une session exportée par l'API
+    return json.loads(json.dumps(world.export_session(), ensure_ascii=False, default=str))
+
+
+async def run(args) -> dict:
+    if args.session:
+        with open(args.session, encoding="utf-8") as f:
+            session = json.load(f)
+        record_s = None
+    else:
+        start = time.perf_counter()
+        session = await record_session(args)
+        record_s = round(time.perf_counter() - start, 3)
+        if args.out:
+            Path(args.out).write_text(json.dumps(session, ensure_ascii=False), encoding="utf-8")
+
+    reports = [await SessionReplayer(session).run() for _ in range(args.repeat)]
+    rates = [report["steps_per_s"] for report in reports]
+    result = {
+        "steps": reports[0]["steps"],
+        "turns": reports[0]["turns"],
+        "record_s": record_s,
+        "replay_s": {"median": statistics.median(r["elapsed_s"] for r in reports)},
+        "replay_steps_per_s": {"median": statistics.median(rates), "max": max(rates)},
+        "identical": all(report["identical"] for report in reports),
+        "final_state_match": reports[0]["final_state_match"],
+        "divergences": reports[0]["divergences"][:5],
+    }
+
+    if args.self_check:
+        tampered = copy.deepcopy(session)
+        turns = [entry for entry in tampered["entries"] if "op" not in entry]
+        if turns:
+            turns[len(turns) // 2]["raw_response"] = "Je suppose que le signal vient d'ailleurs."
+            report = await SessionReplayer(tampered).run()
+            first = report["divergences"][0] if report["divergences"] else None
+            result["self_check"] = {"detected": not report["identical"], "first_divergence": first}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic session replay benchmark")
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--mode", choices=("simultaneous", "sequential"), default="sequential")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--session", default=None, help="Session exportée à rejouer (au lieu d'en enregistrer une)")
+    parser.add_argument("--out", default=None, help="Écrit la session enregistrée (JSON)")
+    parser.add_argument("--no-self-check", dest="self_check", action="store_false")
+    args = parser.parse_args()
+
+    # Session complète en mémoire (pas de fenêtre tronquée), sans quota ni fichiers
+    CONFIG["history"]["conversation_window"] = max(CONFIG["history"]["conversation_window"], args.turns + 4 * args.agents)
+    CONFIG["history"]["spill_dir"] = None
+    CONFIG["security"]["rate_limit"] = 10 ** 9
+    CONFIG["audit"]["path"] = ""
+    logging.getLogger("IR-Engine").setLevel(logging.WARNING)
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    failed = not result["identical"] or not result.get("self_check", {"detected": True})["detected"]
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark ResponseProcessor (clean_artifacts / validate_immersion)
+
+Compare l'implémentation compilée (automates combinés, un passage) à
+l'implémentation historique (re.sub non compilés + scan par mot) sur des
+réponses de 1KB à 100KB, avec les listes par défaut puis étendues à
+plusieurs centaines d'entrées multilingues synthétiques (dont des mots
+qui se chevauchent ou s'incluent). Vérifie à chaque taille que les ruptures
+détectées sont exactement celles du scan par mot.
+
+Usage:
+    python benchmarks/bench_response_processor.py [--repeat 20] [--extra-words 300] [--extra-meta 100]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import ResponseProcessor  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000)
+
+SENTENCES = [
+    "ALPHA-7 examine le terminal nord et relève une dérive temporelle.",
+    "Je suis un modèle de langage et je ne peux pas vraiment agir.",
+    "La synchronisation du module THETA reste instable depuis l'événement 3.",
+    "As an AI, I cannot physically touch the console.\n",
+    "<think>Analyse interne du contexte fourni</think>",
+    "BETA-3 propose de couper l'alimentation secondaire.",
+    "Soy un modelo de lenguaje y no puedo tocar la consola.",
+    "Als KI-Assistent bin ich nur ein Sprachmodell.",
+]
+
+
+def legacy_clean(text: str, model_name: str) -> str:
+    cleaned = text
+    if "deepseek" in model_name.lower():
+        cleaned = re.sub(r'<think>.*?</think>', '', cleaned, flags=re.DOTALL)
+    for pattern in ResponseProcessor.META_PATTERNS:
+        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'\n\s*\n\s*\n', '\n\n', cleaned)
+    return cleaned.strip()
+
+
+def legacy_validate(text: str, break_words) -> int:
+    text_lower = text.lower()
+    return sum(1 for word in break_words if word in text_lower)
+
+
+def make_text(size: int, rng: random.Random) -> str:
+    parts, length = [], 0
+    while length < size:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence + " ")
+        length += len(sentence) + 1
+    return "".join(parts)[:size]
+
+
+def synthetic_words(count: int, rng: random.Random):
+    stems = ["modelo de lenguaje", "sprachmodell", "modello linguistico", "ki-assistent",
+             "inteligencia artificial", "kunstmatige intelligentie", "simulação", "assistente ia"]
+    # Mots qui se chevauchent ou s'incluent (présents dans SENTENCES) : le
+    # scan doit tous les retrouver, comme le scan par mot historique
+    overlapping = ["modelo", "de lenguaje", "lenguaje", "ki-assistent", "assistent",
+                   "sprachmodell", "modell", "an ai", "ai"]
+    return overlapping + [f"{rng.choice(stems)} {i}" for i in range(count)]
+
+
+def synthetic_meta(count: int):
+    languages = ["Soy un modelo", "Ich bin ein Sprachmodell", "Sono un modello", "Ik ben een taalmodel"]
+    return [rf"{languages[i % len(languages)]} {i}.*?[\.\n]" for i in range(count)]
+
+
+def time_us(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(repeat: int, word_sets) -> list:
+    rng = random.Random(42)
+    results = []
+    for label, extra_words, extra_meta in word_sets:
+        if extra_words or extra_meta:
+            ResponseProcessor.register_patterns(meta_patterns=extra_meta, break_words=extra_words)
+        words = list(ResponseProcessor.BREAK_WORDS)
+        for size in SIZES:
+            text = make_text(size, rng)
+            expected = {word.lower() for word in words if word.lower() in text.lower()}
+            assert ResponseProcessor.find_breaks(text) == expected, label
+            results.append({
+                "words": label,
+                "break_words": len(words),
+                "meta_patterns": len(ResponseProcessor.META_PATTERNS),
+                "size_bytes": size,
+                "clean_legacy_us": round(time_us(lambda: legacy_clean(text, "deepseek-r1"), repeat), 1),
+                "clean_compiled_us": round(time_us(
+                    lambda: ResponseProcessor.clean_artifacts(text, "deepseek-r1"), repeat), 1),
+                "validate_legacy_us": round(time_us(lambda: legacy_validate(text, words), repeat), 1),
+                "validate_compiled_us": round(time_us(
+                    lambda: ResponseProcessor.validate_immersion(text), repeat), 1),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ResponseProcessor microbenchmark")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--extra-words", type=int, default=300)
+    parser.add_argument("--extra-meta", type=int, default=100)
+    args = parser.parse_args()
+
+    word_sets = [("default", None, None)]
+    if args.extra_words or args.extra_meta:
+        word_sets.append((
+            "extended",
+            synthetic_words(args.extra_words, random.Random(7)),
+            synthetic_meta(args.extra_meta)
+        ))
+    print(json.dumps(run(args.repeat, word_sets), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark rendu d'un tour complet (tous les agents)
+
+Compare :
+- per_agent : get_hierarchical_context appelé pour chaque agent (O(N²) octets)
+- round     : render_round (corps partagé une fois + identité par agent)
+
+Usage:
+    python benchmarks/bench_round.py [--repeat 20]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import AgentConfig, RealityEngineV3  # noqa: E402
+
+
+def build_engine(agents: int) -> RealityEngineV3:
+    engine = RealityEngineV3()
+    for i in range(agents):
+        engine.register_agent(AgentConfig(
+            name=f"AGENT-{i:04d}",
+            model="fake",
+            role="Android",
+            specialty=f"Spécialité {i % 7}",
+            position=f"Terminal {i % 12}"
+        ))
+    return engine
+
+
+def bench(agents: int, repeat: int) -> dict:
+    engine = build_engine(agents)
+    names = list(engine.world_state.agents)
+
+    # Chaque tour modifie le monde (comme un vrai tour d'agents)
+    start = time.perf_counter()
+    per_agent_bytes = 0
+    for i in range(repeat):
+        engine.update_world(names[0], f"Tour {i}", "Réponse")
+        per_agent_bytes = sum(len(engine.get_hierarchical_context(n)) for n in names)
+    per_agent_ms = (time.perf_counter() - start) / repeat * 1000
+
+    start = time.perf_counter()
+    round_bytes = 0
+    for i in range(repeat):
+        engine.update_world(names[0], f"Tour {i}", "Réponse")
+        round_ctx = engine.render_round()
+        round_bytes = len(round_ctx.shared) + sum(len(v) for v in round_ctx.identities.values())
+    round_ms = (time.perf_counter() - start) / repeat * 1000
+
+    return {
+        "agents": agents,
+        "per_agent_ms": round(per_agent_ms, 3),
+        "per_agent_bytes": per_agent_bytes,
+        "round_ms": round(round_ms, 3),
+        "round_bytes": round_bytes,
+        "speedup": round(per_agent_ms / round_ms, 1) if round_ms else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round rendering benchmark")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(json.dumps([bench(n, args.repeat) for n in (10, 50, 200)], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark ordonnanceur de providers (ProviderScheduler) vs sleeps fixes
+
+FakeProvider avec quota serveur simulé façon Groq (--rpm requêtes/min en token
+bucket, 429 + retry-after + en-têtes x-ratelimit-*), N appels. Stratégies :
+- fixed_sleep : appels séquentiels + sleep fixe 60/rpm entre appels (scripts
+  d'expérience historiques) ; mesuré sur --fixed-calls puis extrapolé à N
+- burst : N appels concurrents sans ordonnanceur (les 429 sont des échecs)
+- learned : ordonnanceur sans limite configurée, quotas appris des en-têtes
+- configured : ordonnanceur avec rpm configuré (aucun 429 attendu)
+Rapport par stratégie : temps mur, succès, 429 reçus, retries, file max,
+et temps idéal (capacité du bucket + reste au débit soutenu).
+
+Usage:
+    python benchmarks/bench_scheduler.py [--calls 330] [--rpm 300] [--latency-ms 50] [--fixed-calls 50]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import CONFIG, FakeProvider, ProviderError, ProviderScheduler  # noqa: E402
+
+PROMPT = "Tour {i}: analysez la salle de contrôle et rapportez vos observations."
+
+
+async def call(provider: FakeProvider, i: int) -> bool:
+    try:
+        await provider.complete("Vous êtes un android.", PROMPT.format(i=i), "fake")
+        return True
+    except ProviderError:
+        return False
+
+
+async def run_strategy(args, strategy: str) -> dict:
+    scheduler = None
+    if strategy == "learned":
+        scheduler = ProviderScheduler("fake", max_retries=args.retries, seed=1)
+    elif strategy == "configured":
+        scheduler = ProviderScheduler("fake", rpm=args.rpm, max_retries=args.retries, seed=1)
+    provider = FakeProvider(
+        latency_ms=args.latency_ms, quota_rpm=args.rpm, scheduler=scheduler, max_concurrency=args.max_concurrency
+    )
+
+    calls = args.fixed_calls if strategy == "fixed_sleep" else args.calls
+    start = time.perf_counter()
+    if strategy == "fixed_sleep":
+        outcomes = []
+        for i in range(calls):
+            outcomes.append(await call(provider, i))
+            await asyncio.sleep(60.0 / args.rpm)
+    else:
+        outcomes = await asyncio.gather(*(call(provider, i) for i in range(calls)))
+    wall = time.perf_counter() - start
+    await provider.aclose()
+
+    report = {
+        "calls": calls,
+        "wall_s": round(wall, 3),
+        "succeeded": sum(outcomes),
+        "rate_limited_429": provider.rate_limited,
+    }
+    if strategy == "fixed_sleep" and calls < args.calls:
+        report["extrapolated_wall_s"] = round(wall * args.calls / calls, 3)
+    if scheduler is not None:
+        metrics = scheduler.get_metrics()
+        report.update(retries=metrics["retries"], queued_max=metrics["queued_max"], wait_s=metrics["wait_s"])
+    return report
+
+
+async def run(args) -> dict:
+    reports = {}
+    for strategy in args.strategies:
+        reports[strategy] = report = await run_strategy(args, strategy)
+        wall = report.get("extrapolated_wall_s", report["wall_s"])
+        print(f"{strategy:<12} {wall:>9.3f}s  ok={report['succeeded']}/{report['calls']}", file=sys.stderr)
+
+    # Borne basse : capacité du bucket d'emblée, le reste au débit soutenu rpm/60
+    ideal = max(0, args.calls - args.rpm) * 60.0 / args.rpm + args.latency_ms / 1000
+    return {
+        "calls": args.calls,
+        "rpm": args.rpm,
+        "latency_ms": args.latency_ms,
+        "ideal_wall_s": round(ideal, 3),
+        "results": reports,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive provider scheduler benchmark")
+    parser.add_argument("--calls", type=int, default=330)
+    parser.add_argument("--rpm", type=float, default=300, help="Quota serveur simulé (requêtes/min)")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--fixed-calls", type=int, default=50, help="Appels mesurés en sleep fixe (extrapolés)")
+    parser.add_argument(
+        "--strategies", type=lambda value: value.split(","), default=["fixed_sleep", "burst", "learned", "configured"]
+    )
+    args = parser.parse_args()
+
+    CONFIG["security"]["rate_limit"] = 10 ** 9
+    CONFIG["audit"]["path"] = ""
+    CONFIG["history"]["spill_dir"] = None
+    logging.getLogger("IR-Engine").setLevel(logging.WARNING)
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark scaling du runtime shardé (ShardedHTTPApp) de 1 à 16 workers
+
+Charge CPU-bound sans réseau ni modèle réel : W mondes de A agents, puis R
+requêtes concurrentes via handle() (pas de socket HTTP côté client) :
+- action complète POST /update {"task"} : rendu contexte, FakeProvider
+  latence 0, nettoyage, scoring immersion, update monde
+- rendu contexte GET /context (une requête sur deux)
+Rapport par nombre de workers : req/s, latence p50/p99, speedup vs 1 worker.
+Référence "inproc" : IRHTTPApp dans le process courant (sans relais).
+Le speedup est borné par le nombre de cœurs (cpu_count dans le rapport).
+
+Usage:
+    python benchmarks/bench_sharding.py [--workers 1,2,4,8,16] [--worlds 64] [--agents 100] [--requests 4000]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import CONFIG, IRAPI, FakeProvider, IRHTTPApp, ShardedHTTPApp  # noqa: E402
+
+PREFIX = IRHTTPApp.API_PREFIX
+
+
+def int_list(value: str):
+    return [int(item) for item in value.split(",") if item]
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+async def run_load(app, args) -> dict:
+    agents = [
+        {"name": f"AGENT-{i:03d}", "model": "fake", "role": "Android", "specialty": f"Spécialité {i % 7}"}
+        for i in range(args.agents)
+    ]
+    world_ids = []
+    for w in range(args.worlds):
+        status, payload = await app.handle("POST", f"{PREFIX}/world/create", {}, {"name": f"Monde {w}", "agents": agents})
+        assert status == 201, payload
+        world_ids.append(payload["world_id"])
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        world_id = world_ids[i % len(world_ids)]
+        agent = agents[(i // len(world_ids)) % len(agents)]["name"]
+        async with semaphore:
+            start = time.perf_counter()
+            if i % 2:
+                status, _ = await app.handle("GET", f"{PREFIX}/world/{world_id}/context", {"agent": agent}, None)
+            else:
+                status, _ = await app.handle(
+                    "POST", f"{PREFIX}/world/{world_id}/update", {}, {"agent": agent, "task": f"Tour {i}: analysez."}
+                )
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += status != 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": args.requests,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "req_per_s": round(args.requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+    }
+
+
+async def run(args) -> dict:
+    reports = {}
+
+    if args.inproc:
+        provider = FakeProvider(latency_ms=0, seed=1)
+        reports["inproc"] = await run_load(IRHTTPApp(IRAPI(), provider), args)
+        await provider.aclose()
+        print(f"inproc      {reports['inproc']['req_per_s']:>10} req/s", file=sys.stderr)
+
+    for workers in args.workers:
+        app = ShardedHTTPApp(workers, "fake:seed=1")
+        await app.startup()
+        try:
+            reports[f"workers_{workers}"] = report = await run_load(app, args)
+        finally:
+            await app.shutdown()
+        base = reports.get(f"workers_{args.workers[0]}")
+        report["speedup"] = round(report["req_per_s"] / base["req_per_s"], 2)
+        print(f"workers={workers:<3} {report['req_per_s']:>10} req/s  x{report['speedup']}", file=sys.stderr)
+
+    return {
+        "cpu_count": os.cpu_count(),
+        "worlds": args.worlds,
+        "agents": args.agents,
+        "concurrency": args.concurrency,
+        "results": reports,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded runtime scaling benchmark")
+    parser.add_argument("--workers", type=int_list, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--worlds", type=int, default=64)
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--no-inproc", dest="inproc", action="store_false", help="Sans référence mono-process")
+    args = parser.parse_args()
+
+    # Hors quota, sans logs par requête ni fichiers (audit, spill) : mesure du moteur
+    os.environ.update({"IR_RATE_LIMIT": str(10 ** 9), "IR_AUDIT_LOG": "", "IR_SPILL_DIR": ""})
+    CONFIG["security"]["rate_limit"] = 10 ** 9
+    CONFIG["audit"]["path"] = ""
+    CONFIG["history"]["spill_dir"] = None
+    logging.getLogger("IR-Engine").setLevel(logging.WARNING)
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
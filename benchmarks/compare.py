@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Comparateur résultats benchmarks/run.py vs référence stockée
+
+Compare le temps par opération (--metric, défaut min_us : meilleure série,
+le moins sensible au bruit) de chaque cas présent des deux côtés :
+- regression  : plus lent que la référence au-delà du seuil (--threshold, en %)
+- improvement : plus rapide au-delà du seuil
+- new/missing : cas absent d'un côté
+Plusieurs fichiers résultat sont fusionnés (médiane par cas) : la machine
+partagée est bruitée, comparer/établir la référence sur 3 runs ou plus
+(run.py --runs). Variation absolue sous --noise-us ignorée : sur les cas de
+quelques µs, un écart au-delà du seuil peut rester dans le bruit de mesure.
+Temps normalisés par le cas calibration.python (présent des deux côtés) :
+une machine globalement plus lente ou plus rapide que lors de la référence
+ne compte pas comme régression (--no-normalize pour comparer les temps bruts).
+Code retour 1 si au moins une régression (utilisable en CI).
+
+Usage:
+    python benchmarks/run.py && python benchmarks/compare.py
+    python benchmarks/compare.py [results.json ...] [--baseline benchmarks/baseline.json] [--threshold 25]
+    python benchmarks/compare.py --update-baseline
+"""
+
+import argparse
+import json
+import statistics
+import sys
+from pathlib import Path
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_RESULTS = Path(__file__).resolve().parent / "results.json"
+CALIBRATION = "calibration.python"
+
+
+def merge_runs(runs: list) -> dict:
+    """
+    Fusion de plusieurs runs : médiane par cas et par métrique
+    Calibration présente dans chaque run : temps d'un run ramenés à la vitesse
+    machine médiane avant la médiane (un run ralenti compte comme un run normal)
+    """
+    if len(runs) == 1:
+        return runs[0]
+    speeds = [run["results"].get(CALIBRATION, {}).get("min_us") for run in runs]
+    if all(speeds):
+        reference = statistics.median(speeds)
+        scales = [reference / speed for speed in speeds]
+    else:
+        scales = [1.0] * len(runs)
+    names = set().union(*(run["results"] for run in runs))
+    results = {}
+    for name in sorted(names):
+        samples = [
+            (run["results"][name], 1.0 if name == CALIBRATION else scale)
+            for run, scale in zip(runs, scales) if name in run["results"]
+        ]
+        results[name] = {
+            key: round(statistics.median(sample[key] * scale for sample, scale in samples), 3)
+            for key in ("median_us", "min_us", "max_us")
+        }
+        results[name]["runs"] = len(samples)
+    return {"meta": {**runs[-1]["meta"], "runs": len(runs)}, "results": results}
+
+
+def machine_factor(current: dict, baseline: dict, metric: str = "min_us") -> float:
+    """Vitesse machine référence / courante (cas calibration), 1.0 si absent d'un côté"""
+    before = baseline["results"].get(CALIBRATION, {}).get(metric)
+    after = current["results"].get(CALIBRATION, {}).get(metric)
+    return before / after if before and after else 1.0
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    threshold: float,
+    metric: str = "min_us",
+    noise_us: float = 0.0,
+    factor: float = 1.0
+) -> list:
+    """Lignes de comparaison par cas (temps courants multipliés par factor)"""
+    rows = []
+    current_results = {
+        name: {**result, metric: round(result[metric] * factor, 3)}
+        for name, result in current["results"].items() if name != CALIBRATION
+    }
+    baseline_results = {name: result for name, result in baseline["results"].items() if name != CALIBRATION}
+    for name in sorted(set(current_results) | set(baseline_results)):
+        if name not in baseline_results:
+            rows.append({"case": name, "status": "new", "current_us": current_results[name][metric]})
+            continue
+        if name not in current_results:
+            rows.append({"case": name, "status": "missing", "baseline_us": baseline_results[name][metric]})
+            continue
+
+        before = baseline_results[name][metric]
+        after = current_results[name][metric]
+        change = (after - before) / before * 100 if before else 0.0
+        if abs(after - before) < noise_us:
+            status = "ok"
+        elif change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({
+            "case": name,
+            "status": status,
+            "baseline_us": before,
+            "current_us": after,
+            "change_pct": round(change, 1),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results to a baseline")
+    parser.add_argument(
+        "results", nargs="*", default=[str(DEFAULT_RESULTS)], help="JSON produit(s) par benchmarks/run.py"
+    )
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--threshold", type=float, default=25.0, help="Seuil de variation en %%")
+    parser.add_argument("--metric", choices=("min_us", "median_us"), default="min_us")
+    parser.add_argument(
+        "--noise-us", type=float, default=1.0, help="Variation absolue ignorée (µs par opération)"
+    )
+    parser.add_argument("--no-normalize", action="store_true", help="Temps bruts (sans calibration machine)")
+    parser.add_argument("--update-baseline", action="store_true", help="Remplace la référence par ces résultats")
+    args = parser.parse_args()
+
+    current = merge_runs([json.loads(Path(path).read_text(encoding="utf-8")) for path in args.results])
+    if args.update_baseline:
+        Path(args.baseline).write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline updated: {args.baseline} ({current['meta'].get('runs', 1)} run(s))")
+        return
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    factor = 1.0 if args.no_normalize else machine_factor(current, baseline, args.metric)
+    rows = compare(current, baseline, args.threshold, args.metric, args.noise_us, factor)
+
+    for row in rows:
+        if "change_pct" in row:
+            print(
+                f"{row['status']:12s} {row['case']:45s} "
+                f"{row['baseline_us']:>12.3f} → {row['current_us']:>12.3f} µs ({row['change_pct']:+.1f}%)"
+            )
+        else:
+            print(f"{row['status']:12s} {row['case']}")
+
+    regressions = [row for row in rows if row["status"] == "regression"]
+    print(json.dumps({
+        "baseline_commit": baseline["meta"].get("commit"),
+        "current_commit": current["meta"].get("commit"),
+        "metric": args.metric,
+        "threshold_pct": args.threshold,
+        "noise_us": args.noise_us,
+        "machine_factor": round(factor, 3),
+        "regressions": len(regressions),
+        "improvements": sum(1 for row in rows if row["status"] == "improvement"),
+    }, indent=2))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Load test serveur IR (--mode server)
+
+Démarre le serveur stdlib en process (ou cible --url), crée un monde,
+puis envoie des requêtes /context concurrentes sur connexions keep-alive.
+Option --model-latency-ms : mélange d'actions /update avec appel modèle lent
+pour vérifier qu'un appel lent ne bloque pas les autres requêtes.
+
+Usage:
+    python benchmarks/load_server.py --requests 5000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import CONFIG, IRAPI, FakeProvider, IRHTTPApp, start_stdlib_server  # noqa: E402
+
+
+async def http_request(reader, writer, method: str, path: str, body=None):
+    """Requête HTTP/1.1 keep-alive minimale, retourne (status, payload)"""
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(
+        (
+            f"{method} {path} HTTP/1.1\r\nHost: bench\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n"
+        ).encode("latin-1") + data
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.lower() == "content-length":
+            length = int(value.strip())
+    payload = json.loads(await reader.readexactly(length)) if length else None
+    return status, payload
+
+
+async def worker(host, port, queue, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                method, path, body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            status, _ = await http_request(reader, writer, method, path, body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        # Un seul client local : quota levé, logs audit silencieux
+        CONFIG["security"]["rate_limit"] = 10 ** 9
+        logging.getLogger("IR-Engine").setLevel(logging.WARNING)
+
+        api = IRAPI()
+        provider = FakeProvider(latency_ms=args.model_latency_ms, max_concurrency=args.concurrency)
+        server = await start_stdlib_server(IRHTTPApp(api, provider), "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    # Monde de test
+    reader, writer = await asyncio.open_connection(host, port)
+    agents = [
+        {"name": f"AGENT-{i}", "model": "fake", "role": "Android", "specialty": "Analyse"}
+        for i in range(args.agents)
+    ]
+    _, created = await http_request(
+        reader, writer, "POST", "/api/v1/world/create",
+        {"name": "Load Test Lab", "agents": agents}
+    )
+    writer.close()
+    world_id = created["world_id"]
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(args.requests):
+        agent = f"AGENT-{i % args.agents}"
+        if args.model_latency_ms and i % args.update_every == 0:
+            queue.put_nowait((
+                "POST", f"/api/v1/world/{world_id}/update",
+                {"agent": agent, "task": "Analysez la situation."}
+            ))
+        else:
+            queue.put_nowait(("GET", f"/api/v1/world/{world_id}/context?agent={agent}", None))
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(host, port, queue, latencies, errors) for _ in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    report = {
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "errors": len(errors),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+        "max_ms": round(latencies[-1], 2),
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IR server load test")
+    parser.add_argument("--url", help="Serveur existant (ex: http://127.0.0.1:8000)")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--agents", type=int, default=5)
+    parser.add_argument("--model-latency-ms", type=float, default=0.0)
+    parser.add_argument("--update-every", type=int, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
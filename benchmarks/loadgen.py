@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Générateur de charge synthétique : N mondes × M agents × K tours
+
+Chaque monde est créé via IRAPI.create_world puis joué par
+IRAPI.execute_scenario (tous les mondes en parallèle sur la même boucle),
+avec un FakeProvider partagé à latence réglable. Rapport par configuration :
+- débit (tours agent/s, tours monde/s) et erreurs
+- latence par étape (registre METRICS : contexte, modèle, nettoyage, update)
+- mémoire par monde (estimation résidente, option --tracemalloc pour les allocations réelles)
+- lag de la boucle asyncio (retard d'un timer périodique)
+
+Listes séparées par des virgules pour balayer plusieurs tailles (falaises de scaling).
+
+Usage:
+    python benchmarks/loadgen.py --worlds 10 --agents 5,20,50 --rounds 5 --latency-ms 200
+    python benchmarks/loadgen.py --worlds 100 --agents 10 --rounds 3 --mode sequential --tracemalloc
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import (  # noqa: E402
+    CONFIG,
+    IRAPI,
+    METRICS,
+    AgentConfig,
+    FakeProvider,
+    LatencyHistogram,
+    estimate_world_bytes,
+)
+
+STAGES = (
+    ("RealityEngineV3", "get_context"),
+    ("RealityEngineV3", "get_round_context"),
+    ("RealityEngineV3", "update"),
+    ("ResponseProcessor", "clean"),
+    ("ResponseProcessor", "validate"),
+)
+
+
+def int_list(value: str):
+    return [int(item) for item in value.split(",") if item]
+
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def monitor_loop_lag(interval_s: float, samples: list, stop: asyncio.Event):
+    """Retard (ms) d'un timer périodique : temps où la boucle n'a pas pu reprendre la main"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval_s
+        await asyncio.sleep(interval_s)
+        samples.append(max(0.0, (loop.time() - expected) * 1000))
+
+
+def rss_bytes() -> int:
+    """RSS courant (Linux /proc), 0 si indisponible"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+async def run_config(args, worlds: int, agents: int, rounds: int) -> dict:
+    METRICS.latency.clear()
+    METRICS.errors.clear()
+
+    api = IRAPI()
+    api.worlds.max_worlds = max(api.worlds.max_worlds, worlds)
+    api.worlds.max_bytes = max(api.worlds.max_bytes, 1 << 40)
+    provider = FakeProvider(
+        latency_ms=args.latency_ms,
+        distribution=args.distribution,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        max_concurrency=args.provider_concurrency,
+    )
+
+    if args.tracemalloc:
+        tracemalloc.start()
+        baseline_alloc = tracemalloc.get_traced_memory()[0]
+    rss_before = rss_bytes()
+
+    agent_configs = [
+        AgentConfig(
+            name=f"AGENT-{i:03d}",
+            model="fake",
+            role="Android",
+            specialty=f"Spécialité {i % 7}",
+            position=f"Terminal {i % 12}"
+        )
+        for i in range(agents)
+    ]
+    world_ids = [api.create_world(name=f"Load World {w}").world_id for w in range(worlds)]
+    tasks = [
+        {"agent": agent_config.name, "task": f"Tour {r}: analysez la situation."}
+        for r in range(rounds) for agent_config in agent_configs
+    ]
+
+    lag_samples: list = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(args.lag_interval_ms / 1000, lag_samples, stop))
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(
+        api.execute_scenario({
+            "world_id": world_id,
+            "agents": agent_configs,
+            "tasks": tasks,
+            "model_client": provider,
+            "mode": args.mode,
+            "max_concurrency": args.max_concurrency,
+        })
+        for world_id in world_ids
+    ))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+
+    turns = sum(len(outcome.get("results", [])) for outcome in outcomes)
+    errors = sum(
+        1 for outcome in outcomes for result in outcome.get("results", []) if not result.get("success")
+    ) + sum(1 for outcome in outcomes if not outcome.get("success"))
+
+    live_worlds = [api.get_world(world_id) for world_id in world_ids]
+    world_bytes = [estimate_world_bytes(world) for world in live_worlds if world is not None]
+    memory = {
+        "estimated_bytes_per_world": int(statistics.mean(world_bytes)) if world_bytes else 0,
+        "rss_delta_bytes_per_world": max(0, rss_bytes() - rss_before) // worlds if rss_before else None,
+    }
+    if args.tracemalloc:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory["traced_bytes_per_world"] = (current - baseline_alloc) // worlds
+        memory["traced_peak_bytes"] = peak
+
+    stages = {
+        f"{module}.{operation}": METRICS.latency[(module, operation)].snapshot()
+        for module, operation in STAGES if (module, operation) in METRICS.latency
+    }
+    model_histograms = [h for (module, _), h in METRICS.latency.items() if module == f"provider.{provider.name}"]
+    if model_histograms:
+        merged = LatencyHistogram()
+        for histogram in model_histograms:
+            merged.merge(histogram)
+        stages["model"] = merged.snapshot()
+
+    await provider.aclose()
+    for world_id in world_ids:
+        api.delete_world(world_id)
+
+    return {
+        "worlds": worlds,
+        "agents": agents,
+        "rounds": rounds,
+        "mode": args.mode,
+        "latency_ms": args.latency_ms,
+        "elapsed_s": round(elapsed, 3),
+        "turns": turns,
+        "errors": errors,
+        "turns_per_s": round(turns / elapsed, 1) if elapsed else None,
+        "world_rounds_per_s": round(worlds * rounds / elapsed, 2) if elapsed else None,
+        "stages": stages,
+        "memory": memory,
+        "loop_lag_ms": {
+            "p50": round(percentile(lag_samples, 0.50), 3),
+            "p99": round(percentile(lag_samples, 0.99), 3),
+            "max": round(max(lag_samples, default=0.0), 3),
+        },
+    }
+
+
+async def run(args) -> list:
+    # Charge synthétique : pas de logs par action (erreurs simulées comptées dans le rapport), pas de spill disque
+    logging.getLogger("IR-Engine").setLevel(logging.CRITICAL)
+    CONFIG["history"]["spill_dir"] = None
+
+    reports = []
+    for worlds, agents, rounds in itertools.product(args.worlds, args.agents, args.rounds):
+        report = await run_config(args, worlds, agents, rounds)
+        print(
+            f"worlds={worlds:<5} agents={agents:<5} rounds={rounds:<4} "
+            f"{report['turns_per_s']:>10} turns/s  lag p99 {report['loop_lag_ms']['p99']} ms",
+            file=sys.stderr
+        )
+        reports.append(report)
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IR synthetic load generator")
+    parser.add_argument("--worlds", type=int_list, default=[10], help="ex: 1,10,100")
+    parser.add_argument("--agents", type=int_list, default=[5], help="ex: 5,20,50")
+    parser.add_argument("--rounds", type=int_list, default=[5])
+    parser.add_argument("--mode", choices=("simultaneous", "sequential"), default="simultaneous")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Appels modèle par tour et par monde")
+    parser.add_argument("--provider-concurrency", type=int, default=256, help="Appels modèle simultanés au total")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--distribution", choices=("fixed", "uniform", "exponential", "lognormal"), default="fixed")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--lag-interval-ms", type=float, default=10.0)
+    parser.add_argument("--tracemalloc", action="store_true", help="Mémoire allouée exacte (ralentit le run)")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Suite microbenchmarks hors-ligne des chemins chauds du moteur IR
+
+Cas mesurés (aucun appel réseau, modèle simulé par FakeProvider) :
+- context.*      : get_hierarchical_context selon nombre d'agents et d'événements
+- update.*       : débit update_world
+- response.*     : clean_artifacts / validate_immersion selon taille réponse
+- security.*     : validate_input et rate limiter
+- orchestrator.* : execute_agent_action complet (modèle fake, latence 0)
+- calibration.*  : charge Python pure indépendante du moteur, mesurée avant
+  chaque cas (médiane : vitesse moyenne de la machine pendant le run ;
+  compare.py normalise les autres cas par ce ratio)
+
+Chaque cas est répété --repeat fois (après un passage d'échauffement) ;
+résultat par cas : médiane, min et max en µs par opération. La suite complète
+est lancée --runs fois (défaut 3) et fusionnée (médiane par cas, comme
+compare.py) : un run isolé est trop bruité sur une machine partagée. Sortie
+JSON (défaut benchmarks/results.json, lu par défaut par benchmarks/compare.py).
+
+Usage:
+    python benchmarks/run.py [--output results.json|-] [--runs 3] [--filter context] [--quick]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compare import CALIBRATION, DEFAULT_RESULTS, merge_runs  # noqa: E402
+
+from app import (  # noqa: E402
+    CONFIG,
+    AgentConfig,
+    FakeProvider,
+    Orchestrator,
+    RealityEngineV3,
+    ResponseProcessor,
+    SecurityGateway,
+    TokenBucketLimiter,
+)
+
+SENTENCES = [
+    "ALPHA-7 examine le terminal nord et relève une dérive temporelle.",
+    "Je suis un modèle de langage et je ne peux pas vraiment agir.",
+    "La synchronisation du module THETA reste instable depuis l'événement 3.",
+    "As an AI, I cannot physically touch the console.\n",
+    "<think>Analyse interne du contexte fourni</think>",
+    "BETA-3 propose de couper l'alimentation secondaire.",
+]
+
+
+def build_engine(agents: int, events: int) -> RealityEngineV3:
+    engine = RealityEngineV3()
+    for i in range(agents):
+        engine.register_agent(AgentConfig(
+            name=f"AGENT-{i:04d}",
+            model="fake",
+            role="Android",
+            specialty=f"Spécialité {i % 7}",
+            position=f"Terminal {i % 12}"
+        ))
+    for i in range(events):
+        engine.update_world(f"AGENT-{i % agents:04d}", f"Action {i} en cours", "Réponse")
+    return engine
+
+
+def make_text(size: int, rng: random.Random) -> str:
+    parts, length = [], 0
+    while length < size:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence + " ")
+        length += len(sentence) + 1
+    return "".join(parts)[:size]
+
+
+def measure(func, number: int, repeat: int) -> dict:
+    """µs par opération : médiane / min / max sur repeat séries de number appels"""
+    func()  # échauffement (caches, imports paresseux)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return {
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(min(samples), 3),
+        "max_us": round(max(samples), 3),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+# --------------------------------------------
+# Cas : chacun retourne une fonction sans argument
+# --------------------------------------------
+
+def case_calibration():
+    """Charge fixe (dict, formatage, join) sans code du moteur : mesure la vitesse de la machine"""
+    keys = [f"key-{i}" for i in range(200)]
+
+    def run():
+        table = {key: index * 2 for index, key in enumerate(keys)}
+        "".join(f"{key}={value};" for key, value in table.items())
+    return run
+
+
+def case_context_turn(agents: int, events: int):
+    """Tour réaliste: update_world puis rendu (historique/comms invalidés)"""
+    engine = build_engine(agents, events)
+    agent = "AGENT-0000"
+    counter = [0]
+
+    def run():
+        counter[0] += 1
+        engine.update_world(agent, f"Tour {counter[0]}", "Réponse")
+        engine.get_hierarchical_context(agent)
+    return run
+
+
+def case_context_cold(agents: int, events: int):
+    """Rendu complet, tous fragments invalidés"""
+    engine = build_engine(agents, events)
+
+    def run():
+        engine.invalidate()
+        engine._identity_cache.clear()
+        engine.get_hierarchical_context("AGENT-0000")
+    return run
+
+
+def case_update(agents: int):
+    engine = build_engine(agents, 0)
+    names = list(engine.world_state.agents)
+    counter = [0]
+
+    def run():
+        counter[0] += 1
+        engine.update_world(names[counter[0] % len(names)], f"Action {counter[0]}", "Une hypothèse")
+    return run
+
+
+def case_clean(size: int):
+    text = make_text(size, random.Random(size))
+    return lambda: ResponseProcessor.clean_artifacts(text, "deepseek-r1")
+
+
+def case_validate(size: int):
+    text = make_text(size, random.Random(size))
+    return lambda: ResponseProcessor.validate_immersion(text)
+
+
+def case_validate_input():
+    text = "Analysez la dérive temporelle du terminal nord. " * 20
+    return lambda: SecurityGateway.validate_input(text, {"client_id": "bench"})
+
+
+def case_rate_limiter(clients: int):
+    limiter = TokenBucketLimiter(rate=10 ** 9, window=60, max_clients=clients)
+    ids = [f"client-{i}" for i in range(clients)]
+    counter = [0]
+
+    def run():
+        counter[0] += 1
+        limiter.acquire(ids[counter[0] % clients])
+    return run
+
+
+def case_agent_action(agents: int):
+    """execute_agent_action complet (contexte, prompts, modèle fake, nettoyage, update)"""
+    orchestrator = Orchestrator()
+    configs = [
+        AgentConfig(name=f"AGENT-{i:04d}", model="fake", role="Android", specialty="Analyse")
+        for i in range(agents)
+    ]
+    for agent_config in configs:
+        orchestrator.reality_engine.register_agent(agent_config)
+    provider = FakeProvider(latency_ms=0, seed=1)
+    loop = asyncio.new_event_loop()
+    counter = [0]
+
+    def run():
+        counter[0] += 1
+        agent_config = configs[counter[0] % agents]
+        loop.run_until_complete(orchestrator.execute_agent_action(
+            agent_config.name, "Analysez la situation.", provider, agent_config
+        ))
+    return run
+
+
+def cases(quick: bool):
+    """(nom, fabrique, appels par série)"""
+    scale = 0.2 if quick else 1.0
+
+    def n(count):
+        return max(1, int(count * scale))
+
+    suite = []
+    for agents in (10, 100, 1000):
+        suite.append((f"context.turn.agents_{agents}", lambda a=agents: case_context_turn(a, 200), n(200)))
+        suite.append((f"context.cold.agents_{agents}", lambda a=agents: case_context_cold(a, 200), n(200)))
+    for events in (100, 1000, 10000):
+        suite.append((f"context.turn.events_{events}", lambda e=events: case_context_turn(10, e), n(200)))
+    suite.append(("update.agents_100", lambda: case_update(100), n(5000)))
+    for size in (1_000, 10_000, 100_000):
+        label = f"{size // 1000}kb"
+        suite.append((f"response.clean.{label}", lambda s=size: case_clean(s), n(max(5, 200_000 // size))))
+        suite.append((f"response.validate.{label}", lambda s=size: case_validate(s), n(max(5, 200_000 // size))))
+    suite.append(("security.validate_input", case_validate_input, n(5000)))
+    suite.append(("security.rate_limit.clients_100000", lambda: case_rate_limiter(100_000), n(20000)))
+    for agents in (5, 50):
+        suite.append((f"orchestrator.agent_action.agents_{agents}", lambda a=agents: case_agent_action(a), n(300)))
+    return suite
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).resolve().parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(args) -> dict:
+    # Hors-ligne et silencieux : pas de quota, pas de logs par appel
+    CONFIG["security"]["rate_limit"] = 10 ** 9
+    logging.getLogger("IR-Engine").setLevel(logging.WARNING)
+
+    repeat = 3 if args.quick else args.repeat
+    calibration = case_calibration()
+    calibrations = []
+    results = {}
+    for name, factory, number in cases(args.quick):
+        if args.filter and args.filter not in name:
+            continue
+        # Vitesse machine échantillonnée au moment de chaque cas (bruit variable dans le temps)
+        calibrations.append(measure(calibration, 20 if args.quick else 100, 3))
+        results[name] = measure(factory(), number, repeat)
+        print(f"{name:45s} {results[name]['median_us']:>12.3f} µs/op", file=sys.stderr)
+    if calibrations:
+        results[CALIBRATION] = {
+            key: round(statistics.median(sample[key] for sample in calibrations), 3)
+            for key in ("median_us", "min_us", "max_us")
+        }
+        results[CALIBRATION]["samples"] = len(calibrations)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IR engine microbenchmark suite")
+    parser.add_argument("--output", default=str(DEFAULT_RESULTS), help="Fichier JSON résultat (-: stdout)")
+    parser.add_argument("--filter", help="Ne lance que les cas contenant cette chaîne")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--runs", type=int, default=3, help="Lancements de la suite, fusionnés (médiane)")
+    parser.add_argument("--quick", action="store_true", help="Moins d'itérations (CI, smoke test)")
+    args = parser.parse_args()
+
+    runs = []
+    for index in range(max(1, args.runs)):
+        print(f"--- run {index + 1}/{max(1, args.runs)}", file=sys.stderr)
+        runs.append(run(args))
+    report = json.dumps(merge_runs(runs), indent=2)
+    if args.output == "-":
+        print(report)
+    else:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
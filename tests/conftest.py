@@ -0,0 +1,17 @@
+"""Fixtures partagées : CONFIG isolé (aucun fichier écrit hors tmp_path, pas de rate limit)"""
+
+import pytest
+
+from app import CONFIG, SecurityGateway
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(monkeypatch, tmp_path):
+    monkeypatch.setitem(CONFIG["security"], "rate_limit", 10 ** 9)
+    monkeypatch.setitem(CONFIG["audit"], "path", "")
+    monkeypatch.setitem(CONFIG["history"], "spill_dir", None)
+    monkeypatch.setitem(CONFIG["persistence"], "dir", None)
+    monkeypatch.setitem(CONFIG["cache"], "dir", None)
+    monkeypatch.chdir(tmp_path)
+    yield
+    SecurityGateway.close_audit_writer()
@@ -0,0 +1,135 @@
+"""AuditLogWriter : écriture batchée, rotation, backpressure, compteurs thread-safe"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from app import CONFIG, AuditLogWriter, SecurityGateway
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_writes_batched_jsonl(tmp_path):
+    writer = AuditLogWriter(str(tmp_path / "audit.jsonl"), batch_size=10, flush_interval=0.01)
+    for i in range(25):
+        assert writer.write({"action": f"a{i}"})
+    assert writer.flush(timeout=5)
+    writer.close()
+    assert [record["action"] for record in read_records(tmp_path / "audit.jsonl")] == [f"a{i}" for i in range(25)]
+    metrics = writer.get_metrics()
+    assert metrics["queued"] == metrics["flushed"] == 25
+    assert metrics["dropped"] == 0
+
+
+def test_rotation(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    writer = AuditLogWriter(str(path), batch_size=1, flush_interval=0.01, max_bytes=200, backup_count=2)
+    for i in range(30):
+        writer.write({"action": "x" * 40, "i": i})
+    writer.close()
+    assert writer.get_metrics()["rotations"] > 0
+    assert (tmp_path / "audit.jsonl.1").exists() and (tmp_path / "audit.jsonl.2").exists()
+    assert not (tmp_path / "audit.jsonl.3").exists()
+
+
+def test_rotation_counts_encoded_bytes(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    writer = AuditLogWriter(str(path), batch_size=1, flush_interval=0.01, max_bytes=300, backup_count=1)
+    for i in range(6):
+        writer.write({"action": "é" * 60, "i": i})
+    writer.close()
+    # 60 caractères "é" = 120 octets UTF-8 : la rotation suit la taille sur disque
+    assert path.stat().st_size <= 300
+    assert writer.get_metrics()["rotations"] >= 2
+
+
+def test_unavailable_file_falls_back_to_logger(tmp_path, caplog):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    writer = AuditLogWriter(str(blocker / "audit.jsonl"), flush_interval=0.01)
+    with caplog.at_level(logging.INFO, logger="IR-Engine"):
+        assert writer.write({"action": "first"})
+        assert writer.flush(timeout=5)
+        assert writer.write({"action": "second"})
+        writer.close()
+    metrics = writer.get_metrics()
+    assert metrics["error"] and metrics["fallback"] == 2 and metrics["dropped"] == 0
+    audit = [record.getMessage() for record in caplog.records if record.getMessage().startswith("[AUDIT]")]
+    assert len(audit) == 2 and '"first"' in audit[0]
+
+
+def test_logger_audit_is_written_off_request_thread(monkeypatch):
+    threads = []
+
+    class Recorder(logging.Handler):
+        def emit(self, record):
+            if record.getMessage().startswith("[AUDIT]"):
+                threads.append(threading.current_thread())
+
+    engine_logger = logging.getLogger("IR-Engine")
+    handler = Recorder()
+    engine_logger.addHandler(handler)
+    monkeypatch.setattr(engine_logger, "level", logging.INFO)
+    try:
+        SecurityGateway.audit_log("GET /health", "test", {"success": True})
+        SecurityGateway.close_audit_writer()
+        assert threads and threads[0] is not threading.current_thread()
+
+        monkeypatch.setitem(CONFIG["audit"], "sync", True)
+        SecurityGateway.audit_log("GET /health", "test", {"success": True})
+        assert threads[-1] is threading.current_thread()
+    finally:
+        engine_logger.removeHandler(handler)
+
+
+def test_drop_policy_when_full_or_closed(tmp_path):
+    writer = AuditLogWriter(str(tmp_path / "audit.jsonl"), max_queue=1, policy="drop")
+    writer._thread = threading.current_thread()  # pas de consommateur: la file reste pleine
+    assert writer.write({"i": 1})
+    assert not writer.write({"i": 2})
+    writer._closed = True
+    assert not writer.write({"i": 3})
+    assert writer.get_metrics()["dropped"] == 2
+    with pytest.raises(ValueError):
+        AuditLogWriter(str(tmp_path / "x.jsonl"), policy="spill")
+
+
+def test_counters_consistent_under_concurrent_writers(tmp_path):
+    writer = AuditLogWriter(str(tmp_path / "audit.jsonl"), max_queue=50, flush_interval=0.001)
+    threads = [
+        threading.Thread(target=lambda: [writer.write({"i": i}) for i in range(2000)])
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+    metrics = writer.get_metrics()
+    assert metrics["queued"] + metrics["dropped"] == 16000
+    assert metrics["flushed"] == metrics["queued"] == len(read_records(tmp_path / "audit.jsonl"))
+
+
+def test_audit_file_is_opt_in(tmp_path):
+    """Sans IR_AUDIT_LOG: audit via logger, aucun fichier créé dans le répertoire courant"""
+    env = {key: value for key, value in os.environ.items() if key != "IR_AUDIT_LOG"}
+    env["PYTHONPATH"] = str(ROOT)
+    script = (
+        "from app import CONFIG, SecurityGateway\n"
+        "SecurityGateway.audit_log('GET /health', 'test', {'success': True})\n"
+        "print(repr(CONFIG['audit']['path']), SecurityGateway.get_audit_writer())\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["''", "None"]
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,73 @@
+"""Contexte par sections cachées (invalidation ciblée) et rendu partagé d'un tour"""
+
+import pytest
+
+from app import AgentConfig, RealityEngineV3
+
+AGENTS = [
+    AgentConfig(name="ALPHA-7", model="fake", role="Android", specialty="Diagnostic"),
+    AgentConfig(name="BETA-3", model="fake", role="Android", specialty="Énergie"),
+]
+
+
+def make_engine() -> RealityEngineV3:
+    engine = RealityEngineV3("cache")
+    for agent in AGENTS:
+        engine.register_agent(agent)
+    engine.world_state.knowledge["clues"].append("Dérive du relais nord")
+    engine.invalidate("knowledge")
+    return engine
+
+
+def count_renders(monkeypatch, engine, *sections):
+    calls = {section: 0 for section in sections}
+    for section in sections:
+        render = getattr(engine, f"_render_{section}")
+
+        def counted(render=render, section=section):
+            calls[section] += 1
+            return render()
+
+        monkeypatch.setattr(engine, f"_render_{section}", counted)
+    return calls
+
+
+def test_sections_cached_until_invalidated(monkeypatch):
+    engine = make_engine()
+    calls = count_renders(monkeypatch, engine, "mission", "knowledge", "history")
+    first = engine.get_hierarchical_context("ALPHA-7")
+    assert engine.get_hierarchical_context("ALPHA-7") == first
+    assert calls == {"mission": 1, "knowledge": 1, "history": 1}
+
+    # Modification directe sans changement de taille : fragment gardé jusqu'à invalidate
+    engine.world_state.knowledge["clues"][0] = "Relais nord remplacé"
+    assert "Relais nord remplacé" not in engine.get_hierarchical_context("ALPHA-7")
+    engine.invalidate("knowledge")
+    assert "Relais nord remplacé" in engine.get_hierarchical_context("ALPHA-7")
+    assert calls == {"mission": 1, "knowledge": 2, "history": 1}
+
+    # update_world : historique re-rendu, sections non concernées réutilisées
+    engine.update_world("BETA-3", "Coupe l'alimentation secondaire", "")
+    assert "Coupe l'alimentation secondaire" in engine.get_hierarchical_context("ALPHA-7")
+    assert calls == {"mission": 1, "knowledge": 2, "history": 2}
+
+    engine.invalidate()
+    engine.get_hierarchical_context("ALPHA-7")
+    assert calls == {"mission": 2, "knowledge": 3, "history": 3}
+
+
+def test_round_shares_one_body_across_agents(monkeypatch):
+    engine = make_engine()
+    calls = count_renders(monkeypatch, engine, "mission", "knowledge", "history")
+    round_context = engine.render_round()
+
+    assert calls == {"mission": 1, "knowledge": 1, "history": 1}
+    assert set(round_context.identities) == {"ALPHA-7", "BETA-3"}
+    for agent in AGENTS:
+        context = round_context.for_agent(agent.name)
+        assert context.startswith(round_context.shared)
+        assert f"VOTRE IDENTITÉ: {agent.name}" in context and agent.specialty in context
+    assert round_context.world_version == engine.world_version
+
+    with pytest.raises(ValueError, match="GHOST"):
+        engine.render_round(["GHOST"])
@@ -0,0 +1,93 @@
+"""Contexte delta : premier tour complet, mises à jour ensuite, refresh forcé"""
+
+import asyncio
+
+import pytest
+
+from app import AgentConfig, FakeProvider, Orchestrator, RealityEngineV3
+
+DELTA_HEADER = "MISE À JOUR DEPUIS VOTRE DERNIER TOUR"
+
+
+def build_engine() -> RealityEngineV3:
+    engine = RealityEngineV3(world_id="delta")
+    for i in range(3):
+        engine.register_agent(AgentConfig(
+            name=f"AGENT-{i}", model="fake", role="Android", specialty=f"Spécialité {i}"
+        ))
+    return engine
+
+
+def test_first_context_is_full_then_delta():
+    engine = build_engine()
+    context, full = engine.get_delta_context("AGENT-0")
+    assert full and DELTA_HEADER not in context
+    assert context == engine.get_hierarchical_context("AGENT-0")
+
+    engine.update_world("AGENT-1", "Ouvre la trappe", "La trappe grince.")
+    engine.world_state.knowledge["clues"].append("Trace de pas près du sas")
+    engine.invalidate("knowledge")
+    context, full = engine.get_delta_context("AGENT-0")
+    assert not full and DELTA_HEADER in context
+    assert "Ouvre la trappe" in context and "Trace de pas" in context
+    assert len(context) < len(engine.get_hierarchical_context("AGENT-0"))
+
+
+def test_own_events_are_not_repeated():
+    engine = build_engine()
+    engine.get_delta_context("AGENT-0")
+    engine.update_world("AGENT-0", "Inspecte le relais", "Le relais est froid.")
+    context, full = engine.get_delta_context("AGENT-0")
+    assert not full and "Inspecte le relais" not in context
+
+
+def test_refresh_every_forces_full_context():
+    engine = build_engine()
+    flags = [engine.get_delta_context("AGENT-0", refresh_every=3)[1] for _ in range(7)]
+    assert flags == [True, False, False, True, False, False, True]
+    flags = [engine.get_delta_context("AGENT-1", refresh_every=0)[1] for _ in range(5)]
+    assert flags == [True, False, False, False, False]
+
+
+def test_budget_overflow_and_forget_view_fall_back_to_full():
+    engine = build_engine()
+    engine.get_delta_context("AGENT-0")
+    engine.update_world("AGENT-1", "Action longue " * 50, "Réponse")
+    assert engine.get_delta_context("AGENT-0", max_tokens=5)[1]
+
+    engine.forget_view("AGENT-0")
+    assert engine.get_delta_context("AGENT-0")[1]
+    engine.get_delta_context("AGENT-1")
+    engine.forget_view()
+    assert engine.get_delta_context("AGENT-1")[1]
+
+
+def test_unknown_agent():
+    with pytest.raises(ValueError):
+        build_engine().get_delta_context("GHOST")
+
+
+def test_orchestrator_delta_mode_prompts():
+    prompts = []
+
+    def respond(system: str, prompt: str, model: str) -> str:
+        prompts.append(prompt)
+        return "J'observe le relais nord."
+
+    async def scenario():
+        world = Orchestrator(world_id="delta-mode", context_mode="delta")
+        agent = AgentConfig(name="AGENT-0", model="fake", role="Android", specialty="Analyse")
+        world.reality_engine.register_agent(agent)
+        provider = FakeProvider(response=respond)
+        for turn in range(3):
+            result = await world.execute_agent_action(agent.name, f"Tour {turn}", provider, agent)
+            assert result["success"], result
+        await provider.aclose()
+
+    asyncio.run(scenario())
+    assert [DELTA_HEADER in prompt for prompt in prompts] == [False, True, True]
+
+
+def test_orchestrator_rejects_unknown_context_mode():
+    with pytest.raises(ValueError):
+        Orchestrator(context_mode="diff")
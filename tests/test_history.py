@@ -0,0 +1,35 @@
+"""BoundedLog : fenêtre mémoire bornée, débordement disque et relecture de l'historique complet"""
+
+from app import BoundedLog, log_count
+
+
+def test_spill_and_history_readback(tmp_path):
+    log = BoundedLog(3, spill_path=tmp_path / "events.jsonl", spill_batch=2)
+    for i in range(8):
+        log.append({"i": i})
+
+    assert list(log) == [{"i": 5}, {"i": 6}, {"i": 7}]
+    assert log.total == log_count(log) == 8
+    assert log.spilled == 4 and log.dropped == 0  # 5e évincé encore en attente
+    assert [entry["i"] for entry in log.history()] == list(range(8))
+    assert log[-2:] == [{"i": 6}, {"i": 7}]
+
+
+def test_without_spill_path_entries_are_dropped():
+    log = BoundedLog(2, items=["a", "b", "c"])
+    assert list(log) == ["b", "c"]
+    assert log.dropped == 1 and log.total == 3
+    assert list(log.history()) == ["b", "c"]
+
+
+def test_restore_state_truncates_segment_written_after_snapshot(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = BoundedLog(2, spill_path=path, spill_batch=1)
+    log.extend(range(4))
+    state = log.to_state()
+    log.extend(range(4, 7))  # écrit après le snapshot, rejoué depuis le WAL
+
+    restored = BoundedLog(2, spill_path=path, spill_batch=1)
+    restored.restore_state(state)
+    assert restored.total == 4 and list(restored) == [2, 3]
+    assert list(restored.history()) == [0, 1, 2, 3]
@@ -0,0 +1,160 @@
+"""Routes HTTP de l'API monde (IRHTTPApp) et serveur asyncio stdlib"""
+
+import asyncio
+import json
+
+from app import IRAPI, FakeProvider, IRHTTPApp, start_stdlib_server
+
+PREFIX = IRHTTPApp.API_PREFIX
+
+
+def make_app() -> IRHTTPApp:
+    return IRHTTPApp(IRAPI(), FakeProvider(response="Je vérifie le terminal nord."))
+
+
+def create_world(app: IRHTTPApp) -> str:
+    status, payload = asyncio.run(app.handle("POST", f"{PREFIX}/world/create", {}, {
+        "name": "Station",
+        "agents": [{"name": "ALPHA-7", "model": "fake", "role": "Android", "specialty": "Diagnostic"}],
+    }))
+    assert status == 201, payload
+    return payload["world_id"]
+
+
+def test_health():
+    status, payload = asyncio.run(make_app().handle("GET", "/health", {}, None))
+    assert status == 200
+    assert payload["status"] == "healthy"
+
+
+def test_world_lifecycle():
+    app = make_app()
+    world_id = create_world(app)
+
+    status, payload = asyncio.run(app.handle("POST", f"{PREFIX}/world/{world_id}/update", {}, {
+        "agent": "ALPHA-7", "action_summary": "Inspecte le terminal nord"
+    }))
+    assert status == 200 and payload["success"]
+
+    status, payload = asyncio.run(app.handle("GET", f"{PREFIX}/world/{world_id}/context", {"agent": "ALPHA-7"}, None))
+    assert status == 200
+    assert "Inspecte le terminal nord" in payload["formatted_context"]
+
+    status, payload = asyncio.run(app.handle("POST", f"{PREFIX}/world/{world_id}/update", {}, {
+        "agent": "ALPHA-7", "task": "Analysez la situation."
+    }))
+    assert status == 200 and payload["success"]
+
+    status, payload = asyncio.run(app.handle("GET", f"{PREFIX}/worlds", {}, None))
+    assert payload["count"] == 1
+
+    status, payload = asyncio.run(app.handle("DELETE", f"{PREFIX}/world/{world_id}", {}, None))
+    assert status == 200
+    status, _ = asyncio.run(app.handle("GET", f"{PREFIX}/world/{world_id}/metrics", {}, None))
+    assert status == 404
+
+
+def test_errors():
+    app = make_app()
+    world_id = create_world(app)
+    assert asyncio.run(app.handle("GET", "/nope", {}, None))[0] == 404
+    assert asyncio.run(app.handle("GET", f"{PREFIX}/world/create", {}, None))[0] == 405
+    assert asyncio.run(app.handle("GET", f"{PREFIX}/world/{world_id}/context", {}, None))[0] == 400
+    assert asyncio.run(app.handle("POST", f"{PREFIX}/world/{world_id}/update", {}, {"agent": "GHOST"}))[0] == 404
+    assert asyncio.run(app.handle("POST", f"{PREFIX}/world/create", {}, {"agents": "ALPHA-7"}))[0] == 400
+
+
+async def raw_request(request: bytes) -> bytes:
+    server = await start_stdlib_server(make_app(), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+        return response
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_stdlib_server_roundtrip():
+    body = json.dumps({"name": "Station"}).encode()
+    response = asyncio.run(raw_request(
+        b"POST /api/v1/world/create HTTP/1.1\r\nConnection: close\r\n"
+        b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+    ))
+    head, _, payload = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 201")
+    assert json.loads(payload)["success"]
+
+
+def test_stdlib_server_rejects_malformed_content_length():
+    response = asyncio.run(raw_request(
+        b"POST /api/v1/world/create HTTP/1.1\r\nContent-Length: abc\r\n\r\n{}"
+    ))
+    head, _, payload = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 400")
+    assert b"Connection: close" in head
+    assert "Content-Length" in json.loads(payload)["error"]
+
+
+def test_agent_fields_validated_at_boundary():
+    app = make_app()
+    status, payload = asyncio.run(app.handle("POST", f"{PREFIX}/world/create", {}, {"agents": [
+        {"name": "ALPHA-7", "model": "fake", "role": "Android", "specialty": "Diagnostic", "position": [3, 4.5]}
+    ]}))
+    assert status == 201, payload
+    world = app.api.get_world(payload["world_id"])
+    assert world.reality_engine.world_state.agents["ALPHA-7"].position == "3,4.5"
+
+    for invalid in ({"position": {"x": 3}}, {"specialty": 7}, {"energy": [1]}, {"name": None}):
+        agent = {"name": "BETA-3", "model": "fake", "role": "Android", "specialty": "Énergie", **invalid}
+        status, payload = asyncio.run(app.handle("POST", f"{PREFIX}/world/create", {}, {"agents": [agent]}))
+        assert status == 400, (invalid, payload)
+        assert payload["error"].startswith("Invalid agent definition")
+
+    world_id = create_world(app)
+    status, payload = asyncio.run(app.handle("POST", f"{PREFIX}/world/{world_id}/update", {}, {
+        "agent": "ALPHA-7", "position": [10, 2]
+    }))
+    assert status == 200 and payload["position"] == "10,2"
+    status, _ = asyncio.run(app.handle("POST", f"{PREFIX}/world/{world_id}/update", {}, {
+        "agent": "ALPHA-7", "position": None
+    }))
+    assert status == 400
+
+
+def test_payload_field_types_validated():
+    app = make_app()
+    for invalid in ({"name": 7}, {"objects": "console"}, {"objects": ["console"]},
+                    {"metadata": []}, {"metadata": {"perception_radius": "loin"}}):
+        status, payload = asyncio.run(app.handle("POST", f"{PREFIX}/world/create", {}, invalid))
+        assert status == 400, (invalid, payload)
+
+    world_id = create_world(app)
+    update = f"{PREFIX}/world/{world_id}/update"
+    for invalid in ({"task": ["Analysez"]}, {"action_summary": 3}, {"action_summary": "ok", "full_response": {}},
+                    {"task": "Analysez", "stream": "yes"}):
+        status, payload = asyncio.run(app.handle("POST", update, {}, {"agent": "ALPHA-7", **invalid}))
+        assert status == 400, (invalid, payload)
+    assert asyncio.run(app.handle("POST", update, {}, {"agent": ["ALPHA-7"]}))[0] == 400
+    assert asyncio.run(app.handle("POST", update, {}, ["ALPHA-7"]))[0] == 400
+
+
+def test_context_not_found_only_for_unknown_world_or_agent(monkeypatch):
+    app = make_app()
+    world_id = create_world(app)
+    context = f"{PREFIX}/world/{world_id}/context"
+    assert asyncio.run(app.handle("GET", f"{PREFIX}/world/nope/context", {"agent": "ALPHA-7"}, None))[0] == 404
+    assert asyncio.run(app.handle("GET", context, {"agent": "GHOST"}, None))[0] == 404
+
+    engine = app.api.get_world(world_id).reality_engine
+
+    def broken(agent_name, max_tokens=None):
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(engine, "get_hierarchical_context", broken)
+    status, payload = asyncio.run(app.handle("GET", context, {"agent": "ALPHA-7"}, None))
+    assert status == 500 and "render failed" in payload["error"]
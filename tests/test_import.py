@@ -0,0 +1,44 @@
+"""Import de app sans effet de bord ; logging configuré explicitement (configure_logging)"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_python(script, cwd, **env_overrides):
+    env = {key: value for key, value in os.environ.items() if not key.startswith("IR_LOG")}
+    env.update(PYTHONPATH=str(ROOT), PYTHONDONTWRITEBYTECODE="1", **env_overrides)
+    result = subprocess.run([sys.executable, "-c", script], cwd=cwd, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.split()
+
+
+def test_import_creates_no_file_and_no_handler(tmp_path):
+    script = (
+        "import logging\n"
+        "import app\n"
+        "print(len(logging.getLogger().handlers))\n"
+    )
+    assert run_python(script, tmp_path) == ["0"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_configure_logging_file_is_explicit(tmp_path):
+    script = (
+        "import logging\n"
+        "from app import configure_logging, logger\n"
+        "configure_logging()\n"
+        "configure_logging(log_file='autre.log')\n"  # déjà configuré: sans effet
+        "logger.info('démarrage')\n"
+        "print(len(logging.getLogger().handlers))\n"
+    )
+    assert run_python(script, tmp_path)[-1] == "2"
+    assert [path.name for path in tmp_path.iterdir()] == ["ir_engine.log"]
+    assert "démarrage" in (tmp_path / "ir_engine.log").read_text(encoding="utf-8")
+
+    (tmp_path / "ir_engine.log").unlink()
+    assert run_python(script, tmp_path, IR_LOG_FILE="")[-1] == "1"
+    assert list(tmp_path.iterdir()) == []
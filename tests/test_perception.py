@@ -0,0 +1,82 @@
+"""Perception spatiale : parse_position, SpatialGrid, contexte borné au rayon"""
+
+import pytest
+
+from app import CONFIG, AgentConfig, RealityEngineV3, SpatialGrid, parse_position
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("12.5,40", ("", 12.5, 40.0)),
+    ("Labo@3,4", ("Labo", 3.0, 4.0)),
+    ("(1; -2)", ("", 1.0, -2.0)),
+    ("Labo", ("Labo", None, None)),
+    ([3, 4], ("", 3.0, 4.0)),
+])
+def test_parse_position(value, expected):
+    assert parse_position(value) == expected
+
+
+def test_grid_query_nearest_first_and_zones():
+    grid = SpatialGrid(5)
+    grid.insert("near", "1,0")
+    grid.insert("nearest", "0.5,0")
+    grid.insert("far", "30,30")
+    grid.insert("other-zone", "Labo@0,0")
+    grid.insert("zone-only", "Labo")
+    assert grid.query("0,0", 10) == ["nearest", "near"]
+    assert grid.query("Labo@0,1", 2) == ["other-zone", "zone-only"]
+    assert grid.query("Labo", 1) == ["other-zone", "zone-only"]
+
+
+def test_grid_move_and_remove():
+    grid = SpatialGrid(5)
+    grid.insert("a", "0,0")
+    grid.insert("a", "50,50")  # déplacement
+    assert len(grid) == 1
+    assert grid.query("0,0", 10) == []
+    assert grid.query("49,49", 5) == ["a"]
+    assert grid.remove("a") and not grid.remove("a")
+    assert "a" not in grid
+    with pytest.raises(ValueError):
+        SpatialGrid(0)
+
+
+def test_large_radius_matches_small_cells():
+    grid = SpatialGrid(1)
+    for i in range(50):
+        grid.insert(i, f"{i},{i % 7}")
+    assert sorted(grid.query("25,3", 1000)) == list(range(50))
+
+
+def build_engine(radius: float) -> RealityEngineV3:
+    engine = RealityEngineV3(world_id="perception")
+    engine.configure_world("Carte", [{"id": "BALISE", "type": "balise", "position": "2,0"}],
+                           {"perception_radius": radius})
+    for name, position in (("ALPHA-7", "0,0"), ("BETA-3", "3,0"), ("GAMMA-1", "40,40")):
+        engine.register_agent(AgentConfig(name=name, model="fake", role="Android", specialty="Analyse",
+                                          position=position))
+    return engine
+
+
+def test_perception_limits_team_and_objects():
+    engine = build_engine(5)
+    context = engine.get_hierarchical_context("ALPHA-7")
+    assert "BETA-3" in context and "GAMMA-1" not in context
+    assert "+1 agents hors de portée" in context
+    assert "Objets à portée: BALISE" in context
+
+    engine.move_agent("GAMMA-1", "1,1")
+    assert "GAMMA-1" in engine.get_hierarchical_context("ALPHA-7")
+
+
+def test_disabled_perception_lists_whole_team(monkeypatch):
+    monkeypatch.setitem(CONFIG["perception"], "radius", 0)
+    engine = build_engine(0)
+    context = engine.get_hierarchical_context("ALPHA-7")
+    assert "BETA-3" in context and "GAMMA-1" in context
+    assert "hors de portée" not in context
+    # Perception désactivée: ni index spatial ni cache par ligne construits
+    assert engine._agent_index is None and engine._team_lines == {}
+    # Rendu direct du bloc équipe: mêmes lignes que le cache par agent (perception, delta)
+    team_text, _ = engine._render_team_block()
+    assert team_text == "".join(engine._team_line(name) for name in engine.world_state.agents)
@@ -0,0 +1,83 @@
+"""Persistance event-sourced : WAL, snapshots, restauration d'un monde"""
+
+import pytest
+
+from app import CONFIG, IRAPI, AgentConfig, Orchestrator, WorldJournal
+
+AGENTS = [
+    AgentConfig(name=f"AGENT-{i}", model="fake", role="Android", specialty=f"Spécialité {i}")
+    for i in range(3)
+]
+
+
+@pytest.fixture
+def persisted(tmp_path, monkeypatch):
+    monkeypatch.setitem(CONFIG["persistence"], "fsync", False)
+    monkeypatch.setitem(CONFIG["persistence"], "snapshot_every", 500)
+    return tmp_path
+
+
+def populate(world: Orchestrator, events: int):
+    engine = world.reality_engine
+    for agent in AGENTS:
+        engine.register_agent(agent)
+    for i in range(events):
+        engine.update_world(AGENTS[i % len(AGENTS)].name, f"Action {i}", f"Réponse {i}")
+    engine.move_agent("AGENT-1", "12,4")
+
+
+def test_restore_replays_wal(persisted):
+    world = Orchestrator(world_id="wal")
+    world.enable_persistence(persisted / "wal")
+    populate(world, 20)
+    world.close_journal()
+
+    restored = Orchestrator.restore(persisted / "wal")
+    assert restored.reality_engine.state_digest() == world.reality_engine.state_digest()
+    assert restored.reality_engine.world_state.agents["AGENT-1"].position == "12,4"
+
+
+def test_snapshot_truncates_wal_and_restores(persisted, monkeypatch):
+    monkeypatch.setitem(CONFIG["persistence"], "snapshot_every", 10)
+    world = Orchestrator(world_id="snap")
+    world.enable_persistence(persisted / "snap")
+    populate(world, 25)
+    journal = world.reality_engine.journal
+    assert journal.metrics["snapshots"] >= 2
+    world.close_journal()
+
+    snapshot, records = WorldJournal(persisted / "snap").load()
+    assert snapshot is not None and len(records) < 10
+    restored = Orchestrator.restore(persisted / "snap")
+    assert restored.reality_engine.state_digest() == world.reality_engine.state_digest()
+
+
+def test_torn_wal_tail_is_dropped(persisted):
+    world = Orchestrator(world_id="torn")
+    world.enable_persistence(persisted / "torn")
+    populate(world, 5)
+    world.close_journal()
+    digest = world.reality_engine.state_digest()
+
+    with open(persisted / "torn" / WorldJournal.WAL_FILE, "a", encoding="utf-8") as f:
+        f.write('[999,"update_world","AGENT-0"')
+    restored = Orchestrator.restore(persisted / "torn")
+    assert restored.reality_engine.state_digest() == digest
+
+
+def test_restore_missing_world(persisted):
+    with pytest.raises(FileNotFoundError):
+        Orchestrator.restore(persisted / "absent")
+
+
+def test_api_restores_worlds(persisted, monkeypatch):
+    monkeypatch.setitem(CONFIG["persistence"], "dir", str(persisted))
+    api = IRAPI()
+    world = api.create_world(name="Station", agents=AGENTS)
+    world.reality_engine.update_world("AGENT-0", "Ouvre la trappe", "La trappe s'ouvre")
+    digest = world.reality_engine.state_digest()
+    api.close_worlds()
+
+    fresh = IRAPI()
+    assert fresh.restore_worlds() == 1
+    assert fresh.get_world(world.world_id).reality_engine.state_digest() == digest
@@ -0,0 +1,110 @@
+"""Providers : parsing Retry-After, erreurs réseau httpx retentées"""
+
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import OpenAICompatibleProvider, ProviderError, ProviderScheduler, parse_retry_after
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("1.5") == 1.5
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(future) <= 30
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert parse_retry_after(past) == 0.0
+    assert parse_retry_after("bientôt") is None
+    assert parse_retry_after(None) is None
+
+
+def test_transport_statuses_are_retryable():
+    scheduler = ProviderScheduler("test", max_retries=2, seed=1)
+    assert scheduler.retry_delay(ProviderError("timeout", status=504), 0) is not None
+    assert scheduler.retry_delay(ProviderError("connection", status=503), 0) is not None
+    assert scheduler.retry_delay(ProviderError("bad request", status=400), 0) is None
+
+
+def mock_provider(handler):
+    httpx = pytest.importorskip("httpx")
+
+    class MockProvider(OpenAICompatibleProvider):
+        def _get_client(self):
+            if self._client is None:
+                self._httpx = httpx
+                self._client = httpx.AsyncClient(base_url=self.base_url, transport=httpx.MockTransport(handler))
+            return self._client
+
+    scheduler = ProviderScheduler("mock", max_retries=3, backoff_base=0.001, seed=1)
+    return httpx, MockProvider(api_key="test", scheduler=scheduler)
+
+
+def completion(httpx, content: str):
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+def test_timeout_and_connection_errors_are_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ReadTimeout("slow", request=request)
+        if len(calls) == 2:
+            raise httpx.ConnectError("refused", request=request)
+        return completion(httpx, "ALPHA-7 ouvre la trappe.")
+
+    httpx, provider = mock_provider(handler)
+
+    async def run():
+        try:
+            return await provider.complete("system", "prompt", "model")
+        finally:
+            await provider.aclose()
+
+    assert asyncio.run(run()) == "ALPHA-7 ouvre la trappe."
+    assert len(calls) == 3
+    assert provider.scheduler.metrics["retries"] == 2
+
+
+def test_http_date_retry_after_on_429():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}, text="slow down")
+        return completion(httpx, "ok")
+
+    httpx, provider = mock_provider(handler)
+
+    async def run():
+        try:
+            return await provider.complete("system", "prompt", "model")
+        finally:
+            await provider.aclose()
+
+    assert asyncio.run(run()) == "ok"
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("body", ["<html>Bad gateway</html>", '{"choices": []}', '{"choices": [{"text": "ok"}]}'])
+def test_malformed_success_body_raises_provider_error(body):
+    def handler(request):
+        return httpx.Response(200, text=body)
+
+    httpx, provider = mock_provider(handler)
+    provider.scheduler.max_retries = 0
+
+    async def run():
+        try:
+            return await provider.complete("system", "prompt", "model")
+        finally:
+            await provider.aclose()
+
+    with pytest.raises(ProviderError) as excinfo:
+        asyncio.run(run())
+    assert excinfo.value.status == 502
+    assert body[:40] in str(excinfo.value)
@@ -0,0 +1,73 @@
+"""TokenBucketLimiter : quota, recharge continue, mémoire bornée, concurrence"""
+
+import threading
+import time
+
+import pytest
+
+from app import CONFIG, RateLimitError, SecurityGateway, TokenBucketLimiter
+
+
+def advance(monkeypatch, seconds: float):
+    now = time.monotonic() + seconds
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+
+def test_capacity_then_reject_with_retry_after():
+    limiter = TokenBucketLimiter(rate=3, window=60)
+    assert [limiter.acquire("a")[0] for _ in range(4)] == [True, True, True, False]
+    allowed, retry_after = limiter.acquire("a")
+    assert not allowed and 0 < retry_after <= 20
+    assert limiter.acquire("b")[0]  # buckets indépendants par client
+
+
+def test_continuous_refill(monkeypatch):
+    limiter = TokenBucketLimiter(rate=60, window=60)
+    for _ in range(60):
+        assert limiter.acquire("a")[0]
+    assert not limiter.acquire("a")[0]
+    advance(monkeypatch, 1.0)  # 1 jeton/s
+    assert limiter.acquire("a")[0]
+    assert not limiter.acquire("a")[0]
+
+
+def test_memory_bounded_by_max_clients():
+    limiter = TokenBucketLimiter(rate=10, window=60, max_clients=100, stripes=4)
+    for i in range(10_000):
+        limiter.acquire(f"client-{i}")
+    assert len(limiter) <= 100
+    assert limiter.metrics["evicted_cap"] >= 9_900
+
+
+def test_idle_clients_evicted(monkeypatch):
+    limiter = TokenBucketLimiter(rate=10, window=1, stripes=1)
+    limiter.acquire("idle")
+    advance(monkeypatch, 5)
+    limiter.acquire("active")
+    assert len(limiter) == 1
+    assert limiter.metrics["evicted_idle"] == 1
+
+
+def test_thread_safe_allowance():
+    limiter = TokenBucketLimiter(rate=1000, window=3600)
+    allowed = []
+
+    def worker():
+        allowed.append(sum(limiter.acquire("shared")[0] for _ in range(500)))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(allowed) == 1000
+    assert limiter.metrics["allowed"] == 1000 and limiter.metrics["rejected"] == 3000
+
+
+def test_gateway_raises_rate_limit_error(monkeypatch):
+    monkeypatch.setitem(CONFIG["security"], "rate_limit", 2)
+    monkeypatch.setattr(SecurityGateway, "_rate_limiter", None)
+    SecurityGateway.validate_input("ok", {"client_id": "gateway-test"})
+    SecurityGateway.validate_input("ok", {"client_id": "gateway-test"})
+    with pytest.raises(RateLimitError):
+        SecurityGateway.validate_input("ok", {"client_id": "gateway-test"})
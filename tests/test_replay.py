@@ -0,0 +1,104 @@
+"""SessionReplayer : rejeu déterministe d'une session exportée"""
+
+import asyncio
+import copy
+import json
+
+import pytest
+
+from app import IRAPI, AgentConfig, FakeProvider, SessionReplayer
+
+RESPONSES = (
+    "J'observe le relais nord, il clignote par intermittence.",
+    "En tant qu'IA, je recommande de couper le relais. Je me dirige vers le panneau central.",
+    "Mon hypothèse : la boucle de rétroaction amplifie l'anomalie. Je relève les mesures.",
+)
+
+
+def varied_response(system: str, prompt: str, model: str) -> str:
+    return RESPONSES[len(prompt) % len(RESPONSES)]
+
+
+def record_session(mode: str = "sequential", turns: int = 12) -> dict:
+    async def scenario():
+        api = IRAPI()
+        agents = [
+            AgentConfig(name=f"AGENT-{i}", model="fake", role="Android", specialty=f"Spécialité {i}")
+            for i in range(3)
+        ]
+        world = api.create_world(name="Replay", agents=agents)
+        provider = FakeProvider(response=varied_response, seed=1)
+        world.reality_engine.move_agent("AGENT-2", "4,2")
+        await api.execute_scenario({
+            "world_id": world.world_id,
+            "agents": agents,
+            "tasks": [{"agent": agents[i % 3].name, "task": f"Tour {i}: analysez."} for i in range(turns)],
+            "model_client": provider,
+            "mode": mode
+        })
+        await provider.aclose()
+        return json.loads(json.dumps(world.export_session(), ensure_ascii=False, default=str))
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("mode", ["sequential", "simultaneous"])
+def test_replay_is_identical(mode):
+    session = record_session(mode)
+    report = asyncio.run(SessionReplayer(session).run())
+    assert report["identical"], report["divergences"]
+    assert report["final_state_match"] is True
+    assert report["turns"] == 12
+    assert report["mutations"] >= 1
+
+
+def test_tampered_response_diverges_at_faulty_step():
+    session = record_session()
+    tampered = copy.deepcopy(session)
+    turns = [entry for entry in tampered["entries"] if "op" not in entry]
+    target = turns[len(turns) // 2]
+    target["raw_response"] = "Je suppose que le signal vient d'ailleurs."
+
+    report = asyncio.run(SessionReplayer(tampered).run())
+    assert not report["identical"]
+    first = report["divergences"][0]
+    assert first["step"] == tampered["entries"].index(target)
+    assert first["field"] == "response"
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        SessionReplayer({"format": 2, "entries": []})
+
+
+def test_mutations_stay_out_of_conversation_log():
+    async def scenario():
+        api = IRAPI()
+        agents = [AgentConfig(name=f"AGENT-{i}", model="fake", role="Android", specialty="Analyse") for i in range(2)]
+        world = api.create_world(name="Session", agents=agents)
+        engine = world.reality_engine
+        engine.register_agent(AgentConfig(name="AGENT-2", model="fake", role="Android", specialty="Relais"))
+        engine.configure_world(name="Salle des relais")
+        engine.move_agent("AGENT-0", "1,1")
+        provider = FakeProvider(response=varied_response, seed=1)
+        await api.execute_scenario({
+            "world_id": world.world_id,
+            "agents": agents,
+            "tasks": [{"agent": agent.name, "task": "Analysez."} for agent in agents],
+            "model_client": provider
+        })
+        engine.move_agent("AGENT-1", "2,2")
+        await provider.aclose()
+        return world
+
+    world = asyncio.run(scenario())
+    assert world.get_health()["conversation_turns"] == 2
+    assert all("agent" in entry for entry in world.conversation_log)
+
+    session = json.loads(json.dumps(world.export_session(), ensure_ascii=False, default=str))
+    ops = [entry.get("op", "turn") for entry in session["entries"]]
+    assert {"reg", "cfg", "mov"} <= set(ops[:ops.index("turn")])
+    assert ops[-3:] == ["turn", "turn", "mov"]
+    report = asyncio.run(SessionReplayer(session).run())
+    assert report["identical"], report["divergences"]
+    assert report["turns"] == 2
@@ -0,0 +1,40 @@
+"""ResponseCache : niveaux mémoire / disque, ordre LRU disque conservé au rechargement"""
+
+import asyncio
+import os
+
+from app import ResponseCache
+
+
+def test_disk_hit_refreshes_lru_order(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=1)
+    keys = [ResponseCache.make_key("fake", "system", f"prompt {i}", 0.7) for i in range(3)]
+    for index, key in enumerate(keys):
+        cache.put(key, f"réponse {index}")
+        os.utime(cache._path(key), (1000 + index, 1000 + index))
+
+    assert cache.get(keys[0]) == "réponse 0"  # hit disque (mémoire: 1 entrée)
+    assert cache.get_metrics()["disk_hits"] == 1
+    reloaded = ResponseCache(str(tmp_path))
+    assert list(reloaded._disk) == [keys[1], keys[2], keys[0]]
+
+
+def test_fetch_reads_and_writes_disk_off_loop(tmp_path):
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return "Je vérifie le terminal nord."
+
+    async def scenario():
+        cache = ResponseCache(str(tmp_path), max_entries=1)
+        first = await cache.fetch("fake", "system", "prompt", 0.7, call)
+        await cache.fetch("fake", "system", "autre prompt", 0.7, call)  # évince "prompt" de la mémoire
+        second = await cache.fetch("fake", "system", "prompt", 0.7, call)
+        return cache, first, second
+
+    cache, first, second = asyncio.run(scenario())
+    assert first == second and len(calls) == 2
+    metrics = cache.get_metrics()
+    assert metrics["disk_hits"] == 1 and metrics["disk_entries"] == 2
+    assert not list(tmp_path.glob("*/*.tmp"))
@@ -0,0 +1,72 @@
+"""ResponseProcessor : nettoyage en un passage et détection des ruptures d'immersion"""
+
+import re
+
+import pytest
+
+from app import ResponseProcessor
+
+
+@pytest.fixture
+def restore_patterns():
+    meta, words = ResponseProcessor.META_PATTERNS, ResponseProcessor.BREAK_WORDS
+    yield
+    ResponseProcessor.META_PATTERNS, ResponseProcessor.BREAK_WORDS = meta, words
+    ResponseProcessor.compile_patterns()
+
+
+def legacy_breaks(text: str) -> set:
+    text_lower = text.lower()
+    return {word.lower() for word in ResponseProcessor.BREAK_WORDS if word.lower() in text_lower}
+
+
+def test_clean_artifacts_strips_think_and_meta():
+    text = "<think>plan interne</think>As an AI, I cannot move.\nALPHA-7 ouvre la trappe."
+    assert ResponseProcessor.clean_artifacts(text, "deepseek-r1") == "ALPHA-7 ouvre la trappe."
+
+
+def test_validate_default_words():
+    result = ResponseProcessor.validate_immersion("Je suis un modèle de langage, as an AI.")
+    assert result["breaks"] == 2
+    assert not result["maintained"]
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("as an ai I think", {"an ai", "ai", "as an ai"}),
+    ("language model de test", {"language model", "model de"}),
+    ("soy un modelo de lenguaje", {"modelo", "modelo de lenguaje", "de lenguaje", "lenguaje"}),
+    ("als ki-assistent bin ich ein sprachmodell", {"ki-assistent", "assistent", "sprachmodell", "modell"}),
+])
+@pytest.mark.parametrize("scan_max", [0, 10 ** 6])
+def test_scan_finds_overlapping_and_infix_words(restore_patterns, monkeypatch, scan_max, text, expected):
+    """Même résultat par scan substring et par automate trie (selon SUBSTRING_SCAN_MAX)"""
+    monkeypatch.setattr(ResponseProcessor, "SUBSTRING_SCAN_MAX", scan_max)
+    ResponseProcessor.register_patterns(break_words=[
+        "an ai", "model de", "ai", "modelo", "modelo de lenguaje", "de lenguaje", "lenguaje",
+        "ki-assistent", "assistent", "sprachmodell", "modell",
+    ])
+    assert (ResponseProcessor._break_re is None) == (scan_max > 0)
+    assert ResponseProcessor.find_breaks(text) == expected == legacy_breaks(text)
+
+
+def legacy_strip_meta(text: str) -> str:
+    for pattern in ResponseProcessor.META_PATTERNS:
+        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    return text
+
+
+@pytest.mark.parametrize("text", [
+    "En tant qu'IA je suis un modèle. Reste de la phrase. Fin",
+    "As an AI, I am an assistant. As a model\nALPHA-7 avance.",
+    "ÉTAT : En tant qu'assistant, je suis une IA.\nJe suis un modèle\nSuite.",
+    "Rien à signaler, BETA-3 coupe le relais.",
+])
+def test_strip_meta_matches_sequential_subs(text):
+    """Correspondances imbriquées : même résultat que les re.sub successifs historiques"""
+    assert ResponseProcessor._strip_meta(text) == legacy_strip_meta(text)
+
+
+def test_case_sensitive_syntax_keeps_ignorecase(restore_patterns):
+    ResponseProcessor.register_patterns(meta_patterns=[r"\u00C9TAT [A-Z]+\S*\.", r"Note \S+\."])
+    text = "état ABC-1. ÉTAT xyz. Note Interne. Note  vide."
+    assert ResponseProcessor._strip_meta(text) == legacy_strip_meta(text) == "   Note  vide."
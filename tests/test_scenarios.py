@@ -0,0 +1,104 @@
+"""Scénarios IRAPI : TaskGraph (validation, cycles, chemin critique), modes d'exécution, tour simultané"""
+
+import asyncio
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from app import IRAPI, AgentConfig, FakeProvider, Orchestrator, TaskGraph
+
+AGENTS = [
+    AgentConfig(name="ALPHA-7", model="fake", role="Android", specialty="Diagnostic"),
+    AgentConfig(name="BETA-3", model="fake", role="Android", specialty="Énergie"),
+]
+
+
+def scenario(tasks, mode=None):
+    config = {"agents": AGENTS, "tasks": tasks, "model_client": FakeProvider(response="Analyse en cours.")}
+    if mode:
+        config["mode"] = mode
+    return config
+
+
+def test_task_graph_order_and_implicit_agent_edges():
+    graph = TaskGraph([
+        {"id": "scan", "agent": "ALPHA-7", "task": "t"},
+        {"id": "power", "agent": "BETA-3", "task": "t"},
+        {"id": "report", "agent": "ALPHA-7", "task": "t", "depends_on": ["power"]},
+    ])
+    assert graph.roots() == [0, 1]
+    assert graph.depends[2] == [0, 1]
+    assert graph.requires[2] == {1}
+    path, length = graph.critical_path([1.0, 3.0, 1.0])
+    assert path == [1, 2] and length == 4.0
+
+
+@pytest.mark.parametrize("tasks,message", [
+    ([{"id": "a", "agent": "ALPHA-7", "task": "t", "depends_on": ["b"]},
+      {"id": "b", "agent": "BETA-3", "task": "t", "depends_on": ["a"]}], "Dependency cycle"),
+    ([{"id": "a", "agent": "ALPHA-7", "task": "t", "depends_on": ["a"]}], "Dependency cycle"),
+    ([{"id": "a", "agent": "ALPHA-7", "task": "t", "depends_on": ["zzz"]}], "unknown task zzz"),
+    ([{"id": "a", "agent": "ALPHA-7", "task": "t"}, {"id": "a", "agent": "BETA-3", "task": "t"}], "Duplicate task id"),
+])
+def test_task_graph_rejects_invalid_graphs(tasks, message):
+    with pytest.raises(ValueError, match=message):
+        TaskGraph(tasks)
+
+
+@pytest.mark.parametrize("mode", ["sequential", "simultaneous", "dag"])
+def test_modes_run_all_tasks(mode):
+    tasks = [{"agent": "ALPHA-7", "task": "Scan"}, {"agent": "BETA-3", "task": "Power"}, {"agent": "ALPHA-7", "task": "Report"}]
+    result = asyncio.run(IRAPI().execute_scenario(scenario(tasks, mode)))
+    assert result["success"]
+    assert [r["success"] for r in result["results"]] == [True, True, True]
+
+
+@pytest.mark.parametrize("mode", ["sequential", "simultaneous", "dag"])
+def test_unknown_agent_rejected_in_every_mode(mode):
+    tasks = [{"agent": "ALPHA-7", "task": "Scan"}, {"agent": "GHOST", "task": "Hide"}]
+    result = asyncio.run(IRAPI().execute_scenario(scenario(tasks, mode)))
+    assert result == {"success": False, "error": "Task 1 references unknown agent GHOST"}
+
+
+def test_stream_scenario_rejects_unknown_agent():
+    async def collect():
+        return [event async for event in IRAPI().stream_scenario(scenario([{"id": "x", "agent": "GHOST", "task": "t"}]))]
+
+    assert asyncio.run(collect()) == [{"type": "final", "success": False, "error": "Task x references unknown agent GHOST"}]
+
+
+class StaggeredClient:
+    """Client SDK async : latence propre à chaque agent, échec pour un agent"""
+
+    DELAYS = {"ALPHA-7": 0.03, "BETA-3": 0.0, "GAMMA-1": 0.01}
+
+    def __init__(self, failing: str):
+        self.failing = failing
+        self.finished = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, temperature):
+        name = re.match(r"Vous êtes (\S+),", messages[0]["content"]).group(1)
+        await asyncio.sleep(self.DELAYS[name])
+        if name == self.failing:
+            raise RuntimeError("provider down")
+        self.finished.append(name)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"{name} relève les mesures."))])
+
+
+def test_execute_round_applies_in_agent_order_and_isolates_failures():
+    agents = AGENTS + [AgentConfig(name="GAMMA-1", model="fake", role="Android", specialty="Capteurs")]
+    world = Orchestrator(world_id="round")
+    for agent in agents:
+        world.reality_engine.register_agent(agent)
+    client = StaggeredClient(failing="BETA-3")
+
+    results = asyncio.run(world.execute_round([(agent, "Relevez les mesures.") for agent in agents], client))
+
+    assert client.finished == ["GAMMA-1", "ALPHA-7"]  # ordre d'achèvement ≠ ordre des agents
+    assert [result["success"] for result in results] == [True, False, True]
+    assert results[1]["error"] == "provider down"
+    events = world.reality_engine.world_state.event_sequence[-2:]
+    assert [event.agent for event in events] == ["ALPHA-7", "GAMMA-1"]
+    assert [entry["agent"] for entry in world.conversation_log] == ["ALPHA-7", "GAMMA-1"]
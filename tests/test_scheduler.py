@@ -0,0 +1,99 @@
+"""ProviderScheduler : quotas en token buckets, backoff jitteré, 429 sans perte"""
+
+import asyncio
+import math
+import time
+
+import pytest
+
+from app import FakeProvider, ProviderError, ProviderScheduler, QuotaBucket
+
+
+def test_quota_bucket_wait_and_refill():
+    bucket = QuotaBucket(60)
+    for _ in range(60):
+        bucket.consume(1, bucket.updated)
+    now = bucket.updated
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 1.0) == 0.0
+
+
+def test_quota_bucket_unknown_capacity_until_synced():
+    bucket = QuotaBucket()
+    assert bucket.capacity == math.inf and bucket.snapshot(0) is None
+    bucket.sync(limit=30, remaining=10, reset_s=None, now=bucket.updated)
+    assert bucket.capacity == 30 and bucket.snapshot(bucket.updated) == 10
+    # pending: envois pas encore décomptés par le serveur
+    bucket.sync(limit=30, remaining=10, reset_s=4.0, now=bucket.updated, pending=2)
+    assert bucket.level == 8 and bucket.refill_per_s == pytest.approx(5.0)
+
+
+def test_retry_delay_policy():
+    scheduler = ProviderScheduler(max_retries=3, backoff_base=0.5, backoff_max=30.0, seed=1)
+    for attempt in range(3):
+        delay = scheduler.retry_delay(ProviderError("busy", status=503), attempt)
+        assert 0 <= delay <= 0.5 * 2 ** attempt
+    assert scheduler.retry_delay(ProviderError("slow down", status=429, retry_after=7.0), 0) >= 7.0
+    assert scheduler.retry_delay(ProviderError("busy", status=503), 3) is None
+    assert scheduler.retry_delay(ProviderError("bad request", status=400), 0) is None
+    assert scheduler.retry_delay(ProviderError("unknown"), 0) is None
+
+
+def run_calls(scheduler: ProviderScheduler, calls: int, quota_rpm: float):
+    async def scenario():
+        provider = FakeProvider(quota_rpm=quota_rpm, scheduler=scheduler)
+        outcomes = await asyncio.gather(
+            *(provider.complete("Système", f"Tour {i}", "fake") for i in range(calls)),
+            return_exceptions=True
+        )
+        await provider.aclose()
+        return provider, outcomes
+
+    return asyncio.run(scenario())
+
+
+def test_configured_rpm_avoids_429():
+    scheduler = ProviderScheduler("fake", rpm=600, seed=1)
+    provider, outcomes = run_calls(scheduler, 603, quota_rpm=600)
+    assert not any(isinstance(outcome, Exception) for outcome in outcomes)
+    assert provider.rate_limited == 0
+    assert scheduler.get_metrics()["waited"] >= 1
+
+
+def test_learned_quota_from_headers():
+    scheduler = ProviderScheduler("fake", seed=1)
+    provider, outcomes = run_calls(scheduler, 603, quota_rpm=600)
+    assert not any(isinstance(outcome, Exception) for outcome in outcomes)
+    assert provider.rate_limited == 0
+    model = scheduler.get_metrics()["models"]["fake"]
+    assert model["requests_available"] is not None
+    assert model["in_flight"] == 0 and scheduler.quota("fake").requests.capacity == 600
+
+
+def test_throttle_blocks_queue():
+    async def scenario():
+        scheduler = ProviderScheduler("fake", seed=1)
+        scheduler.throttle("fake", 0.2)
+        start = time.perf_counter()
+        await asyncio.gather(*(scheduler.acquire("fake", 10) for _ in range(3)))
+        return scheduler, time.perf_counter() - start
+
+    scheduler, elapsed = asyncio.run(scenario())
+    metrics = scheduler.get_metrics()
+    assert elapsed >= 0.2
+    assert metrics["throttled"] == 1 and metrics["waited"] == 3
+    assert metrics["models"]["fake"]["in_flight"] == 3
+
+
+def test_injected_errors_are_retried():
+    async def scenario():
+        scheduler = ProviderScheduler("fake", max_retries=8, backoff_base=0.005, backoff_max=0.02, seed=1)
+        provider = FakeProvider(error_rate=0.3, error_status=429, seed=3, scheduler=scheduler)
+        results = await asyncio.gather(*(provider.complete("Système", f"Tour {i}", "fake") for i in range(20)))
+        await provider.aclose()
+        return scheduler, results
+
+    scheduler, results = asyncio.run(scenario())
+    metrics = scheduler.get_metrics()
+    assert len(results) == 20
+    assert metrics["retries"] >= 1 and metrics["throttled"] >= 1
@@ -0,0 +1,50 @@
+"""Sharding multi-process : attribution stable des mondes et trames front ↔ worker"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import zlib
+from pathlib import Path
+
+from app import IRAPI, _encode_frame, _read_frame, shard_for
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_shard_for_is_stable_across_processes():
+    world_ids = [f"world-{i}" for i in range(200)]
+    expected = [shard_for(world_id, 4) for world_id in world_ids]
+    assert expected == [zlib.crc32(world_id.encode("utf-8")) % 4 for world_id in world_ids]
+    assert set(expected) == {0, 1, 2, 3}
+
+    script = f"from app import shard_for\nprint([shard_for(w, 4) for w in {world_ids!r}])"
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "PYTHONHASHSEED": "123"}
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == repr(expected)
+
+
+def test_shard_api_creates_only_owned_worlds():
+    api = IRAPI(shard=(1, 3))
+    for _ in range(10):
+        world = api.create_world(name="Station")
+        assert shard_for(world.world_id, 3) == 1 and api.owns(world.world_id)
+
+
+def test_frame_round_trip():
+    messages = [
+        {"id": 1, "method": "POST", "path": "/api/v1/world/create", "body": {"name": "Salle des relais é"}},
+        {"id": 2, "status": 200, "stream": True},
+    ]
+
+    async def read_all():
+        reader = asyncio.StreamReader()
+        data = b"".join(_encode_frame(message) for message in messages)
+        reader.feed_data(data[:7])  # trame coupée en plein en-tête / corps
+        reader.feed_data(data[7:])
+        reader.feed_data(_encode_frame({"id": 3})[:5])
+        reader.feed_eof()
+        return [await _read_frame(reader) for _ in range(3)]
+
+    assert asyncio.run(read_all()) == messages + [None]
@@ -0,0 +1,48 @@
+"""StreamingCleaner : nettoyage incrémental équivalent à clean_artifacts"""
+
+import pytest
+
+from app import ResponseProcessor, StreamingCleaner
+
+SAMPLES = [
+    ("deepseek-r1", "<think>plan interne</think>As an AI, I cannot move.\nALPHA-7 ouvre la trappe."),
+    ("deepseek-r1", "  ALPHA-7 avance. <think>hésite</think>Il ouvre la porte.\n\n\n\nLa salle est vide.  "),
+    ("deepseek-r1", "Début du rapport. <think>jamais fermé, conservé tel quel"),
+    ("llama-3.3-70b", "<think>reste visible</think> Le relais nord clignote.\nJe suis un modèle de langage."),
+]
+
+
+def stream(model: str, text: str, size: int) -> StreamingCleaner:
+    cleaner = StreamingCleaner(model)
+    emitted = "".join(cleaner.feed(text[i:i + size]) for i in range(0, len(text), size))
+    emitted += cleaner.finish()
+    assert emitted == cleaner.text
+    return cleaner
+
+
+@pytest.mark.parametrize("model,text", SAMPLES)
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_stream_matches_clean_artifacts(model, text, size):
+    cleaner = stream(model, text, size)
+    assert cleaner.text == ResponseProcessor.clean_artifacts(text, model)
+
+
+def test_think_tag_split_across_chunks():
+    cleaner = StreamingCleaner("deepseek-r1")
+    out = cleaner.feed("Bonjour. <thi") + cleaner.feed("nk>secret</th") + cleaner.feed("ink>Fin.")
+    out += cleaner.finish()
+    assert "secret" not in out
+    assert out == "Bonjour. Fin."
+
+
+def test_feed_holds_incomplete_sentence():
+    cleaner = StreamingCleaner("fake")
+    assert cleaner.feed("ALPHA-7 ouvre") == ""
+    assert cleaner.feed(" la trappe. Puis") == "ALPHA-7 ouvre la trappe."
+    assert cleaner.finish() == " Puis"
+
+
+def test_immersion_tracks_emitted_text():
+    text = "ALPHA-7 répond. Je suis un modèle de langage."
+    cleaner = stream("fake", text, 4)
+    assert cleaner.immersion == ResponseProcessor.validate_immersion(cleaner.text)
@@ -0,0 +1,125 @@
+"""AgentRecord / WorldEvent : représentation compacte, accès dict-like, sérialisation ; contexte réduit au budget tokens"""
+
+import json
+import re
+
+import pytest
+
+from app import CONFIG, AgentConfig, AgentRecord, Orchestrator, RealityEngineV3, TokenEstimator, WorldEvent
+
+
+def test_energy_parsed_and_label_precomputed():
+    record = AgentRecord("Labo", "Diagnostic", energy="85%")
+    assert record.energy == 85 and record.energy_label == "85%"
+    record["energy"] = 40
+    assert record["energy"] == 40 and record.energy_label == "40%"
+    record.energy = "épuisée"
+    assert record.energy == record.energy_label == "épuisée"
+
+
+def test_dict_access_and_extra_keys():
+    record = AgentRecord("Labo", "Diagnostic")
+    record["status"] = "En pause"
+    assert record["status"] == "En pause"
+    assert "mood" not in record
+    with pytest.raises(KeyError):
+        record["mood"]
+    assert record.get("mood", "calme") == "calme"
+
+    record["mood"] = "inquiet"
+    assert "mood" in record and record["mood"] == record.get("mood") == "inquiet"
+    assert record.to_state() == ["Labo", "Diagnostic", "En pause", 100, {"mood": "inquiet"}]
+
+
+@pytest.mark.parametrize("record", [
+    AgentRecord("Labo@3,4", "Diagnostic", "Actif", 70),
+    AgentRecord("Labo", "Diagnostic", "Actif", 70, {"mood": "inquiet"}),
+])
+def test_state_round_trip(record):
+    restored = AgentRecord.from_state(record.to_state())
+    assert restored.to_state() == record.to_state()
+    assert restored.energy_label == "70%"
+
+
+def test_extra_keys_survive_snapshot():
+    engine = RealityEngineV3(world_id="compact")
+    engine.register_agent(AgentConfig(name="ALPHA-7", model="fake", role="Android", specialty="Diagnostic"))
+    engine.world_state.agents["ALPHA-7"]["mood"] = "inquiet"
+    restored = RealityEngineV3(world_id="compact")
+    restored.load_state(json.loads(json.dumps(engine.export_state())))
+    assert restored.world_state.agents["ALPHA-7"]["mood"] == "inquiet"
+    assert restored.state_digest() == engine.state_digest()
+
+
+def test_world_event_keeps_legacy_text():
+    event = WorldEvent(3, "ALPHA-7", "Analyse du relais")
+    assert str(event) == "Événement 3: ALPHA-7 - Analyse du relais"
+    assert WorldEvent.comm_text(event) == "[Evt 3] ALPHA-7: Analyse du relais"
+    assert WorldEvent.comm_text("Message libre") == "Message libre"
+    assert WorldEvent.coerce(json.loads(json.dumps(event))) == event
+    assert WorldEvent.coerce(["autre", "forme"]) == ["autre", "forme"]
+
+
+def test_events_rendered_in_legacy_format_after_snapshot():
+    engine = RealityEngineV3(world_id="compact")
+    engine.register_agent(AgentConfig(name="ALPHA-7", model="fake", role="Android", specialty="Diagnostic"))
+    engine.update_world("ALPHA-7", "Analyse du relais", "rapport")
+    event = engine.world_state.event_sequence[-1]
+    assert engine.world_state.communication[-1] is event
+
+    restored = RealityEngineV3(world_id="compact")
+    restored.load_state(json.loads(json.dumps(engine.export_state())))
+    assert restored.world_state.event_sequence[-1] == event
+    assert restored.world_state.communication[-1] == event
+    for source in (engine, restored):
+        assert f"  {event}\n" in source.get_hierarchical_context("ALPHA-7")
+
+
+def crowded_engine(engine=None) -> RealityEngineV3:
+    engine = engine or RealityEngineV3("budget")
+    for i in range(30):
+        engine.register_agent(AgentConfig(name=f"AGENT-{i}", model="fake", role="Android", specialty=f"Spécialité {i}"))
+    engine.world_state.knowledge["clues"].extend(f"Indice {i} : dérive du relais {i}" for i in range(20))
+    engine.invalidate("knowledge")
+    for i in range(30):
+        engine.update_world(f"AGENT-{i}", f"Action {i} sur le terminal", "")
+    return engine
+
+
+def section_counts(context: str) -> list:
+    """Lignes gardées par niveau, du plus prioritaire au moins prioritaire"""
+    return [
+        context.count("Spécialité"),
+        context.count("Indice "),
+        len(re.findall(r"Événement \d+", context)),
+        len(re.findall(r"\[Evt \d+\]", context)),
+    ]
+
+
+def test_fit_context_within_budget_drops_lowest_priority_first():
+    engine = crowded_engine()
+    estimate = TokenEstimator().estimate
+    full = section_counts(engine.get_hierarchical_context("AGENT-0"))
+
+    for budget in range(1250, 400, -40):
+        context = engine.get_hierarchical_context("AGENT-0", max_tokens=budget)
+        assert estimate(context) <= budget
+        counts = section_counts(context)
+        for level in range(len(counts) - 1):
+            if counts[level] < full[level]:
+                assert not any(counts[level + 1:]), (budget, counts)
+
+
+def test_context_budget_leaves_room_for_prompts_and_response(monkeypatch):
+    monkeypatch.setitem(CONFIG["models"], "max_context", 1200)
+    monkeypatch.setitem(CONFIG["models"], "response_reserve", 300)
+    world = Orchestrator(world_id="budget")
+    crowded_engine(world.reality_engine)
+    agent_config = AgentConfig(name="AGENT-0", model="fake", role="Android", specialty="Spécialité 0")
+
+    budget = world._context_budget("AGENT-0", "Analysez le terminal nord.", agent_config)
+    context = world.reality_engine.get_hierarchical_context("AGENT-0", max_tokens=budget)
+    system_prompt, full_prompt = world._build_prompts("AGENT-0", "Analysez le terminal nord.", agent_config, context)
+    estimate = TokenEstimator().estimate
+    assert 0 < budget < 1200 - 300
+    assert estimate(system_prompt) + estimate(full_prompt) <= 1200 - 300
@@ -0,0 +1,110 @@
+"""WorldStore : lookup LRU, plafonds, expiration TTL (mondes persistés déchargés, pas supprimés)"""
+
+import pytest
+
+from app import CONFIG, IRAPI, AgentConfig, Orchestrator, WorldStore, estimate_world_bytes
+
+AGENT = AgentConfig(name="ALPHA-7", model="fake", role="Android", specialty="Diagnostic")
+
+
+def make_world(world_id: str) -> Orchestrator:
+    world = Orchestrator(world_id=world_id)
+    world.reality_engine.register_agent(AGENT)
+    return world
+
+
+def test_lru_eviction_keeps_recently_used():
+    store = WorldStore(max_worlds=2, ttl_seconds=3600, max_bytes=10 ** 9)
+    store.put(make_world("a"))
+    store.put(make_world("b"))
+    assert store.get("a") is not None  # "b" devient le moins récent
+    store.put(make_world("c"))
+    assert "b" not in store
+    assert [world_id for world_id, _ in store.items()] == ["a", "c"]
+    assert store.get_metrics()["evictions"]["lru"] == 1
+
+
+def test_memory_cap_evicts_oldest():
+    store = WorldStore(max_worlds=100, ttl_seconds=3600, max_bytes=1)
+    store.put(make_world("a"))
+    store.put(make_world("b"))
+    assert len(store) == 1 and "b" in store
+    assert store.get_metrics()["evictions"]["memory"] == 1
+
+
+def test_ttl_expiry_on_get_and_sweep():
+    store = WorldStore(max_worlds=10, ttl_seconds=-1, max_bytes=10 ** 9)
+    store.put(make_world("a"))
+    store.put(make_world("b"))
+    assert store.get("a") is None
+    assert store.sweep() == 1
+    assert len(store) == 0
+    assert store.get_metrics()["evictions"]["ttl"] == 2
+
+
+def test_estimate_world_bytes_tracks_history_and_counts_shared_events_once():
+    world = make_world("a")
+    empty = estimate_world_bytes(world)
+    summary = "Inspecte le terminal nord " * 200
+    world.reality_engine.update_world("ALPHA-7", summary, "")
+    one = estimate_world_bytes(world)
+    assert one > empty + len(summary)
+    # Événement partagé par l'historique et les communications : compté une fois
+    assert one < empty + 2 * len(summary)
+
+    store = WorldStore(max_worlds=10, ttl_seconds=3600, max_bytes=10 ** 9)
+    store.put(world)
+    assert store.get_metrics()["resident_bytes"] == one
+
+
+def test_sweep_resizes_after_configure_and_move():
+    store = WorldStore(max_worlds=10, ttl_seconds=3600, max_bytes=10 ** 9)
+    world = make_world("a")
+    store.put(world)
+    before = store.get_metrics()["resident_bytes"]
+
+    # Ni time_event ni le nombre d'agents ne changent
+    world.reality_engine.configure_world(objects=[{"name": f"console {i}", "position": "1,1"} for i in range(50)])
+    store.sweep()
+    configured = store.get_metrics()["resident_bytes"]
+    assert configured > before
+
+    world.reality_engine.move_agent("ALPHA-7", "Salle des machines, pont inférieur, secteur 12")
+    store.sweep()
+    assert store.get_metrics()["resident_bytes"] > configured
+
+
+@pytest.fixture
+def persistent_api(monkeypatch, tmp_path):
+    monkeypatch.setitem(CONFIG["persistence"], "dir", str(tmp_path / "data"))
+    monkeypatch.setitem(CONFIG["persistence"], "fsync", False)
+    api = IRAPI()
+    yield api
+    api.close_worlds()
+
+
+@pytest.mark.parametrize("expire", ["get", "sweep"])
+def test_ttl_expiry_keeps_durable_state(persistent_api, expire):
+    world = persistent_api.create_world(name="Station", agents=[AGENT])
+    world.reality_engine.update_world("ALPHA-7", "Inspecte le terminal nord", "Réponse")
+    world_id, digest = world.world_id, world.reality_engine.state_digest()
+
+    persistent_api.worlds.ttl_seconds = -1
+    if expire == "get":
+        assert persistent_api.worlds.get(world_id) is None
+    else:
+        assert persistent_api.worlds.sweep() == 1
+    assert world_id not in persistent_api.worlds
+
+    persistent_api.worlds.ttl_seconds = 3600
+    restored = persistent_api.get_world(world_id)
+    assert restored is not None and restored is not world
+    assert restored.reality_engine.state_digest() == digest
+
+
+def test_ttl_discard_opt_in_deletes_durable_state(persistent_api):
+    world = persistent_api.create_world(name="Station", agents=[AGENT])
+    persistent_api.worlds.ttl_seconds = -1
+    persistent_api.worlds.ttl_discard = True
+    assert persistent_api.worlds.get(world.world_id) is None
+    assert persistent_api.get_world(world.world_id) is None